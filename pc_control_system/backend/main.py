@@ -1,62 +1,621 @@
-from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.responses import HTMLResponse, FileResponse, JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, List
 import os
 import asyncio
+import time
+from contextlib import asynccontextmanager
 from slack_bolt.app.async_app import AsyncApp
 from slack_bolt.adapter.socket_mode.async_handler import AsyncSocketModeHandler
 from dotenv import load_dotenv
 import uvicorn
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import pytz
 import json
+import csv
+import io
+import hashlib
+import math
+import glob
+import sqlite3
+from array import array
+from bisect import bisect_left
 from pathlib import Path
-from collections import defaultdict, Counter
-from urllib.parse import quote
+from collections import Counter, OrderedDict
+from urllib.parse import quote, urlparse
 import unicodedata
+import uuid
+from slack_sdk.errors import SlackApiError
 
 # 환경변수 로드
 load_dotenv()
 
-app = FastAPI(title="PC방 제어시스템")
+# JSON 코덱: orjson이 설치되어 있으면 사용하고, 없으면 표준 json 모듈 사용
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_CODEC = "orjson" if orjson is not None else "json"
+
+def json_dumpb(data, pretty=False) -> bytes:
+    """JSON 직렬화 (UTF-8 바이트, pretty면 2칸 들여쓰기)"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(data, option=option)
+    if pretty:
+        return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def json_dumps(data, pretty=False) -> str:
+    """JSON 직렬화 (문자열)"""
+    return json_dumpb(data, pretty).decode("utf-8")
+
+def json_loads(data):
+    """JSON 역직렬화 (문자열 또는 UTF-8 바이트)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+class CodecJSONResponse(JSONResponse):
+    """JSON 코덱으로 직렬화하는 기본 응답"""
+
+    def render(self, content) -> bytes:
+        return json_dumpb(content)
+
+_uvicorn_handle_exit = uvicorn.Server.handle_exit
+
+def handle_exit(server, sig, frame):
+    """종료 신호(SIGINT/SIGTERM)를 받으면 열린 SSE 스트림부터 종료
+
+    uvicorn은 열린 연결이 모두 끝나야 lifespan 종료 단계를 실행하므로,
+    대시보드 탭이 열려 있으면 lifespan에서 스트림을 닫을 수 없어 서버가 멈추지 않습니다.
+    """
+    statistics_stream.end_streams()
+    _uvicorn_handle_exit(server, sig, frame)
+
+# 신호 처리기는 앱을 불러온 뒤 설치되므로 여기서 바꿔 두면 CLI 실행(uvicorn main:app)에도 적용됨
+uvicorn.Server.handle_exit = handle_exit
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """서버 시작/종료 시 백그라운드 작업 관리"""
+    await history_store.start()
+    statistics_stream.start()
+    slack_dispatcher.start()
+    await manager.start()
+    compaction_task = None
+    if HISTORY_STORAGE == "jsonl" and HISTORY_COMPACT_INTERVAL > 0:
+        compaction_task = asyncio.create_task(history_compaction_loop())
+    yield
+    if compaction_task is not None:
+        compaction_task.cancel()
+    await manager.close()
+    await statistics_stream.close()
+    # 종료 전에 대기 중인 기록을 모두 파일에 저장
+    await history_store.close()
+    login_digest.close()
+    await slack_dispatcher.close()
+
+app = FastAPI(title="PC방 제어시스템", lifespan=lifespan, default_response_class=CodecJSONResponse)
+
+# PC 명령 전송 제한 시간(초), 넘으면 연결이 끊긴 것으로 보고 정리
+PC_COMMAND_TIMEOUT = float(os.getenv("PC_COMMAND_TIMEOUT", "3"))
+# 명령 수신 확인(ack)을 기다리는 최대 시간(초), 넘으면 연결이 끊긴 것으로 보고 정리
+PC_ACK_TIMEOUT = float(os.getenv("PC_ACK_TIMEOUT", "5"))
+# 명령 완료(재부팅 후 다시 연결 등)를 기다리는 최대 시간(초)
+PC_COMPLETE_TIMEOUT = float(os.getenv("PC_COMPLETE_TIMEOUT", "300"))
+# 상태를 조회할 수 있도록 보관하는 최근 명령 수
+PC_COMMAND_RETENTION = 1000
+# 연결된 PC에 ping을 보내는 주기(초), 0이면 보내지 않음
+PC_HEARTBEAT_INTERVAL = float(os.getenv("PC_HEARTBEAT_INTERVAL", "10"))
+# 이 시간(초) 동안 아무 메시지(pong 포함)도 없으면 끊긴 연결로 보고 정리 (JSON 프로토콜 클라이언트만)
+PC_HEARTBEAT_TIMEOUT = float(os.getenv("PC_HEARTBEAT_TIMEOUT", str(PC_HEARTBEAT_INTERVAL * 3)))
+# 클라이언트가 처리하는 PC 명령
+PC_COMMANDS = ("reboot", "shutdown")
+# PC 번호 최댓값 (PC방의 PC 수), 그룹 명령 대상은 1~PC_MAX_NUMBER번만 허용
+PC_MAX_NUMBER = int(os.getenv("PC_MAX_NUMBER", "100"))
+# 응답을 기다리는 명령 상태 (수신 확인 전, 완료 전)
+PC_COMMAND_PENDING = ("sending", "sent", "acked", "running")
+# PC에 전달된 것으로 보는 명령 상태 (이전 클라이언트는 전송까지만 확인)
+PC_COMMAND_DELIVERED = ("sent", "acked", "running", "completed")
 
 # WebSocket 연결 관리자
 class ConnectionManager:
+    """PC 클라이언트 연결과 명령 상태 관리
+
+    클라이언트는 연결 직후 {"type": "hello"}를 보내 JSON 프로토콜을 사용한다고 알립니다.
+    - 서버 → PC: {"type": "command", "id", "command"}
+    - PC → 서버: {"type": "ack", "id"} (명령 수신), {"type": "done", "id", "ok", "error"} (명령 실행)
+    - 서버 → PC: {"type": "ping", "ts"}, PC → 서버: {"type": "pong", "ts"} (연결 확인, 왕복 시간 측정)
+    재부팅 명령은 PC가 다시 연결해 hello를 보내면 완료로 보고 걸린 시간을 기록합니다.
+    hello를 보내지 않는 이전 클라이언트에는 명령 문자열만 보내고 전송 여부까지만 기록합니다.
+
+    PC별 접속 상태(presence)는 연결/메시지/pong 때마다 갱신해 두므로 조회 시 PC에 따로 묻지 않습니다.
+
+    여러 워커로 실행하면 PC는 워커 중 하나에만 연결되므로, 접속 상태를 브로커(pc_broker)로 다른 워커에 알리고
+    다른 워커에 연결된 PC로 가는 명령은 그 워커에 전달해 대신 보내게 합니다.
+    - presence: 접속 상태 변경/주기적 갱신, sync: 새 워커가 다른 워커의 접속 상태를 요청
+    - command: 담당 워커에 명령 전송 요청, lookup: 명령 상태 조회, reply: 요청에 대한 응답
+    """
+
     def __init__(self):
         # pc_number를 키로 사용하는 딕셔너리
         self.active_connections: dict[int, WebSocket] = {}
+        # pc_number → 프로토콜 ("json" 또는 이전 클라이언트 "legacy")
+        self.protocols: dict[int, str] = {}
+        # 명령 id → 명령 상태 (최근 PC_COMMAND_RETENTION개)
+        self.commands = OrderedDict()
+        # 명령 id → (시작 시각(time.monotonic), 수신 확인 대기 future, 제한 시간 타이머)
+        self.pending = {}
+        # pc_number → 접속 상태 {"pcNumber", "online", "protocol", "connectedAt", "disconnectedAt", "lastSeen", "rttMs"}
+        self.presence: dict[int, dict] = {}
+        # pc_number → 마지막 메시지 시각 (time.monotonic 기준)
+        self.last_seen: dict[int, float] = {}
+        self.heartbeat_task = None
+        # 워커 간 전달 (start에서 pc_broker 연결)
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.broker = None
+        # 요청 id → 다른 워커의 응답을 기다리는 future
+        self.replies = {}
+        # pc_number → 다른 워커의 접속 상태를 마지막으로 받은 시각 (time.monotonic 기준)
+        self.remote_seen: dict[int, float] = {}
+        # 메시지를 받은 적 있는 다른 워커 id
+        self.workers = set()
+        self.tasks = set()
 
     async def connect(self, pc_number: int, websocket: WebSocket):
         await websocket.accept()
         self.active_connections[pc_number] = websocket
+        self.protocols[pc_number] = "legacy"
+        now = datetime.now(pytz.timezone('Asia/Seoul')).isoformat()
+        self.presence[pc_number] = {
+            "pcNumber": pc_number,
+            "online": True,
+            "protocol": "legacy",
+            "connectedAt": now,
+            "disconnectedAt": None,
+            "lastSeen": now,
+            "rttMs": None,
+            "worker": self.worker_id,
+        }
+        self.last_seen[pc_number] = time.monotonic()
+        self._publish_presence(pc_number)
         print(f"🖥️ PC #{pc_number} connected.")
 
-    def disconnect(self, pc_number: int):
-        if pc_number in self.active_connections:
+    def disconnect(self, pc_number: int, websocket: Optional[WebSocket] = None):
+        # websocket을 주면 그 연결일 때만 정리 (그 사이 다시 연결된 새 연결은 유지)
+        if pc_number in self.active_connections and websocket in (None, self.active_connections[pc_number]):
             del self.active_connections[pc_number]
+            self.protocols.pop(pc_number, None)
+            self.last_seen.pop(pc_number, None)
+            presence = self.presence.get(pc_number)
+            if presence is not None:
+                presence["online"] = False
+                presence["disconnectedAt"] = datetime.now(pytz.timezone('Asia/Seoul')).isoformat()
+            self._publish_presence(pc_number)
             print(f"🖥️ PC #{pc_number} disconnected.")
+            for command in list(self.commands.values()):
+                if command["pcNumber"] != pc_number or command["protocol"] != "json":
+                    continue
+                if command["status"] in ("sending", "sent"):
+                    # 수신 확인을 기다리던 명령은 제한 시간까지 기다리지 않고 바로 실패 처리
+                    self._finish(command, "error", "명령 수신 확인 전에 연결이 끊겼습니다.")
+                elif command["command"] == "shutdown" and command["status"] in ("acked", "running"):
+                    # 종료 명령은 PC 연결이 끊기면 완료
+                    self._finish(command, "completed")
+
+    def handle_message(self, pc_number: int, text: str):
+        """PC가 보낸 메시지 처리 (hello, pong, ack, done)"""
+        self._seen(pc_number)
+        try:
+            message = json_loads(text)
+        except ValueError:
+            return
+        if not isinstance(message, dict):
+            return
+        kind = message.get("type")
+        if kind == "pong":
+            sent = message.get("ts")
+            if isinstance(sent, (int, float)) and pc_number in self.presence:
+                self.presence[pc_number]["rttMs"] = round((time.monotonic() - sent) * 1000, 2)
+            return
+        if kind == "hello":
+            self.protocols[pc_number] = "json"
+            if pc_number in self.presence:
+                self.presence[pc_number]["protocol"] = "json"
+                self._publish_presence(pc_number)
+            self._reconnected(pc_number)
+            return
+        command = self.commands.get(message.get("id"))
+        if command is None or command["pcNumber"] != pc_number or command["status"] not in PC_COMMAND_PENDING:
+            return
+        if kind == "ack" and command["status"] in ("sending", "sent"):
+            command["status"] = "acked"
+            command["ackMs"] = self._elapsed_ms(command["id"])
+            self._resolve_ack(command["id"])
+        elif kind == "done":
+            if command["ackMs"] is None:
+                command["ackMs"] = self._elapsed_ms(command["id"])
+                self._resolve_ack(command["id"])
+            if not message.get("ok", True):
+                self._finish(command, "failed", message.get("error") or "PC에서 명령 실행에 실패했습니다.")
+            elif command["command"] == "reboot":
+                # 재부팅은 PC가 다시 연결될 때 완료
+                command["status"] = "running"
+            else:
+                self._finish(command, "completed")
 
     async def send_personal_message(self, message: str, pc_number: int):
+        return await self.send_command(pc_number, message)
+
+    async def send_command(self, pc_number: int, command: str, timeout: float = PC_COMMAND_TIMEOUT, wait_ack: bool = True, route: bool = True):
+        """PC 하나에 명령 전송 후 명령 상태 반환
+
+        wait_ack이면 수신 확인까지 기다리되 전송을 포함해 timeout초를 넘기지 않습니다 (넘으면 상태는 "sent").
+        제한 시간 안에 보내지 못하거나 PC_ACK_TIMEOUT초 안에 수신 확인이 없으면 끊긴 연결로 보고 정리합니다.
+        PC가 다른 워커에 연결되어 있으면 그 워커에 전달합니다 (route=False면 이 워커의 연결만 사용).
+        """
+        websocket = self.active_connections.get(pc_number)
+        if websocket is None and route:
+            owner = self._owner(pc_number)
+            if owner is not None:
+                return await self._route(owner, pc_number, command, timeout, wait_ack)
+        record = self._new_record(pc_number, command, self.protocols.get(pc_number, "legacy"))
+        protocol = record["protocol"]
+        if websocket is None:
+            self._finish(record, "offline")
+            return dict(record)
+
+        loop = asyncio.get_running_loop()
+        ack = loop.create_future()
+        self.pending[record["id"]] = (time.monotonic(), ack, None)
+        if protocol == "json":
+            payload = json_dumps({"type": "command", "id": record["id"], "command": command})
+        else:
+            payload = command
+        try:
+            await asyncio.wait_for(websocket.send_text(payload), timeout)
+        except asyncio.TimeoutError:
+            self._drop(pc_number, websocket, record, "timeout", f"{timeout:g}초 안에 전송하지 못했습니다.")
+            return dict(record)
+        except Exception as e:
+            self._drop(pc_number, websocket, record, "error", str(e) or type(e).__name__)
+            return dict(record)
+        record["elapsedMs"] = self._elapsed_ms(record["id"])
+        print(f"📤 Sent '{command}' to PC #{pc_number}")
+
+        if protocol != "json":
+            # 이전 클라이언트는 응답이 없으므로 전송까지만 기록
+            self._finish(record, "sent")
+            return dict(record)
+        if record["status"] != "sending":
+            # 전송하는 사이 연결이 끊김
+            return dict(record)
+        record["status"] = "sent"
+        # 수신 확인 제한 시간 (넘으면 끊긴 연결), 이후 완료 제한 시간
+        timer = loop.call_later(PC_ACK_TIMEOUT, self._ack_expired, record["id"], websocket)
+        self.pending[record["id"]] = (self.pending[record["id"]][0], ack, timer)
+        if wait_ack:
+            remaining = timeout - (time.monotonic() - self.pending[record["id"]][0])
+            try:
+                await asyncio.wait_for(asyncio.shield(ack), max(0, remaining))
+            except asyncio.TimeoutError:
+                pass  # 수신 확인은 백그라운드에서 계속 기다림
+        return dict(record)
+
+    async def send_group_command(self, command: str, pc_numbers=None, timeout: float = PC_COMMAND_TIMEOUT):
+        """여러 PC에 동시에 명령 전송 (pc_numbers가 없으면 연결된 모든 PC), PC별 결과 목록 반환"""
+        if pc_numbers is None:
+            pc_numbers = self.online_pcs()
+        return await asyncio.gather(*(self.send_command(pc_number, command, timeout) for pc_number in pc_numbers))
+
+    def _new_record(self, pc_number, command, protocol):
+        record = {
+            "id": f"{self.worker_id}.{uuid.uuid4().hex}",
+            "pcNumber": pc_number,
+            "command": command,
+            "protocol": protocol,
+            "status": "sending",
+            "createdAt": datetime.now(pytz.timezone('Asia/Seoul')).isoformat(),
+            "completedAt": None,
+            "elapsedMs": None,
+            "ackMs": None,
+            "durationMs": None,
+            "error": None,
+            "worker": self.worker_id,
+        }
+        self._remember(record)
+        return record
+
+    async def _route(self, owner, pc_number, command, timeout, wait_ack):
+        """다른 워커에 연결된 PC로 명령 전달, 그 워커가 보낸 명령 상태 반환"""
+        wait = timeout + PC_BROKER_TIMEOUT
+        result = await self._request(
+            {"type": "command", "to": owner, "pc": pc_number, "command": command, "timeout": timeout, "waitAck": wait_ack}, wait
+        )
+        if result is None:
+            record = self._new_record(pc_number, command, self.presence[pc_number].get("protocol", "legacy"))
+            record["worker"] = owner
+            self._finish(record, "timeout", f"PC를 담당하는 워커({owner})가 {wait:g}초 안에 응답하지 않았습니다.")
+            return dict(record)
+        # 상태 조회용으로 보관 (이후 상태는 담당 워커에 조회)
+        self._remember(dict(result))
+        return result
+
+    async def get_command(self, command_id: str):
+        """명령 상태 조회 (다른 워커가 보낸 명령이면 그 워커에 최신 상태를 조회)"""
+        record = self.commands.get(command_id)
+        if record is not None and (record["worker"] == self.worker_id or not self._shared()):
+            return record
+        # 명령 id 앞부분이 명령을 만든 워커 id이므로 담당 워커에만 묻고, 알 수 없는 id는 기다리지 않음
+        owner = record["worker"] if record is not None else command_id.partition(".")[0]
+        if self._shared() and owner in self.workers:
+            latest = await self._request({"type": "lookup", "id": command_id, "to": owner}, PC_BROKER_TIMEOUT)
+            if latest is not None:
+                if record is not None:
+                    record.update(latest)
+                return latest
+        return record
+
+    def get_presence(self, pc_number: int):
+        self._expire_remote()
+        return self.presence.get(pc_number)
+
+    def presence_list(self):
+        """PC별 접속 상태 목록 (한 번이라도 연결된 PC, PC 번호순, 다른 워커에 연결된 PC 포함)"""
+        self._expire_remote()
+        return [self.presence[pc_number] for pc_number in sorted(self.presence)]
+
+    def online_pcs(self):
+        return [pc["pcNumber"] for pc in self.presence_list() if pc["online"]]
+
+    def _expire_remote(self):
+        """갱신이 끊긴 다른 워커의 PC는 오프라인으로 표시 (워커가 비정상 종료한 경우)"""
+        if PC_HEARTBEAT_INTERVAL <= 0:
+            return
+        now = time.monotonic()
+        for pc_number, seen in list(self.remote_seen.items()):
+            if now - seen > PC_HEARTBEAT_TIMEOUT:
+                del self.remote_seen[pc_number]
+                presence = self.presence.get(pc_number)
+                if presence is not None and presence["worker"] != self.worker_id:
+                    presence["online"] = False
+
+    def _owner(self, pc_number):
+        """PC가 연결된 다른 워커 id (없으면 None)"""
+        if not self._shared():
+            return None
+        presence = self.get_presence(pc_number)
+        if presence is None or not presence["online"] or presence["worker"] == self.worker_id:
+            return None
+        return presence["worker"]
+
+    def _reconnected(self, pc_number):
+        """재부팅 명령을 받은 PC가 다시 연결되면 재부팅 완료 (이 워커가 보낸 명령만)"""
+        for command in list(self.commands.values()):
+            if (command["pcNumber"] == pc_number and command["command"] == "reboot"
+                    and command["status"] in ("acked", "running") and command["id"] in self.pending):
+                self._finish(command, "completed")
+
+    def _shared(self):
+        return self.broker is not None and self.broker.shared
+
+    def _publish(self, message):
+        if not self._shared():
+            return
+        task = asyncio.create_task(self.broker.publish({**message, "from": self.worker_id}))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    def _publish_presence(self, pc_number):
+        if pc_number in self.presence:
+            self._publish({"type": "presence", "presence": self.presence[pc_number]})
+
+    async def _request(self, message, timeout):
+        """다른 워커에 요청을 보내고 첫 응답 반환 (제한 시간 안에 응답이 없으면 None)"""
+        request_id = uuid.uuid4().hex
+        future = asyncio.get_running_loop().create_future()
+        self.replies[request_id] = future
+        try:
+            self._publish({**message, "request": request_id})
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self.replies.pop(request_id, None)
+
+    async def handle_broker_message(self, message):
+        """다른 워커가 보낸 메시지 처리"""
+        if message.get("from") == self.worker_id:
+            return
+        self.workers.add(message.get("from"))
+        if message.get("to") not in (None, self.worker_id):
+            return
+        kind = message.get("type")
+        if kind == "presence":
+            presence = message["presence"]
+            pc_number = presence["pcNumber"]
+            # 이 워커에 연결된 PC는 이 워커의 상태가 기준
+            if pc_number in self.active_connections:
+                return
+            # 다른 워커로 다시 연결된 PC에 대해 늦게 도착한 이전 워커의 연결 끊김은 무시
+            current = self.presence.get(pc_number)
+            if not presence["online"] and current is not None and current["online"] and current["worker"] != presence["worker"]:
+                return
+            self.presence[pc_number] = presence
+            self.remote_seen[pc_number] = time.monotonic()
+            if presence["online"] and presence["protocol"] == "json":
+                self._reconnected(pc_number)
+        elif kind == "sync":
+            for pc_number in list(self.active_connections):
+                self._publish_presence(pc_number)
+        elif kind == "command":
+            result = await self.send_command(message["pc"], message["command"], message["timeout"], message["waitAck"], route=False)
+            self._publish({"type": "reply", "to": message["from"], "request": message["request"], "result": result})
+        elif kind == "lookup":
+            # 없는 명령도 바로 응답해 요청한 워커가 제한 시간까지 기다리지 않도록 함
+            record = self.commands.get(message["id"])
+            if record is not None and record["worker"] != self.worker_id:
+                record = None
+            self._publish({"type": "reply", "to": message["from"], "request": message["request"], "result": record})
+        elif kind == "reply":
+            future = self.replies.get(message.get("request"))
+            if future is not None and not future.done():
+                future.set_result(message.get("result"))
+
+    def _seen(self, pc_number):
         if pc_number in self.active_connections:
-            websocket = self.active_connections[pc_number]
-            await websocket.send_text(message)
-            print(f"📤 Sent '{message}' to PC #{pc_number}")
+            self.last_seen[pc_number] = time.monotonic()
+            self.presence[pc_number]["lastSeen"] = datetime.now(pytz.timezone('Asia/Seoul')).isoformat()
+
+    async def start(self):
+        self.broker = pc_broker
+        await self.broker.start(self.worker_id, self.handle_broker_message)
+        # 먼저 실행 중인 워커들의 접속 상태 요청
+        self._publish({"type": "sync"})
+        if PC_HEARTBEAT_INTERVAL > 0 and self.heartbeat_task is None:
+            self.heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+
+    async def close(self):
+        if self.heartbeat_task is not None:
+            self.heartbeat_task.cancel()
+            self.heartbeat_task = None
+        if self.broker is not None:
+            await self.broker.close()
+
+    async def _heartbeat_loop(self):
+        """주기적으로 모든 PC에 ping을 보내고 응답 없는 연결 정리"""
+        while True:
+            await asyncio.sleep(PC_HEARTBEAT_INTERVAL)
+            try:
+                await self.heartbeat()
+            except Exception as e:
+                print(f"❌ PC 연결 확인 중 오류: {e}")
+
+    async def heartbeat(self):
+        now = time.monotonic()
+        for pc_number, websocket in list(self.active_connections.items()):
+            # 이전 클라이언트는 pong을 보내지 않으므로 ping 전송 실패로만 끊김을 알 수 있음
+            if self.protocols.get(pc_number) == "json" and now - self.last_seen.get(pc_number, now) > PC_HEARTBEAT_TIMEOUT:
+                print(f"💤 PC #{pc_number} {PC_HEARTBEAT_TIMEOUT:g}초 동안 응답 없음")
+                self.disconnect(pc_number, websocket)
+                self._close_later(websocket)
+        await asyncio.gather(*(self._ping(pc_number, websocket) for pc_number, websocket in list(self.active_connections.items())))
+        # 다른 워커에 이 워커의 PC 접속 상태 갱신 (갱신이 끊기면 다른 워커에서 오프라인으로 표시)
+        for pc_number in list(self.active_connections):
+            self._publish_presence(pc_number)
+
+    async def _ping(self, pc_number, websocket):
+        try:
+            await asyncio.wait_for(websocket.send_text(json_dumps({"type": "ping", "ts": time.monotonic()})), PC_COMMAND_TIMEOUT)
+        except Exception as e:
+            print(f"❌ PC #{pc_number} ping 전송 실패: {str(e) or type(e).__name__}")
+            if self.active_connections.get(pc_number) is websocket:
+                self.disconnect(pc_number, websocket)
+                self._close_later(websocket)
+
+    def _remember(self, record):
+        self.commands[record["id"]] = record
+        while len(self.commands) > PC_COMMAND_RETENTION:
+            old_id, _ = self.commands.popitem(last=False)
+            self._clear_pending(old_id)
+
+    def _elapsed_ms(self, command_id):
+        pending = self.pending.get(command_id)
+        return round((time.monotonic() - pending[0]) * 1000, 2) if pending else None
+
+    def _resolve_ack(self, command_id):
+        """수신 확인 대기를 끝내고 완료 제한 시간 타이머로 교체"""
+        pending = self.pending.get(command_id)
+        if pending is None:
+            return
+        started, ack, timer = pending
+        if timer is not None:
+            timer.cancel()
+        if not ack.done():
+            ack.set_result(None)
+        timer = asyncio.get_running_loop().call_later(PC_COMPLETE_TIMEOUT, self._complete_expired, command_id)
+        self.pending[command_id] = (started, ack, timer)
+
+    def _clear_pending(self, command_id):
+        pending = self.pending.pop(command_id, None)
+        if pending is None:
+            return
+        _, ack, timer = pending
+        if timer is not None:
+            timer.cancel()
+        if not ack.done():
+            ack.set_result(None)
+
+    def _finish(self, record, status, error=None):
+        record["status"] = status
+        record["error"] = error
+        if status == "completed":
+            record["durationMs"] = self._elapsed_ms(record["id"])
+            record["completedAt"] = datetime.now(pytz.timezone('Asia/Seoul')).isoformat()
+            print(f"✅ PC #{record['pcNumber']} '{record['command']}' 완료 ({record['durationMs']}ms)")
+        elif status not in ("sent", "offline"):
+            print(f"❌ PC #{record['pcNumber']} '{record['command']}' 명령 {status}: {error}")
+        self._clear_pending(record["id"])
+
+    def _drop(self, pc_number, websocket, record, status, error):
+        """명령을 실패 처리하고 응답 없는 연결을 정리 (클라이언트가 다시 연결하면 새로 등록됨)"""
+        self._finish(record, status, error)
+        if self.active_connections.get(pc_number) is websocket:
+            self.disconnect(pc_number, websocket)
+            self._close_later(websocket)
+
+    def _close_later(self, websocket):
+        """연결 닫기를 백그라운드로 실행 (완료 전에 작업이 정리되지 않도록 참조 보관)"""
+        task = asyncio.create_task(self._close(websocket))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def _close(self, websocket):
+        try:
+            await asyncio.wait_for(websocket.close(), PC_COMMAND_TIMEOUT)
+        except Exception:
+            pass
+
+    def _ack_expired(self, command_id, websocket):
+        record = self.commands.get(command_id)
+        if record is not None and record["status"] in ("sending", "sent"):
+            self._drop(record["pcNumber"], websocket, record, "timeout", f"{PC_ACK_TIMEOUT:g}초 안에 수신 확인이 없습니다.")
+
+    def _complete_expired(self, command_id):
+        record = self.commands.get(command_id)
+        if record is not None and record["status"] in PC_COMMAND_PENDING:
+            self._finish(record, "timeout", f"{PC_COMPLETE_TIMEOUT:g}초 안에 완료되지 않았습니다.")
+
+    def status(self):
+        return {
+            "connected": sorted(self.active_connections),
+            "online": self.online_pcs(),
+            "pending": len(self.pending),
+            "heartbeatInterval": PC_HEARTBEAT_INTERVAL,
+            "worker": self.worker_id,
+            "broker": self.broker.status() if self.broker is not None else None,
+        }
 
 manager = ConnectionManager()
 
+def command_summary(command):
+    """응답에 포함하는 PC 명령 id와 상태"""
+    return {"commandId": command["id"], "commandStatus": command["status"]}
+
 @app.websocket("/ws/{pc_number}")
 async def websocket_endpoint(websocket: WebSocket, pc_number: int):
     """클라이언트 PC와 웹소켓 연결을 설정하는 엔드포인트"""
     await manager.connect(pc_number, websocket)
     try:
         while True:
-            # 클라이언트로부터 메시지를 기다리며 연결을 유지합니다.
-            # 실제로는 클라이언트가 메시지를 보내지 않으므로, 연결 상태 확인용입니다.
-            await websocket.receive_text()
+            # 클라이언트가 보내는 hello, 명령 수신 확인(ack), 실행 결과(done)를 처리합니다.
+            manager.handle_message(pc_number, await websocket.receive_text())
     except WebSocketDisconnect:
-        manager.disconnect(pc_number)
+        manager.disconnect(pc_number, websocket)
 
 
 # 로그인 요청 모델
@@ -81,6 +640,14 @@ class GuestCallRequest(BaseModel):
     pc_number: int
     message: str = "비회원 호출"
 
+# PC 그룹 명령 요청 모델 (대상을 지정하지 않으면 연결된 모든 PC)
+class PCCommandRequest(BaseModel):
+    command: str = "reboot"
+    pc_numbers: Optional[List[int]] = None  # 대상 PC 목록
+    pc_from: Optional[int] = None  # 대상 PC 범위 시작 (포함)
+    pc_to: Optional[int] = None  # 대상 PC 범위 끝 (포함)
+    timeout: Optional[float] = None  # PC별 전송 제한 시간(초)
+
 # 슬랙 설정
 bot_token = os.getenv('SLACK_BOT_TOKEN')
 app_token = os.getenv('SLACK_APP_TOKEN')
@@ -99,6 +666,11 @@ if not bot_token or not app_token:
 
 slack_app = AsyncApp(token=bot_token)
 
+# 슬랙 Web API 주소 (부하 테스트 등에서 data/fake_slack.py 대역 서버로 보낼 때 지정, 예: http://127.0.0.1:8931/api/)
+SLACK_API_URL = os.getenv("SLACK_API_URL")
+if SLACK_API_URL:
+    slack_app.client.base_url = SLACK_API_URL
+
 def load_config():
     """설정 파일 로드"""
     # Docker 환경과 로컬 환경 모두 지원
@@ -126,112 +698,467 @@ async def get_config():
     config = load_config()
     return {"pc_number": config["pc_number"]}
 
-async def send_slack_notification(message_or_name, affiliation=None, contact=None, email=None, pc_number=None, action="로그인", is_feedback=False):
-    """슬랙으로 알림 전송 (로그인/로그아웃 및 피드백)"""
-    try:
-        if is_feedback:
-            # 피드백 메시지인 경우 - message_or_name이 완성된 메시지
-            message = message_or_name
-            # 환경변수로 설정된 피드백 채널 사용
-            target_channel = feedback_channel
+# 지연 시간 히스토그램 구간 상한(ms)
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+class LatencyHistogram:
+    """지연 시간 히스토그램 (구간별 건수, 평균, 최대, 구간 기준 백분위수)"""
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, ms):
+        self.counts[bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def quantile(self, fraction):
+        """백분위수가 속한 구간의 상한(ms), 마지막 구간은 최대값"""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return LATENCY_BUCKETS_MS[index] if index < len(LATENCY_BUCKETS_MS) else round(self.max, 2)
+        return round(self.max, 2)
+
+    def to_json(self):
+        labels = [str(bound) for bound in LATENCY_BUCKETS_MS] + ["+Inf"]
+        return {
+            "count": self.count,
+            "avgMs": round(self.total / self.count, 2) if self.count else None,
+            "maxMs": round(self.max, 2),
+            "p50Ms": self.quantile(0.50),
+            "p99Ms": self.quantile(0.99),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+# API 요청 처리 시간 (경로별, 응답 헤더를 보낼 때까지), 슬랙 전송은 백그라운드라 포함되지 않음
+request_latency = {}
+route_paths = {}
+
+class RequestTimingMiddleware:
+    """/api/ 요청의 처리 시간을 경로(라우트)별 히스토그램에 기록하는 ASGI 미들웨어"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith("/api/"):
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+
+        async def timed_send(message):
+            if message["type"] == "http.response.start":
+                endpoint = scope.get("endpoint")
+                if endpoint is not None:
+                    if not route_paths:
+                        route_paths.update({route.endpoint: route.path for route in app.routes if hasattr(route, "endpoint")})
+                    key = f"{scope['method']} {route_paths.get(endpoint, endpoint.__name__)}"
+                    request_latency.setdefault(key, LatencyHistogram()).observe((time.perf_counter() - started) * 1000)
+            await send(message)
+
+        await self.app(scope, receive, timed_send)
+
+app.add_middleware(RequestTimingMiddleware)
+
+# 슬랙 알림 대기열 설정
+# 대기열 전체 최대 길이 (가득 차면 새 알림은 실패 처리)
+SLACK_QUEUE_SIZE = int(os.getenv("SLACK_QUEUE_SIZE", "1000"))
+# 채널별 최소 전송 간격(초), 슬랙은 채널당 초당 1건 정도로 제한
+SLACK_CHANNEL_INTERVAL = float(os.getenv("SLACK_CHANNEL_INTERVAL", "1.0"))
+# 전송 실패 시 최대 재시도 횟수와 재시도 대기 시간(초, 2배씩 증가), 모두 실패하면 보관함에 남겨 나중에 다시 전송
+SLACK_MAX_RETRIES = int(os.getenv("SLACK_MAX_RETRIES", "5"))
+SLACK_RETRY_BASE = float(os.getenv("SLACK_RETRY_BASE", "1.0"))
+SLACK_RETRY_MAX = float(os.getenv("SLACK_RETRY_MAX", "60"))
+# 전송 상태를 조회할 수 있도록 보관하는 최근 알림 수
+SLACK_STATUS_RETENTION = 1000
+# 서버 종료 시 남은 알림을 보내기 위해 기다리는 최대 시간(초)
+SLACK_SHUTDOWN_TIMEOUT = float(os.getenv("SLACK_SHUTDOWN_TIMEOUT", "5"))
+
+class SlackDispatcher:
+    """슬랙 알림 백그라운드 전송기
+
+    요청 처리 중에는 알림을 보관함(slack_outbox)에 기록하고 대기열에 넣은 뒤 알림 id만 돌려주며,
+    실제 전송은 채널별 작업이 맡습니다. 채널마다 SLACK_CHANNEL_INTERVAL 간격으로 순서대로 보내고,
+    429 응답은 Retry-After만큼 쉬었다가, 그 밖의 일시적인 오류는 지수 백오프로 재시도합니다.
+    재시도를 모두 실패했거나 대기열이 가득 찬 알림은 보류(deferred)해 두었다가 주기적으로 다시 보냅니다.
+    """
+
+    def __init__(self):
+        self.queues = {}
+        self.workers = {}
+        # 채널별 다음 전송 가능 시각 (time.monotonic 기준)
+        self.next_send = {}
+        # 알림 id → 전송 상태 (최근 SLACK_STATUS_RETENTION개)
+        self.notifications = OrderedDict()
+        self.size = 0
+        # 나중에 다시 보낼 알림 (id → (전송 상태, 메시지))
+        self.deferred = {}
+        self.retry_task = None
+        # 채널별 전송 지표 (슬랙 API 응답 시간, 대기열 대기 시간, 성공/실패/재시도 수, 마지막 오류)
+        self.metrics = {}
+
+    def _channel_metrics(self, channel):
+        metrics = self.metrics.get(channel)
+        if metrics is None:
+            metrics = self.metrics[channel] = {
+                "sent": 0, "failed": 0, "deferred": 0, "retries": 0, "rateLimited": 0, "errors": 0,
+                "lastError": None, "lastErrorAt": None,
+                "latency": LatencyHistogram(), "queueWait": LatencyHistogram(),
+            }
+        return metrics
+
+    def _record_error(self, channel, error):
+        metrics = self._channel_metrics(channel)
+        metrics["errors"] += 1
+        metrics["lastError"] = error
+        metrics["lastErrorAt"] = datetime.now(pytz.timezone('Asia/Seoul')).isoformat()
+
+    def start(self):
+        """보관함에 남아 있던 알림을 다시 전송하고 주기적 재시도 시작"""
+        try:
+            self._restore(slack_outbox.claim())
+        except Exception as e:
+            # 보관함이 손상되어도 서버는 시작 (알림 전송만 영향)
+            print(f"❌ 슬랙 알림 보관함 복원 실패: {e}")
+        self.retry_task = asyncio.create_task(self._retry_loop())
+
+    def _restore(self, entries):
+        for entry in entries:
+            notification = self._notification(entry["channel"], entry["kind"], entry["id"], entry["createdAt"])
+            notification["restored"] = True
+            self._remember(notification)
+            self._enqueue(notification, entry["text"])
+        if entries:
+            print(f"📮 보관함의 슬랙 알림 {len(entries)}개를 다시 전송합니다.")
+
+    def _notification(self, channel, kind, notification_id=None, created_at=None):
+        return {
+            "id": notification_id or uuid.uuid4().hex,
+            "kind": kind,
+            "channel": channel,
+            "status": "queued",
+            "attempts": 0,
+            "createdAt": created_at or datetime.now(pytz.timezone('Asia/Seoul')).isoformat(),
+            "sentAt": None,
+            "error": None,
+        }
+
+    def reserve(self, channel, kind):
+        """나중에 보낼 알림의 전송 상태를 미리 만들기 (묶음 전송용, 상태는 waiting)"""
+        notification = self._notification(channel, kind)
+        notification["status"] = "waiting"
+        self._remember(notification)
+        return notification
+
+    def submit(self, channel, text, kind, notification=None):
+        """알림을 보관함에 기록하고 대기열에 추가한 뒤 전송 상태를 반환 (reserve로 만든 상태를 넘길 수 있음)"""
+        if notification is None:
+            notification = self._notification(channel, kind)
+            self._remember(notification)
+        if not bot_token:
+            self._finish(notification, "failed", "슬랙 봇 토큰이 설정되지 않았습니다.")
+            return notification
+        try:
+            slack_outbox.add({
+                "id": notification["id"], "kind": kind, "channel": channel,
+                "text": text, "createdAt": notification["createdAt"],
+            })
+        except Exception as e:
+            # 보관함 기록에 실패해도 메모리 대기열로는 전송
+            print(f"⚠️ 슬랙 알림 보관함 기록 실패: {e}")
+        self._enqueue(notification, text)
+        return notification
+
+    def _enqueue(self, notification, text):
+        if self.size >= SLACK_QUEUE_SIZE:
+            # 대기열이 가득 차면 보관함에만 남겨 두고 다음 재시도 때 전송
+            self._defer(notification, text, "슬랙 알림 대기열이 가득 찼습니다.")
+            return
+        notification["status"] = "queued"
+        self.size += 1
+        self._queue(notification["channel"]).put_nowait((notification, text, time.monotonic()))
+
+    def _defer(self, notification, text, error):
+        notification["status"] = "deferred"
+        notification["error"] = error
+        self.deferred[notification["id"]] = (notification, text)
+        self._channel_metrics(notification["channel"])["deferred"] += 1
+
+    async def _retry_loop(self):
+        while True:
+            await asyncio.sleep(SLACK_OUTBOX_RETRY_INTERVAL)
+            try:
+                slack_outbox.renew()
+                # 다른 워커가 남기고 종료한 알림 가져오기 (sqlite 보관함)
+                self._restore(slack_outbox.claim())
+                deferred, self.deferred = self.deferred, {}
+                for notification, text in deferred.values():
+                    self._enqueue(notification, text)
+            except Exception as e:
+                print(f"❌ 슬랙 알림 재전송 준비 실패: {e}")
+
+    def get(self, notification_id):
+        return self.notifications.get(notification_id)
+
+    def _remember(self, notification):
+        self.notifications[notification["id"]] = notification
+        while len(self.notifications) > SLACK_STATUS_RETENTION:
+            self.notifications.popitem(last=False)
+
+    def _finish(self, notification, status, error=None):
+        notification["status"] = status
+        notification["error"] = error
+        self._channel_metrics(notification["channel"])[status] += 1
+        if status == "sent":
+            notification["sentAt"] = datetime.now(pytz.timezone('Asia/Seoul')).isoformat()
+            try:
+                slack_outbox.remove(notification["id"])
+            except Exception as e:
+                print(f"⚠️ 슬랙 알림 보관함 정리 실패: {e}")
         else:
-            # 로그인/로그아웃 알림인 경우
-            name = message_or_name
-            # 한국 시간대 설정
-            korea_tz = pytz.timezone('Asia/Seoul')
-            current_time = datetime.now(korea_tz).strftime("%Y-%m-%d %H:%M:%S")
-            
-            # 연락처와 이메일이 없거나 빈 문자열인 경우 처리
-            contact_text = f"\n연락처: {contact}" if contact and contact.strip() else ""
-            email_text = f"\n이메일: {email}" if email and email.strip() else ""
-            
-            if action == "로그인":
-                message = f"🟢 *PC방 로그인 알림*\n이름: {name}\n소속: {affiliation}{contact_text}{email_text}\n{pc_number}번 PC에서 로그인하였습니다.\n시간: {current_time}"
+            # 실패한 알림도 보관함에 남아 서버를 다시 시작하면 재전송됨 (채널 설정 오류 등을 고친 뒤)
+            print(f"❌ 슬랙 알림 전송 실패 ({notification['channel']}): {error}")
+
+    def _queue(self, channel):
+        """채널별 대기열 (처음 사용할 때 전송 작업 시작)"""
+        queue = self.queues.get(channel)
+        if queue is None:
+            queue = self.queues[channel] = asyncio.Queue()
+            self._channel_metrics(channel)
+        worker = self.workers.get(channel)
+        if worker is None or worker.done():
+            self.workers[channel] = asyncio.create_task(self._worker(channel, queue))
+        return queue
+
+    async def _worker(self, channel, queue):
+        while True:
+            notification, text, queued_at = await queue.get()
+            try:
+                await self._deliver(channel, notification, text, queued_at)
+            except Exception as e:
+                self._finish(notification, "failed", str(e))
+            finally:
+                self.size -= 1
+                queue.task_done()
+
+    async def _deliver(self, channel, notification, text, queued_at):
+        """알림 하나를 보낼 때까지 재시도 (같은 채널의 다음 알림은 그동안 대기)"""
+        metrics = self._channel_metrics(channel)
+        attempts = 0
+        while True:
+            delay = self.next_send.get(channel, 0) - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if attempts == 0:
+                # 대기열에 들어온 뒤 첫 전송까지 기다린 시간 (채널 간격/앞선 알림의 재시도 포함)
+                metrics["queueWait"].observe((time.monotonic() - queued_at) * 1000)
             else:
-                message = f"🔴 *PC방 로그아웃 알림*\n이름: {name}\n소속: {affiliation}{contact_text}{email_text}\n{pc_number}번 PC에서 로그아웃하였습니다.\n시간: {current_time}"
-            
-            target_channel = slack_channel
-        
-        await slack_app.client.chat_postMessage(
-            channel=target_channel,
-            text=message
-        )
-        return True
-    except Exception as e:
-        print(f"슬랙 알림 전송 실패: {e}")
-        return False
+                metrics["retries"] += 1
+            notification["status"] = "sending"
+            notification["attempts"] += 1
+            attempts += 1
+            self.next_send[channel] = time.monotonic() + SLACK_CHANNEL_INTERVAL
+            started = time.perf_counter()
+            try:
+                await slack_app.client.chat_postMessage(channel=channel, text=text)
+                metrics["latency"].observe((time.perf_counter() - started) * 1000)
+                self._finish(notification, "sent")
+                return
+            except SlackApiError as e:
+                metrics["latency"].observe((time.perf_counter() - started) * 1000)
+                status_code = e.response.status_code
+                if status_code == 429:
+                    metrics["rateLimited"] += 1
+                    # 429는 재시도 횟수와 관계없이 Retry-After만큼 쉬고 다시 보냄
+                    retry_after = float(e.response.headers.get("Retry-After", SLACK_CHANNEL_INTERVAL))
+                    self.next_send[channel] = time.monotonic() + retry_after
+                    notification["status"] = "retrying"
+                    notification["error"] = f"rate limited (Retry-After {retry_after:g}s)"
+                    print(f"⏳ 슬랙 전송 제한 ({channel}), {retry_after:g}초 후 재시도")
+                    continue
+                if status_code < 500:
+                    # 채널 없음, 토큰 오류 등은 다시 보내도 실패하므로 재시도하지 않음
+                    error = e.response.get("error") or str(e)
+                    self._record_error(channel, error)
+                    self._finish(notification, "failed", error)
+                    return
+                error = str(e)
+            except Exception as e:
+                metrics["latency"].observe((time.perf_counter() - started) * 1000)
+                error = str(e) or type(e).__name__
+            self._record_error(channel, error)
+            if attempts > SLACK_MAX_RETRIES:
+                self._defer(notification, text, error)
+                print(f"📮 슬랙 알림을 보관함에 두고 {SLACK_OUTBOX_RETRY_INTERVAL:g}초 후 다시 보냅니다 ({channel}): {error}")
+                return
+            backoff = min(SLACK_RETRY_MAX, SLACK_RETRY_BASE * 2 ** (attempts - 1))
+            notification["status"] = "retrying"
+            notification["error"] = error
+            print(f"🔁 슬랙 알림 재시도 {attempts}/{SLACK_MAX_RETRIES} ({channel}), {backoff:g}초 후: {error}")
+            self.next_send[channel] = max(self.next_send[channel], time.monotonic() + backoff)
 
-async def send_call_notification(name: str, affiliation: str, contact: Optional[str], email: Optional[str], pc_number: int, message: str = "호출요청"):
-    """호출 채널로 알림 전송"""
-    try:
-        print(f"📤 슬랙 호출 메시지 전송 시작...")
-        print(f"채널: {call_channel}")
-        
-        # 한국 시간대 설정
-        korea_tz = pytz.timezone('Asia/Seoul')
-        current_time = datetime.now(korea_tz).strftime("%Y-%m-%d %H:%M:%S")
-        
-        # 연락처와 이메일이 없거나 빈 문자열인 경우 처리
-        contact_text = f"\n연락처: {contact}" if contact and contact.strip() else ""
-        email_text = f"\n이메일: {email}" if email and email.strip() else ""
-        
-        call_message = f"📢 *호출 요청*\n이름: {name}\n소속: {affiliation}{contact_text}{email_text}\n{pc_number}번 PC에서 호출하였습니다.\n메시지: {message}\n시간: {current_time}"
-        
-        print(f"전송할 메시지: {call_message}")
-        
-        # 슬랙 봇 토큰 확인
-        if not bot_token:
-            print("❌ 슬랙 봇 토큰이 설정되지 않았습니다!")
-            return False
-        
-        result = await slack_app.client.chat_postMessage(
-            channel=call_channel,  # 호출 전용 채널 (환경변수)
-            text=call_message
-        )
-        
-        print(f"✅ 슬랙 메시지 전송 성공: {result}")
-        return True
-        
-    except Exception as e:
-        print(f"❌ 호출 알림 전송 실패: {e}")
-        print(f"에러 타입: {type(e)}")
-        print(f"슬랙 봇 토큰 존재 여부: {bool(bot_token)}")
-        print(f"호출 채널: {call_channel}")
-        return False
-
-async def send_guest_call_notification(pc_number: int, message: str = "비회원 호출"):
-    """비회원 호출 채널로 알림 전송"""
-    try:
-        print(f"📤 비회원 슬랙 호출 메시지 전송 시작...")
-        print(f"채널: {call_channel}")
-        
-        # 한국 시간대 설정
-        korea_tz = pytz.timezone('Asia/Seoul')
-        current_time = datetime.now(korea_tz).strftime("%Y-%m-%d %H:%M:%S")
-        
-        call_message = f"📢 *비회원 호출 요청*\n{pc_number}번 PC에서 비회원이 호출하였습니다.\n메시지: {message}\n시간: {current_time}"
-        
-        print(f"전송할 메시지: {call_message}")
-        
-        # 슬랙 봇 토큰 확인
-        if not bot_token:
-            print("❌ 슬랙 봇 토큰이 설정되지 않았습니다!")
-            return False
-        
-        result = await slack_app.client.chat_postMessage(
-            channel=call_channel,  # 호출 전용 채널 (환경변수)
-            text=call_message
-        )
-        
-        print(f"✅ 비회원 슬랙 메시지 전송 성공: {result}")
-        return True
-        
-    except Exception as e:
-        print(f"❌ 비회원 호출 알림 전송 실패: {e}")
-        print(f"에러 타입: {type(e)}")
-        print(f"슬랙 봇 토큰 존재 여부: {bool(bot_token)}")
-        print(f"호출 채널: {call_channel}")
-        return False
+    async def close(self):
+        """남은 알림을 잠시 기다렸다가 전송 작업 종료 (보내지 못한 알림은 보관함에 남음)"""
+        if self.retry_task is not None:
+            self.retry_task.cancel()
+            self.retry_task = None
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(queue.join() for queue in self.queues.values())), SLACK_SHUTDOWN_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            print(f"⚠️ 보내지 못한 슬랙 알림 {self.size}개는 보관함에 남겨 다음 시작 때 전송합니다.")
+        for worker in self.workers.values():
+            worker.cancel()
+        self.workers = {}
+        slack_outbox.close()
+
+    def status(self):
+        channels = {}
+        for channel, metrics in self.metrics.items():
+            queue = self.queues.get(channel)
+            channels[channel] = {
+                "queued": queue.qsize() if queue is not None else 0,
+                **{key: value.to_json() if isinstance(value, LatencyHistogram) else value for key, value in metrics.items()},
+            }
+        return {
+            "queued": self.size,
+            "deferred": len(self.deferred),
+            "channels": channels,
+            "outbox": slack_outbox.status(),
+        }
+
+slack_dispatcher = SlackDispatcher()
+
+# 로그인/로그아웃 알림 묶음 전송 (초), 0이면 한 건씩 바로 전송
+# 세미나 시작 시간처럼 로그인이 몰릴 때 이 시간 동안의 알림을 요약 메시지 하나로 보냄 (호출 알림은 항상 바로 전송)
+SLACK_LOGIN_DIGEST_WINDOW = float(os.getenv("SLACK_LOGIN_DIGEST_WINDOW", "0"))
+# 요약 메시지 하나에 담는 최대 알림 수 (넘으면 기다리지 않고 바로 전송)
+SLACK_LOGIN_DIGEST_MAX_ITEMS = int(os.getenv("SLACK_LOGIN_DIGEST_MAX_ITEMS", "50"))
+
+class LoginDigest:
+    """로그인/로그아웃 알림 묶음
+
+    첫 알림이 들어오면 SLACK_LOGIN_DIGEST_WINDOW초 뒤에 그동안 모인 알림을 요약 메시지 하나로 보냅니다.
+    같은 묶음의 요청은 모두 같은 알림 id를 받으며, 한 건뿐이면 평소 형식의 메시지를 그대로 보냅니다.
+    """
+
+    def __init__(self, dispatcher):
+        self.dispatcher = dispatcher
+        # [(action, 요약 줄, 단건 메시지)]
+        self.items = []
+        self.notification = None
+        self.timer = None
+
+    def add(self, action, line, message):
+        if self.notification is None:
+            self.notification = self.dispatcher.reserve(slack_channel, "login_digest")
+            self.timer = asyncio.create_task(self._flush_later())
+        notification = self.notification
+        self.items.append((action, line, message))
+        if len(self.items) >= SLACK_LOGIN_DIGEST_MAX_ITEMS:
+            self.flush()
+        return notification
+
+    async def _flush_later(self):
+        await asyncio.sleep(SLACK_LOGIN_DIGEST_WINDOW)
+        self.timer = None
+        self.flush()
+
+    def flush(self):
+        """모인 알림을 요약 메시지로 전송"""
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        items, notification = self.items, self.notification
+        self.items, self.notification = [], None
+        if not items:
+            return
+        if len(items) == 1:
+            message = items[0][2]
+        else:
+            logins = sum(1 for action, _, _ in items if action == "로그인")
+            header = f"📋 *PC방 로그인/로그아웃 요약* (로그인 {logins}건 · 로그아웃 {len(items) - logins}건)"
+            message = "\n".join([header] + [line for _, line, _ in items])
+        notification["count"] = len(items)
+        self.dispatcher.submit(slack_channel, message, "login_digest", notification)
+
+    def close(self):
+        """서버 종료 시 모인 알림을 바로 전송 (보관함에 기록되어 재시작 후에도 전송됨)"""
+        self.flush()
+
+login_digest = LoginDigest(slack_dispatcher)
+
+def notification_summary(notification):
+    """응답에 포함하는 알림 id와 상태"""
+    return {"notificationId": notification["id"], "notificationStatus": notification["status"]}
+
+def send_slack_notification(message_or_name, affiliation=None, contact=None, email=None, pc_number=None, action="로그인", is_feedback=False):
+    """슬랙 알림 전송 요청 (로그인/로그아웃 및 피드백), 대기열에 넣고 전송 상태를 반환"""
+    if is_feedback:
+        # 피드백 메시지인 경우 - message_or_name이 완성된 메시지
+        message = message_or_name
+        # 환경변수로 설정된 피드백 채널 사용
+        return slack_dispatcher.submit(feedback_channel, message, "feedback")
+
+    # 로그인/로그아웃 알림인 경우
+    name = message_or_name
+    # 한국 시간대 설정
+    korea_tz = pytz.timezone('Asia/Seoul')
+    current_time = datetime.now(korea_tz).strftime("%Y-%m-%d %H:%M:%S")
+
+    # 연락처와 이메일이 없거나 빈 문자열인 경우 처리
+    contact_text = f"\n연락처: {contact}" if contact and contact.strip() else ""
+    email_text = f"\n이메일: {email}" if email and email.strip() else ""
+
+    if action == "로그인":
+        message = f"🟢 *PC방 로그인 알림*\n이름: {name}\n소속: {affiliation}{contact_text}{email_text}\n{pc_number}번 PC에서 로그인하였습니다.\n시간: {current_time}"
+    else:
+        message = f"🔴 *PC방 로그아웃 알림*\n이름: {name}\n소속: {affiliation}{contact_text}{email_text}\n{pc_number}번 PC에서 로그아웃하였습니다.\n시간: {current_time}"
+
+    if SLACK_LOGIN_DIGEST_WINDOW > 0 and bot_token:
+        emoji = "🟢" if action == "로그인" else "🔴"
+        line = f"{emoji} {current_time[11:]} {name} ({affiliation}) {pc_number}번 PC {action}"
+        return login_digest.add(action, line, message)
+
+    return slack_dispatcher.submit(slack_channel, message, "login" if action == "로그인" else "logout")
+
+def send_call_notification(name: str, affiliation: str, contact: Optional[str], email: Optional[str], pc_number: int, message: str = "호출요청"):
+    """호출 채널로 알림 전송 요청"""
+    # 한국 시간대 설정
+    korea_tz = pytz.timezone('Asia/Seoul')
+    current_time = datetime.now(korea_tz).strftime("%Y-%m-%d %H:%M:%S")
+
+    # 연락처와 이메일이 없거나 빈 문자열인 경우 처리
+    contact_text = f"\n연락처: {contact}" if contact and contact.strip() else ""
+    email_text = f"\n이메일: {email}" if email and email.strip() else ""
+
+    call_message = f"📢 *호출 요청*\n이름: {name}\n소속: {affiliation}{contact_text}{email_text}\n{pc_number}번 PC에서 호출하였습니다.\n메시지: {message}\n시간: {current_time}"
+
+    print(f"📤 슬랙 호출 메시지 전송 요청 (채널: {call_channel})")
+    # 호출 전용 채널 (환경변수)
+    return slack_dispatcher.submit(call_channel, call_message, "call")
+
+def send_guest_call_notification(pc_number: int, message: str = "비회원 호출"):
+    """비회원 호출 채널로 알림 전송 요청"""
+    # 한국 시간대 설정
+    korea_tz = pytz.timezone('Asia/Seoul')
+    current_time = datetime.now(korea_tz).strftime("%Y-%m-%d %H:%M:%S")
+
+    call_message = f"📢 *비회원 호출 요청*\n{pc_number}번 PC에서 비회원이 호출하였습니다.\n메시지: {message}\n시간: {current_time}"
+
+    print(f"📤 비회원 슬랙 호출 메시지 전송 요청 (채널: {call_channel})")
+    # 호출 전용 채널 (환경변수)
+    return slack_dispatcher.submit(call_channel, call_message, "guest_call")
 
 @app.post("/api/login")
 async def login(request: LoginRequest):
@@ -246,13 +1173,11 @@ async def login(request: LoginRequest):
             "email": request.email,
             "pc_number": request.pc_number
         }
-        login_history.append(login_record)
-        
-        # 로그인 기록을 파일에 저장
-        save_login_history()
+        # 로그인 기록을 저장소에 저장
+        history_store.append("login", login_record)
         
-        # 슬랙 알림 전송
-        success = await send_slack_notification(
+        # 슬랙 알림 전송 (대기열에 넣고 바로 응답)
+        notification = send_slack_notification(
             request.name, 
             request.affiliation, 
             request.contact,
@@ -261,10 +1186,10 @@ async def login(request: LoginRequest):
             "로그인"
         )
         
-        if success:
-            return {"status": "success", "message": "로그인이 완료되었습니다."}
+        if notification["status"] != "failed":
+            return {"status": "success", "message": "로그인이 완료되었습니다.", **notification_summary(notification)}
         else:
-            return {"status": "warning", "message": "로그인은 되었지만 슬랙 알림 전송에 실패했습니다."}
+            return {"status": "warning", "message": "로그인은 되었지만 슬랙 알림 전송에 실패했습니다.", **notification_summary(notification)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"로그인 처리 중 오류가 발생했습니다: {str(e)}")
 
@@ -272,11 +1197,11 @@ async def login(request: LoginRequest):
 async def logout(request: LoginRequest):
     """로그아웃 API"""
     try:
-        # WebSocket을 통해 해당 PC 클라이언트에 재부팅 명령 전송
-        await manager.send_personal_message("reboot", request.pc_number)
+        # WebSocket을 통해 해당 PC 클라이언트에 재부팅 명령 전송 (수신 확인은 기다리지 않음)
+        command = await manager.send_command(request.pc_number, "reboot", wait_ack=False)
         
-        # 슬랙 알림 전송
-        success = await send_slack_notification(
+        # 슬랙 알림 전송 (대기열에 넣고 바로 응답)
+        notification = send_slack_notification(
             request.name, 
             request.affiliation, 
             request.contact,
@@ -285,10 +1210,10 @@ async def logout(request: LoginRequest):
             "로그아웃"
         )
         
-        if success:
-            return {"status": "success", "message": "로그아웃이 완료되었습니다."}
+        if notification["status"] != "failed":
+            return {"status": "success", "message": "로그아웃이 완료되었습니다.", **notification_summary(notification), **command_summary(command)}
         else:
-            return {"status": "warning", "message": "로그아웃은 되었지만 슬랙 알림 전송에 실패했습니다."}
+            return {"status": "warning", "message": "로그아웃은 되었지만 슬랙 알림 전송에 실패했습니다.", **notification_summary(notification), **command_summary(command)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"로그아웃 처리 중 오류가 발생했습니다: {str(e)}")
 
@@ -311,11 +1236,10 @@ async def call_staff(request: CallRequest):
             "type": "member"
         }
         
-        call_history.append(call_record)
-        save_call_history()
+        history_store.append("call", call_record)
         
-        # 호출 알림 전송
-        success = await send_call_notification(
+        # 호출 알림 전송 (대기열에 넣고 바로 응답)
+        notification = send_call_notification(
             request.name,
             request.affiliation,
             request.contact,
@@ -324,12 +1248,12 @@ async def call_staff(request: CallRequest):
             request.message
         )
         
-        if success:
-            print(f"✅ 호출 전송 성공: {request.name}")
-            return {"status": "success", "message": "호출이 전송되었습니다."}
+        if notification["status"] != "failed":
+            print(f"✅ 호출 접수: {request.name} (알림 {notification['id']})")
+            return {"status": "success", "message": "호출이 전송되었습니다.", **notification_summary(notification)}
         else:
             print(f"❌ 호출 전송 실패: {request.name}")
-            return {"status": "error", "message": "호출 전송에 실패했습니다."}
+            return {"status": "error", "message": "호출 전송에 실패했습니다.", **notification_summary(notification)}
     except Exception as e:
         print(f"❌ 호출 API 에러: {str(e)}")
         raise HTTPException(status_code=500, detail=f"호출 처리 중 오류가 발생했습니다: {str(e)}")
@@ -353,25 +1277,96 @@ async def guest_call_staff(request: GuestCallRequest):
             "type": "guest"
         }
         
-        call_history.append(call_record)
-        save_call_history()
+        history_store.append("call", call_record)
         
-        # 비회원 호출 알림 전송
-        success = await send_guest_call_notification(
+        # 비회원 호출 알림 전송 (대기열에 넣고 바로 응답)
+        notification = send_guest_call_notification(
             request.pc_number,
             request.message
         )
         
-        if success:
-            print(f"✅ 비회원 호출 전송 성공: {request.pc_number}번 PC")
-            return {"status": "success", "message": "호출이 전송되었습니다."}
+        if notification["status"] != "failed":
+            print(f"✅ 비회원 호출 접수: {request.pc_number}번 PC (알림 {notification['id']})")
+            return {"status": "success", "message": "호출이 전송되었습니다.", **notification_summary(notification)}
         else:
             print(f"❌ 비회원 호출 전송 실패: {request.pc_number}번 PC")
-            return {"status": "error", "message": "호출 전송에 실패했습니다."}
+            return {"status": "error", "message": "호출 전송에 실패했습니다.", **notification_summary(notification)}
     except Exception as e:
         print(f"❌ 비회원 호출 API 에러: {str(e)}")
         raise HTTPException(status_code=500, detail=f"호출 처리 중 오류가 발생했습니다: {str(e)}")
 
+@app.post("/api/pcs/command")
+async def send_pc_command(request: PCCommandRequest):
+    """여러 PC에 명령 동시 전송 (예: 마감 시 전체 종료), PC별 결과 표 반환"""
+    if request.command not in PC_COMMANDS:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 명령입니다: {request.command} (가능: {', '.join(PC_COMMANDS)})")
+    if (request.pc_from is None) != (request.pc_to is None):
+        raise HTTPException(status_code=400, detail="pc_from과 pc_to를 함께 지정해야 합니다.")
+    if request.pc_from is not None and request.pc_from > request.pc_to:
+        raise HTTPException(status_code=400, detail="pc_from은 pc_to보다 클 수 없습니다.")
+    # 대상 수를 PC 수로 제한 (범위/목록을 그대로 펼치지 않도록 먼저 검사)
+    numbers = list(request.pc_numbers or [])
+    if request.pc_from is not None:
+        numbers += [request.pc_from, request.pc_to]
+    if len(numbers) > PC_MAX_NUMBER or any(number < 1 or number > PC_MAX_NUMBER for number in numbers):
+        raise HTTPException(status_code=400, detail=f"PC 번호는 1~{PC_MAX_NUMBER}번만 지정할 수 있습니다.")
+    try:
+        pc_numbers = None
+        if request.pc_numbers is not None or request.pc_from is not None:
+            pc_numbers = set(request.pc_numbers or [])
+            if request.pc_from is not None:
+                pc_numbers.update(range(request.pc_from, request.pc_to + 1))
+            pc_numbers = sorted(pc_numbers)
+        timeout = request.timeout if request.timeout and request.timeout > 0 else PC_COMMAND_TIMEOUT
+
+        started = time.perf_counter()
+        results = await manager.send_group_command(request.command, pc_numbers, timeout)
+        elapsed = round((time.perf_counter() - started) * 1000, 2)
+        sent = sum(1 for result in results if result["status"] in PC_COMMAND_DELIVERED)
+        print(f"🖥️ PC 명령 '{request.command}' {sent}/{len(results)}대 전송 ({elapsed}ms)")
+        return {
+            "status": "success" if sent == len(results) else "partial",
+            "command": request.command,
+            "requested": len(results),
+            "sent": sent,
+            "elapsedMs": elapsed,
+            "results": results,
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"PC 명령 처리 중 오류가 발생했습니다: {str(e)}")
+
+@app.get("/api/pcs")
+async def get_pcs():
+    """PC 접속 상태 목록 (서버가 유지하는 접속 상태 표를 그대로 반환)
+
+    - online: 현재 연결 여부
+    - lastSeen: 마지막으로 메시지(pong 포함)를 받은 시각
+    - rttMs: 마지막 ping/pong 왕복 시간 (이전 클라이언트는 null)
+    """
+    pcs = manager.presence_list()
+    return {
+        "online": sum(1 for pc in pcs if pc["online"]),
+        "total": len(pcs),
+        "heartbeatInterval": PC_HEARTBEAT_INTERVAL,
+        "pcs": pcs,
+    }
+
+@app.get("/api/pcs/{pc_number}")
+async def get_pc(pc_number: int):
+    """PC 하나의 접속 상태"""
+    presence = manager.get_presence(pc_number)
+    if presence is None:
+        raise HTTPException(status_code=404, detail=f"{pc_number}번 PC는 연결된 적이 없습니다.")
+    return presence
+
+@app.get("/api/pcs/commands/{command_id}")
+async def get_pc_command(command_id: str):
+    """PC 명령 상태 조회 (수신 확인까지 걸린 시간 ackMs, 재부팅 완료까지 걸린 시간 durationMs)"""
+    command = await manager.get_command(command_id)
+    if command is None:
+        raise HTTPException(status_code=404, detail="명령을 찾을 수 없습니다.")
+    return command
+
 @app.get("/api/shorts-images")
 async def get_shorts_images():
     """숏츠 이미지 갤러리 데이터 API"""
@@ -484,8 +1479,7 @@ async def download_template(template_number: int):
                 "template_title": template_titles.get(template_number, str(template_number)),
                 "filename": zip_filename,
             }
-            download_history.append(download_record)
-            save_download_history()
+            history_store.append("download", download_record)
         except Exception as log_err:
             print(f"⚠️ 다운로드 기록 저장 실패: {log_err}")
 
@@ -523,103 +1517,225 @@ async def download_page():
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="다운로드 통계 페이지를 찾을 수 없습니다.")
 
-@app.get("/api/download-statistics")
-async def get_download_statistics(period: str = "week"):
-    """다운로드 통계 데이터 API (일/주/월/템플릿별)"""
+# 상세 목록 API 페이지 크기 (기본값 / 최댓값)
+LIST_PAGE_LIMIT = 100
+LIST_PAGE_MAX_LIMIT = 1000
+
+def page_limit(limit):
+    """요청한 페이지 크기를 1 ~ LIST_PAGE_MAX_LIMIT 범위로 제한"""
+    return max(1, min(limit, LIST_PAGE_MAX_LIMIT))
+
+# 기간 지정 통계 (from/to) 집계 단위
+RANGE_GRANULARITIES = ("day", "week", "month", "quarter")
+# granularity를 지정하지 않았을 때 일 단위로 보여줄 최대 기간(일), 넘으면 월 단위
+RANGE_AUTO_DAY_LIMIT = 62
+# 한 응답에 담을 수 있는 최대 구간 수
+RANGE_MAX_BUCKETS = 400
+# 조회할 수 있는 연도 (구간 끝 다음 날/다음 달을 계산해도 날짜 범위를 넘지 않도록)
+RANGE_MIN_YEAR = 1900
+RANGE_MAX_YEAR = 9998
+
+def parse_date_range(date_from, date_to=None, granularity=None):
+    """from/to 날짜(YYYY-MM-DD, 둘 다 포함)와 집계 단위 확인
+
+    반환값은 (시작일, 종료일, 집계 단위)이며 to를 생략하면 오늘까지입니다.
+    """
     try:
-        # 현재 시간 (한국 시간)
-        now = datetime.now(pytz.timezone('Asia/Seoul'))
-        today = now.date()
-
-        # 기간 설정
-        if period == "month":
-            days_back = 30
-            period_name = "최근 30일"
-        elif period == "year":
-            days_back = 365
-            period_name = "최근 12개월"
-        else:  # week
-            days_back = 7
-            period_name = "최근 7일"
-
-        period_ago = today - timedelta(days=days_back)
-
-        # 총 다운로드 수
-        total_downloads = len(download_history)
-
-        # 기간별 다운로드 수 및 일별 데이터
-        daily_counts = defaultdict(int)
-        template_counts = defaultdict(int)
-
-        for record in download_history:
-            record_date = datetime.fromisoformat(record["timestamp"]).date()
-            if period == "year":
-                # 연간 통계를 위해 template_counts는 전체 누적, daily_counts는 해당 연도 기간만
-                template_counts[record.get("template_title") or str(record.get("template_number"))] += 1
-                if record_date.year == today.year:
-                    year_month = record_date.strftime("%Y-%m")
-            if period != "year":
-                if record_date >= period_ago:
-                    daily_counts[record_date.isoformat()] += 1
-                    template_counts[record.get("template_title") or str(record.get("template_number"))] += 1
-
-        # 일별 데이터
-        daily_data = []
-        if period != "year":
-            for i in range(days_back):
-                date = (today - timedelta(days=days_back-1-i)).isoformat()
-                daily_data.append({
-                    "date": date,
-                    "count": daily_counts[date]
-                })
-
-        # 월별 데이터 (년도 탭용)
-        monthly_data = []
-        if period == "year":
-            current_year = today.year
-            monthly_counts = defaultdict(int)
-            for record in download_history:
-                record_date = datetime.fromisoformat(record["timestamp"]).date()
-                if record_date.year == current_year:
-                    year_month = record_date.strftime("%Y-%m")
-                    monthly_counts[year_month] += 1
-            for month in range(1, 12+1):
-                year_month = f"{current_year}-{month:02d}"
-                monthly_data.append({
-                    "month": year_month,
-                    "count": monthly_counts[year_month]
-                })
-
-        # 기간 합계
-        if period == "year":
-            period_downloads = sum(item["count"] for item in monthly_data)
-        else:
-            period_downloads = sum(item["count"] for item in daily_data)
+        first = datetime.fromisoformat(date_from).date()
+        last = datetime.fromisoformat(date_to).date() if date_to else datetime.now(pytz.timezone('Asia/Seoul')).date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="날짜는 YYYY-MM-DD 형식이어야 합니다.")
+    if last < first:
+        raise HTTPException(status_code=400, detail="to 날짜는 from 날짜보다 빠를 수 없습니다.")
+    if first.year < RANGE_MIN_YEAR or last.year > RANGE_MAX_YEAR:
+        raise HTTPException(status_code=400, detail=f"날짜는 {RANGE_MIN_YEAR}~{RANGE_MAX_YEAR}년 사이여야 합니다.")
 
-        return {
-            "totalDownloads": total_downloads,
-            "periodDownloads": period_downloads,
-            "dailyData": daily_data,
-            "monthlyData": monthly_data,
-            "templateData": dict(template_counts),
-            "period": period,
-            "periodName": period_name
-        }
+    if granularity in (None, "", "auto"):
+        granularity = "day" if (last - first).days < RANGE_AUTO_DAY_LIMIT else "month"
+    elif granularity not in RANGE_GRANULARITIES:
+        raise HTTPException(status_code=400, detail=f"granularity는 {', '.join(RANGE_GRANULARITIES)} 중 하나여야 합니다.")
+
+    if range_bucket_count(first, last, granularity) > RANGE_MAX_BUCKETS:
+        raise HTTPException(status_code=400, detail="조회 구간이 너무 많습니다. 더 큰 집계 단위를 사용해주세요.")
+    return first, last, granularity
+
+def range_label(day, granularity):
+    """날짜('YYYY-MM-DD') 또는 월('YYYY-MM')이 속한 구간 이름
+
+    day: 날짜, week: 해당 주 월요일 날짜, month: 'YYYY-MM', quarter: 'YYYY-Qn'
+    """
+    if granularity == "day":
+        return day
+    if granularity == "week":
+        weekday = datetime.fromisoformat(day).date()
+        return (weekday - timedelta(days=weekday.weekday())).isoformat()
+    if granularity == "month":
+        return day[:7]
+    return f"{day[:4]}-Q{(int(day[5:7]) - 1) // 3 + 1}"
+
+def range_bucket_count(first, last, granularity):
+    """시작일~종료일을 덮는 구간 수 (range_labels를 만들지 않고 계산)"""
+    if granularity == "day":
+        return (last - first).days + 1
+    if granularity == "week":
+        return ((last - timedelta(days=last.weekday())) - (first - timedelta(days=first.weekday()))).days // 7 + 1
+    if granularity == "month":
+        return (last.year * 12 + last.month) - (first.year * 12 + first.month) + 1
+    return (last.year * 4 + (last.month - 1) // 3) - (first.year * 4 + (first.month - 1) // 3) + 1
+
+def range_labels(first, last, granularity):
+    """시작일~종료일을 덮는 구간 이름 목록 (시간순)"""
+    if granularity in ("month", "quarter"):
+        # 달 단위로 이동
+        days = []
+        day = first.replace(day=1)
+        while day <= last:
+            days.append(day.isoformat())
+            day = next_month_start(day)
+    else:
+        step = 7 if granularity == "week" else 1
+        start = first - timedelta(days=first.weekday()) if granularity == "week" else first
+        days = [(start + timedelta(days=offset)).isoformat() for offset in range(0, (last - start).days + 1, step)]
+    return list(dict.fromkeys(range_label(day, granularity) for day in days))
+
+def range_series(kind, first, last, granularity, extra_monthly=None):
+    """기간 내 구간별 기록 수 [{"date": 구간 이름, "count": 기록 수}]
+
+    월/분기 단위는 월별 집계를, 일/주 단위는 일별 집계를 묶어서 계산합니다.
+    extra_monthly는 월별로 더할 기록 수 (베이스 데이터)이며 월/분기 단위에만 반영합니다.
+    """
+    start, end = first.isoformat(), (last + timedelta(days=1)).isoformat()
+    monthly = granularity in ("month", "quarter")
+    counts = Counter()
+    for key, count in history_store.count_by(kind, "month" if monthly else "day", start=start, end=end).items():
+        counts[range_label(key, granularity)] += count
+    if monthly and extra_monthly:
+        for month, count in extra_monthly.items():
+            if start <= f"{month}-01" < end:
+                counts[range_label(month, granularity)] += count
+    return [{"date": label, "count": counts.get(label, 0)} for label in range_labels(first, last, granularity)]
+
+def build_download_statistics(period: str = "week"):
+    """다운로드 통계 응답 데이터 생성 (일/주/월/템플릿별)"""
+    # 현재 시간 (한국 시간)
+    now = datetime.now(pytz.timezone('Asia/Seoul'))
+    today = now.date()
+
+    # 기간 설정
+    if period == "month":
+        days_back = 30
+        period_name = "최근 30일"
+    elif period == "year":
+        days_back = 365
+        period_name = "최근 12개월"
+    else:  # week
+        days_back = 7
+        period_name = "최근 7일"
+
+    period_ago = today - timedelta(days=days_back)
+
+    # 총 다운로드 수
+    total_downloads = history_store.count("download")
+
+    # 일별 데이터 / 템플릿별 데이터 (연간은 템플릿별 전체 누적)
+    daily_data = []
+    if period != "year":
+        daily_counts = history_store.count_by("download", "day", start=period_ago.isoformat())
+        template_counts = history_store.count_by("download", "category", start=period_ago.isoformat())
+        for i in range(days_back):
+            date = (today - timedelta(days=days_back-1-i)).isoformat()
+            daily_data.append({
+                "date": date,
+                "count": daily_counts.get(date, 0)
+            })
+    else:
+        template_counts = history_store.count_by("download", "category")
+
+    # 월별 데이터 (년도 탭용)
+    monthly_data = []
+    if period == "year":
+        current_year = today.year
+        monthly_counts = history_store.count_by(
+            "download", "month", start=f"{current_year}-01-01", end=f"{current_year + 1}-01-01"
+        )
+        for month in range(1, 12+1):
+            year_month = f"{current_year}-{month:02d}"
+            monthly_data.append({
+                "month": year_month,
+                "count": monthly_counts.get(year_month, 0)
+            })
+
+    # 기간 합계
+    if period == "year":
+        period_downloads = sum(item["count"] for item in monthly_data)
+    else:
+        period_downloads = sum(item["count"] for item in daily_data)
+
+    return {
+        "totalDownloads": total_downloads,
+        "periodDownloads": period_downloads,
+        "dailyData": daily_data,
+        "monthlyData": monthly_data,
+        "templateData": template_counts,
+        "period": period,
+        "periodName": period_name
+    }
+
+def build_range_download_statistics(first, last, granularity):
+    """기간 지정(from/to) 다운로드 통계 응답 데이터 생성"""
+    start, end = first.isoformat(), (last + timedelta(days=1)).isoformat()
+    daily_data = range_series("download", first, last, granularity)
+    return {
+        "totalDownloads": history_store.count("download"),
+        "periodDownloads": history_store.count("download", start=start, end=end),
+        "dailyData": daily_data,
+        "monthlyData": [
+            {"month": item["date"], "count": item["count"]}
+            for item in range_series("download", first, last, "month")
+        ],
+        "templateData": history_store.count_by("download", "category", start=start, end=end),
+        "period": "custom",
+        "periodName": f"{first.isoformat()} ~ {last.isoformat()}",
+        "from": first.isoformat(),
+        "to": last.isoformat(),
+        "granularity": granularity
+    }
+
+@app.get("/api/download-statistics")
+async def get_download_statistics(
+    request: Request,
+    period: str = "week",
+    date_from: Optional[str] = Query(None, alias="from"),
+    date_to: Optional[str] = Query(None, alias="to"),
+    granularity: Optional[str] = None,
+):
+    """다운로드 통계 데이터 API (일/주/월/템플릿별, from/to를 주면 해당 기간)"""
+    try:
+        if date_from or date_to:
+            if not date_from:
+                raise HTTPException(status_code=400, detail="from 날짜를 지정해주세요.")
+            first, last, granularity = parse_date_range(date_from, date_to, granularity)
+            return versioned_response(
+                request, ("download-statistics", first, last, granularity),
+                lambda: build_range_download_statistics(first, last, granularity)
+            )
+        return versioned_response(request, ("download-statistics", period), lambda: build_download_statistics(period))
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"다운로드 통계 생성 오류: {e}")
         raise HTTPException(status_code=500, detail="다운로드 통계를 생성하는 중 오류가 발생했습니다.")
 
+def build_downloads(limit: int = LIST_PAGE_LIMIT, cursor: Optional[int] = None):
+    """다운로드 상세 목록 응답 데이터 생성 (최신순, 페이지 단위)"""
+    downloads, next_cursor = history_store.page("download", limit=page_limit(limit), cursor=cursor)
+    return {"downloads": downloads, "nextCursor": next_cursor}
+
 @app.get("/api/downloads")
-async def get_downloads():
-    """다운로드 상세 목록 API (최신순)"""
+async def get_downloads(request: Request, limit: int = LIST_PAGE_LIMIT, cursor: Optional[int] = None):
+    """다운로드 상세 목록 API (최신순, 다음 페이지는 응답의 nextCursor를 cursor로 전달)"""
     try:
-        # 최신순으로 정렬
-        sorted_downloads = sorted(
-            download_history,
-            key=lambda x: x["timestamp"],
-            reverse=True
-        )
-        return {"downloads": sorted_downloads}
+        return versioned_response(request, ("downloads", limit, cursor), lambda: build_downloads(limit, cursor))
     except Exception as e:
         print(f"다운로드 목록 조회 오류: {e}")
         raise HTTPException(status_code=500, detail="다운로드 목록을 조회하는 중 오류가 발생했습니다.")
@@ -629,6 +1745,31 @@ async def health_check():
     """헬스체크 API"""
     return {"status": "healthy", "message": "PC방 제어시스템이 정상 작동중입니다."}
 
+@app.get("/api/metrics")
+async def get_metrics():
+    """서버 내부 지표 API
+
+    - history: 히스토리 기록 대기열, 디스크 플러시 지연 시간
+    - slack: 채널별 슬랙 API 응답 시간/대기열 대기 시간 히스토그램, 성공/실패/재시도 수, 마지막 오류
+    - pcs: 연결된 PC 목록, 응답을 기다리는 명령 수
+    - requests: API 경로별 서버 처리 시간 히스토그램 (슬랙 전송은 백그라운드라 포함되지 않음)
+    """
+    return {
+        "history": history_store.status(),
+        "stream": statistics_stream.status(),
+        "slack": slack_dispatcher.status(),
+        "pcs": manager.status(),
+        "requests": {key: histogram.to_json() for key, histogram in sorted(request_latency.items())},
+    }
+
+@app.get("/api/notifications/{notification_id}")
+async def get_notification(notification_id: str):
+    """슬랙 알림 전송 상태 조회 (로그인/호출/피드백 응답의 notificationId)"""
+    notification = slack_dispatcher.get(notification_id)
+    if notification is None:
+        raise HTTPException(status_code=404, detail="알림을 찾을 수 없습니다.")
+    return notification
+
 # 정적 파일 서빙 (프론트엔드 / 이미지)
 # Docker 환경과 로컬 환경 모두 지원
 frontend_dir = "frontend" if os.path.exists("frontend") else "../frontend"
@@ -645,149 +1786,1952 @@ image_dir = "image" if os.path.exists("image") else "../image"
 if os.path.exists(image_dir):
     app.mount("/assets", StaticFiles(directory=image_dir), name="assets")
 
-# 사용자 로그인 기록 저장
-login_history = []
-LOGIN_DATA_FILE = "login_history.json"
+# 히스토리 데이터 파일 (종류별)
+# 히스토리 데이터 디렉토리 (기본값은 현재 디렉토리, 벤치마크 등에서 다른 데이터로 실행할 때 지정)
+HISTORY_DATA_DIR = os.getenv("HISTORY_DATA_DIR", "")
+LOGIN_DATA_FILE = os.path.join(HISTORY_DATA_DIR, "login_history.json")
+FEEDBACK_DATA_FILE = os.path.join(HISTORY_DATA_DIR, "feedback_history.json")
+CALL_DATA_FILE = os.path.join(HISTORY_DATA_DIR, "call_history.json")
+DOWNLOAD_DATA_FILE = os.path.join(HISTORY_DATA_DIR, "download_history.json")
 
-# 피드백 기록 저장
-feedback_history = []
-FEEDBACK_DATA_FILE = "feedback_history.json"
+# 히스토리 종류별 (데이터 파일, 이모지, 이름)
+HISTORY_KINDS = {
+    "login": (LOGIN_DATA_FILE, "📊", "로그인"),
+    "feedback": (FEEDBACK_DATA_FILE, "📝", "피드백"),
+    "call": (CALL_DATA_FILE, "📞", "호출"),
+    "download": (DOWNLOAD_DATA_FILE, "⬇️", "다운로드"),
+}
 
-# 호출 기록 저장
-call_history = []
-CALL_DATA_FILE = "call_history.json"
+# 베이스 데이터 표시용 이름/소속 (실제 사용자 통계에서 제외)
+BASE_DATA_NAME = "베이스데이터"
 
-# 다운로드 기록 저장
-download_history = []
-DOWNLOAD_DATA_FILE = "download_history.json"
+# 히스토리 저장 방식
+# - json  : 저장할 때마다 전체 목록을 다시 기록 (기존 방식)
+# - jsonl : 새 기록을 한 줄씩 추가 기록 (*.jsonl), 로드 시 로그를 재생
+# - sqlite: SQLite(WAL) 데이터베이스에 저장, 여러 uvicorn 워커가 공유 가능
+# - partitioned: 종류/월별 jsonl 파일에 저장, 최근 달만 메모리에 올리고 지난 달은 요약만 로드
+HISTORY_STORAGE = os.getenv("HISTORY_STORAGE", "json").lower()
+HISTORY_DB_FILE = os.getenv("HISTORY_DB_FILE", os.path.join(HISTORY_DATA_DIR, "history.db"))
+# 월별 파티션 디렉토리 (partitioned 모드, {디렉토리}/{종류}/{YYYY-MM}.jsonl)
+HISTORY_PARTITION_DIR = os.getenv("HISTORY_PARTITION_DIR", os.path.join(HISTORY_DATA_DIR, "history"))
+# 항상 메모리에 올려두는 최근 달 수 (이번 달 포함)
+HISTORY_HOT_MONTHS = int(os.getenv("HISTORY_HOT_MONTHS", "2"))
+# 기간 조회를 위해 읽은 지난 달 파티션을 메모리에 유지하는 최대 개수
+HISTORY_COLD_CACHE_SIZE = int(os.getenv("HISTORY_COLD_CACHE_SIZE", "6"))
+# jsonl 로그 압축(재작성) 주기(초), 0이면 비활성화
+HISTORY_COMPACT_INTERVAL = int(os.getenv("HISTORY_COMPACT_INTERVAL", "0"))
+# 변경 사항을 모아서 기록하는 간격(초) - 이 시간 안에 들어온 기록은 한 번에 파일에 기록
+HISTORY_FLUSH_INTERVAL = float(os.getenv("HISTORY_FLUSH_INTERVAL", "0.5"))
+# 고유 사용자 수를 HyperLogLog로 추정할 최소 기간(일), 0이면 항상 정확히 계산
+DISTINCT_USERS_HLL_MIN_DAYS = int(os.getenv("DISTINCT_USERS_HLL_MIN_DAYS", "0"))
+# json 히스토리 파일 형식 (compact: 공백 없이 기록, pretty: 2칸 들여쓰기로 사람이 읽기 쉽게 기록)
+HISTORY_JSON_PRETTY = os.getenv("HISTORY_JSON_FORMAT", "compact").lower() == "pretty"
 
-# 베이스 로그인 데이터 로드
-def load_base_login_history():
-    """베이스 로그인 기록을 파일에서 로드"""
-    try:
-        if os.path.exists("base_login_history.json"):
-            with open("base_login_history.json", 'r', encoding='utf-8') as f:
-                base_data = json.load(f)
-                print(f"📊 베이스 로그인 기록 {len(base_data)}개를 로드했습니다.")
-                return base_data
-        else:
-            print("⚠️ 베이스 로그인 기록 파일이 없습니다.")
-            return []
-    except Exception as e:
-        print(f"❌ 베이스 로그인 기록 로드 실패: {e}")
-        return []
+def history_log_path(data_file):
+    """json 데이터 파일에 대응하는 jsonl 로그 경로"""
+    return os.path.splitext(data_file)[0] + ".jsonl"
 
-# 로그인 데이터 파일에서 로드
-def load_login_history():
-    """기존 로그인 기록을 파일에서 로드"""
-    global login_history
-    try:
-        if os.path.exists(LOGIN_DATA_FILE):
-            with open(LOGIN_DATA_FILE, 'r', encoding='utf-8') as f:
-                login_history = json.load(f)
-                print(f"📊 기존 로그인 기록 {len(login_history)}개를 로드했습니다.")
-        else:
-            print("📊 새로운 로그인 기록 파일을 생성합니다.")
-            login_history = []
-    except Exception as e:
-        print(f"❌ 로그인 기록 로드 실패: {e}")
-        login_history = []
+def jsonl_lines(records):
+    """기록 목록을 jsonl 바이트로 직렬화"""
+    return b"".join(json_dumpb(record) + b"\n" for record in records)
 
-# 로그인 데이터 파일에 저장
-def save_login_history():
-    """로그인 기록을 파일에 저장"""
-    try:
-        with open(LOGIN_DATA_FILE, 'w', encoding='utf-8') as f:
-            json.dump(login_history, f, ensure_ascii=False, indent=2)
-        print(f"💾 로그인 기록 {len(login_history)}개를 저장했습니다.")
-    except Exception as e:
-        print(f"❌ 로그인 기록 저장 실패: {e}")
+def write_jsonl_atomic(path, records):
+    """jsonl 로그를 임시 파일에 기록한 뒤 원자적으로 교체"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(jsonl_lines(records))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
 
-def load_feedback_history():
-    """기존 피드백 기록을 파일에서 로드"""
-    global feedback_history
-    try:
-        if os.path.exists(FEEDBACK_DATA_FILE):
-            with open(FEEDBACK_DATA_FILE, 'r', encoding='utf-8') as f:
-                feedback_history = json.load(f)
-                print(f"📝 기존 피드백 기록 {len(feedback_history)}개를 로드했습니다.")
-        else:
-            print("📝 새로운 피드백 기록 파일을 생성합니다.")
-            feedback_history = []
-    except Exception as e:
-        print(f"❌ 피드백 기록 로드 실패: {e}")
-        feedback_history = []
+def write_json_atomic(path, records):
+    """json 배열 히스토리를 임시 파일에 기록한 뒤 원자적으로 교체"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(json_dumpb(records, pretty=HISTORY_JSON_PRETTY))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
 
-def save_feedback_history():
-    """피드백 기록을 파일에 저장"""
-    try:
-        with open(FEEDBACK_DATA_FILE, 'w', encoding='utf-8') as f:
-            json.dump(feedback_history, f, ensure_ascii=False, indent=2)
-        print(f"💾 피드백 기록 {len(feedback_history)}개를 저장했습니다.")
-    except Exception as e:
-        print(f"❌ 피드백 기록 저장 실패: {e}")
+def read_json_history(data_file):
+    """json 배열 히스토리 파일 읽기 (파일이 없으면 None)"""
+    if not os.path.exists(data_file):
+        return None
+    with open(data_file, 'rb') as f:
+        return json_loads(f.read())
 
-def load_call_history():
-    """기존 호출 기록을 파일에서 로드"""
-    global call_history
-    try:
-        if os.path.exists(CALL_DATA_FILE):
-            with open(CALL_DATA_FILE, 'r', encoding='utf-8') as f:
-                call_history = json.load(f)
-                print(f"📞 기존 호출 기록 {len(call_history)}개를 로드했습니다.")
+def iter_jsonl_history(log_path):
+    """jsonl 로그를 한 줄씩 읽기 (비정상 종료로 잘린 줄은 건너뜀)"""
+    # 바이트로 읽어야 한글 중간에서 잘린 줄도 그 줄만 건너뛸 수 있음
+    with open(log_path, 'rb') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json_loads(line)
+            except ValueError:
+                print(f"⚠️ {log_path} {line_number}번째 줄을 읽을 수 없어 건너뜁니다.")
+
+def repair_jsonl_tail(log_path):
+    """비정상 종료로 끝이 잘린 jsonl 로그를 마지막 줄바꿈까지 잘라냄 (다음에 추가하는 기록이 잘린 줄에 붙지 않도록)"""
+    with open(log_path, 'r+b') as f:
+        size = f.seek(0, os.SEEK_END)
+        end = size
+        keep = 0
+        while end > 0:
+            start = max(0, end - 65536)
+            f.seek(start)
+            newline = f.read(end - start).rfind(b"\n")
+            if newline >= 0:
+                keep = start + newline + 1
+                break
+            end = start
+        if keep < size:
+            f.truncate(keep)
+            print(f"⚠️ {log_path} 끝의 잘린 기록 {size - keep}바이트를 정리했습니다.")
+
+def read_jsonl_history(log_path, repair=False):
+    """jsonl 로그 재생 (파일이 없으면 None), repair면 이어서 추가할 수 있도록 잘린 끝부분을 먼저 정리"""
+    if not os.path.exists(log_path):
+        return None
+    if repair:
+        repair_jsonl_tail(log_path)
+    return list(iter_jsonl_history(log_path))
+
+def record_name(record):
+    """기록의 사용자 이름 (피드백은 user 필드 안에 있음)"""
+    return record.get("name") or record.get("user", {}).get("name", "")
+
+def record_affiliation(record):
+    """기록의 사용자 소속 (피드백은 user 필드 안에 있음)"""
+    return record.get("affiliation") or record.get("user", {}).get("affiliation", "")
+
+def record_category(record):
+    """기록의 분류 (다운로드는 템플릿 이름, 호출/피드백은 유형)"""
+    if "template_number" in record:
+        return record.get("template_title") or str(record.get("template_number"))
+    return record.get("type", "")
+
+def is_real_user_record(record):
+    """베이스데이터가 아닌 실제 사용자 기록인지 확인"""
+    return record_name(record) != BASE_DATA_NAME and record_affiliation(record) != BASE_DATA_NAME
+
+def record_hour_slot(record):
+    """기록 시각의 요일 × 시간 칸 번호 (월요일 0시 = 0 ~ 일요일 23시 = 167, 한국 시간 기준)"""
+    timestamp = record["timestamp"]
+    return datetime.strptime(timestamp[:10], "%Y-%m-%d").weekday() * 24 + int(timestamp[11:13])
+
+# 집계 키별 값 추출 함수 (timestamp는 모두 한국 시간 ISO 문자열이므로 앞자리로 날짜/월을 구함)
+HISTORY_GROUP_KEYS = {
+    "day": lambda record: record["timestamp"][:10],
+    "month": lambda record: record["timestamp"][:7],
+    "affiliation": record_affiliation,
+    "category": record_category,
+    "hour": record_hour_slot,
+}
+
+# 집계(HistoryRollup)에 베이스데이터를 제외하고 쌓는 키
+REAL_USER_GROUP_KEYS = ("affiliation", "hour")
+
+# 컬럼형 히스토리에서 사용하는 기준 시각 (timestamp → epoch 마이크로초 변환)
+UNIX_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+KST_OFFSET = timezone(timedelta(hours=9))
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+# 컬럼만으로 다시 만들 수 있는 기록의 필드 (로그인 기록 형식)
+COMPACT_RECORD_KEYS = ("timestamp", "name", "affiliation", "contact", "email", "pc_number")
+
+def format_timestamp(micros):
+    """epoch 마이크로초를 한국 시간 ISO 문자열로 변환"""
+    return (UNIX_EPOCH + timedelta(microseconds=micros)).astimezone(KST_OFFSET).isoformat()
+
+def day_ordinal(day):
+    """'YYYY-MM-DD' 문자열을 날짜 서수로 변환"""
+    return datetime.strptime(day, "%Y-%m-%d").toordinal()
+
+class UserDirectory:
+    """사용자 정보를 정수 id로 바꿔 보관 (같은 사용자 정보는 한 번만 저장)"""
+
+    def __init__(self):
+        self.user_ids = {}  # (이름, 소속) → 사용자 id
+        self.user_keys = []  # 사용자 id → (이름, 소속)
+        self.user_hashes = {}  # 사용자 id → 64비트 해시 (HyperLogLog용, 필요할 때 계산)
+        self.profile_ids = {}  # (이름, 소속, 연락처, 이메일) → 프로필 id
+        self.profiles = []  # 프로필 id → (이름, 소속, 연락처, 이메일)
+
+    def user_id(self, name, affiliation):
+        key = (name, affiliation)
+        user_id = self.user_ids.get(key)
+        if user_id is None:
+            user_id = self.user_ids[key] = len(self.user_ids)
+            self.user_keys.append(key)
+        return user_id
+
+    def user_hash(self, user_id):
+        """사용자의 64비트 해시 (프로세스가 달라도 같은 값)"""
+        hashed = self.user_hashes.get(user_id)
+        if hashed is None:
+            name, affiliation = self.user_keys[user_id]
+            digest = hashlib.blake2b(f"{name}\0{affiliation}".encode("utf-8"), digest_size=8).digest()
+            hashed = self.user_hashes[user_id] = int.from_bytes(digest, "big")
+        return hashed
+
+    def profile_id(self, name, affiliation, contact, email):
+        key = (name, affiliation, contact, email)
+        profile_id = self.profile_ids.get(key)
+        if profile_id is None:
+            profile_id = self.profile_ids[key] = len(self.profiles)
+            self.profiles.append(key)
+        return profile_id
+
+class HistoryColumns:
+    """한 종류의 히스토리를 컬럼(array)으로 보관하는 목록
+
+    timestamp는 epoch 마이크로초와 날짜 서수로 미리 변환해 두고, 사용자는 정수 id로 저장합니다.
+    로그인 기록처럼 컬럼만으로 원래 기록을 그대로 다시 만들 수 있으면 dict를 보관하지 않고,
+    그 밖의 기록(호출/피드백/다운로드 등)만 extras에 원본 dict로 보관합니다.
+    기록이 시간순으로 쌓이므로 기간 조회는 날짜 서수 컬럼에서 이진 탐색합니다.
+    """
+
+    def __init__(self, directory, keep_records=True):
+        self.directory = directory
+        self.keep_records = keep_records
+        self.micros = array('q')
+        self.days = array('i')
+        self.users = array('i')
+        self.profiles = array('i')
+        self.pcs = array('i')
+        self.extras = {}  # 인덱스 → 원본 기록
+        self.ordered = True
+
+    def __len__(self):
+        return len(self.micros)
+
+    def __iter__(self):
+        for index in range(len(self.micros)):
+            yield self[index]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.micros)))]
+        if index < 0:
+            index += len(self.micros)
+        record = self.extras.get(index)
+        if record is not None:
+            return record
+        name, affiliation, contact, email = self.directory.profiles[self.profiles[index]]
+        return {
+            "timestamp": format_timestamp(self.micros[index]),
+            "name": name,
+            "affiliation": affiliation,
+            "contact": contact,
+            "email": email,
+            "pc_number": self.pcs[index],
+        }
+
+    def append(self, record):
+        timestamp = datetime.fromisoformat(record["timestamp"])
+        micros = (timestamp - UNIX_EPOCH) // ONE_MICROSECOND
+        day = timestamp.date().toordinal()
+        name, affiliation = record_name(record), record_affiliation(record)
+        pc_number = record.get("pc_number")
+        profile_id = -1
+        if self.keep_records:
+            if self._is_compact(record, micros):
+                profile_id = self.directory.profile_id(name, affiliation, record["contact"], record["email"])
+            else:
+                self.extras[len(self.micros)] = record
+        if self.days and day < self.days[-1]:
+            self.ordered = False
+        self.micros.append(micros)
+        self.days.append(day)
+        self.users.append(self.directory.user_id(name, affiliation))
+        self.profiles.append(profile_id)
+        self.pcs.append(pc_number if type(pc_number) is int else -1)
+
+    def _is_compact(self, record, micros):
+        """컬럼만으로 기록을 그대로 다시 만들 수 있는지 확인"""
+        return (
+            len(record) == len(COMPACT_RECORD_KEYS)
+            and all(key in record for key in COMPACT_RECORD_KEYS)
+            and type(record["pc_number"]) is int
+            and all(type(record[key]) is str for key in ("name", "affiliation", "contact", "email"))
+            and format_timestamp(micros) == record["timestamp"]
+        )
+
+    def indexes(self, start=None, end=None):
+        """기간에 해당하는 기록 인덱스 (시간순으로 쌓인 경우 이진 탐색으로 range 반환)"""
+        if not self.ordered:
+            start_day = day_ordinal(start) if start is not None else None
+            end_day = day_ordinal(end) if end is not None else None
+            return [
+                index for index, day in enumerate(self.days)
+                if (start_day is None or day >= start_day) and (end_day is None or day < end_day)
+            ]
+        low = bisect_left(self.days, day_ordinal(start)) if start is not None else 0
+        high = bisect_left(self.days, day_ordinal(end)) if end is not None else len(self.days)
+        return range(low, max(low, high))
+
+class HyperLogLog:
+    """고유 사용자 수 추정 (HyperLogLog, 레지스터 2^12개 - 표준 오차 약 1.6%)"""
+    __slots__ = ("registers",)
+    PRECISION = 12
+    SIZE = 1 << PRECISION
+    ALPHA = 0.7213 / (1 + 1.079 / SIZE)
+
+    def __init__(self):
+        self.registers = bytearray(self.SIZE)
+
+    def add(self, hashed):
+        """64비트 해시 추가"""
+        index = hashed >> (64 - self.PRECISION)
+        rest = hashed & ((1 << (64 - self.PRECISION)) - 1)
+        rank = (64 - self.PRECISION) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other):
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def estimate(self):
+        estimate = self.ALPHA * self.SIZE * self.SIZE / sum(2.0 ** -rank for rank in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * self.SIZE and zeros:
+            # 적은 수는 선형 계수로 보정
+            estimate = self.SIZE * math.log(self.SIZE / zeros)
+        return round(estimate)
+
+class RollupBucket:
+    """집계 버킷 - 기록 수, 소속별 수 / 요일×시간별 수 / 사용자 id(베이스데이터 제외), 분류별 수
+
+    월 버킷은 HyperLogLog 모드(DISTINCT_USERS_HLL_MIN_DAYS)에서 고유 사용자 추정용 sketch도 가집니다.
+    """
+    __slots__ = ("count", "affiliations", "categories", "hours", "users", "sketch")
+
+    def __init__(self):
+        self.count = 0
+        self.affiliations = Counter()
+        self.categories = Counter()
+        self.hours = Counter()
+        self.users = set()
+        self.sketch = None
+
+    def add(self, record, user_id=None):
+        self.count += 1
+        if is_real_user_record(record):
+            self.affiliations[record_affiliation(record)] += 1
+            self.hours[record_hour_slot(record)] += 1
+            if user_id is not None:
+                self.users.add(user_id)
+        self.categories[record_category(record)] += 1
+
+    def merge(self, other):
+        self.count += other.count
+        self.affiliations.update(other.affiliations)
+        self.categories.update(other.categories)
+        self.hours.update(other.hours)
+        self.users |= other.users
+
+    def to_json(self):
+        return [self.count, self.affiliations, self.categories, self.hours]
+
+    @classmethod
+    def from_json(cls, data):
+        bucket = cls()
+        bucket.count, affiliations, categories, hours = data
+        bucket.affiliations.update(affiliations)
+        bucket.categories.update(categories)
+        # json 키는 문자열이므로 칸 번호로 변환
+        bucket.hours.update({int(slot): count for slot, count in hours.items()})
+        return bucket
+
+def next_month_start(day):
+    """해당 날짜가 속한 달의 다음 달 1일"""
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+class HistoryRollup:
+    """종류별 일별/월별 집계 (기록 추가 시 갱신, 서버 시작 시 한 번 재구성)
+
+    기간 합계는 기간에 온전히 포함된 달은 월 버킷으로, 나머지 날은 일 버킷으로 더하므로
+    기록 수와 관계없이 최대 수백 개의 버킷만 확인합니다.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.clear()
+
+    def clear(self):
+        self.daily = {kind: {} for kind in HISTORY_KINDS}
+        self.monthly = {kind: {} for kind in HISTORY_KINDS}
+        self.overall = {kind: RollupBucket() for kind in HISTORY_KINDS}
+        self.first_day = {kind: None for kind in HISTORY_KINDS}
+        self.last_day = {kind: None for kind in HISTORY_KINDS}
+
+    def add(self, kind, record, user_id=None):
+        day = record["timestamp"][:10]
+        for buckets, key in ((self.daily[kind], day), (self.monthly[kind], day[:7])):
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = RollupBucket()
+            bucket.add(record, user_id)
+        self.overall[kind].add(record, user_id)
+        if DISTINCT_USERS_HLL_MIN_DAYS > 0 and user_id is not None and is_real_user_record(record):
+            self._sketch(kind, day[:7]).add(self.directory.user_hash(user_id))
+        self._extend(kind, day)
+
+    def _sketch(self, kind, month):
+        bucket = self.monthly[kind][month]
+        if bucket.sketch is None:
+            bucket.sketch = HyperLogLog()
+        return bucket.sketch
+
+    def add_bucket(self, kind, day, day_bucket):
+        """미리 계산해 둔 일 버킷을 합치기 (지난 달 파티션 요약 로드)"""
+        for buckets, key in ((self.daily[kind], day), (self.monthly[kind], day[:7])):
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = RollupBucket()
+            bucket.merge(day_bucket)
+        self.overall[kind].merge(day_bucket)
+        if DISTINCT_USERS_HLL_MIN_DAYS > 0 and day_bucket.users:
+            sketch = self._sketch(kind, day[:7])
+            for user_id in day_bucket.users:
+                sketch.add(self.directory.user_hash(user_id))
+        self._extend(kind, day)
+
+    def _extend(self, kind, day):
+        if self.first_day[kind] is None or day < self.first_day[kind]:
+            self.first_day[kind] = day
+        if self.last_day[kind] is None or day > self.last_day[kind]:
+            self.last_day[kind] = day
+
+    def _clamp(self, kind, start, end):
+        """기간을 실제 기록이 있는 날짜 범위로 좁혀 date로 반환 (기록이 없으면 None)"""
+        first, last = self.first_day[kind], self.last_day[kind]
+        if first is None:
+            return None
+        start_day = datetime.fromisoformat(max(start or first, first)).date()
+        end_day = datetime.fromisoformat(last).date() + timedelta(days=1)
+        if end is not None:
+            end_day = min(end_day, datetime.fromisoformat(end).date())
+        if start_day >= end_day:
+            return None
+        return start_day, end_day
+
+    def iter_days(self, kind, start=None, end=None):
+        """기간 내 (날짜, 일 버킷) 순회 (기록이 있는 날만)"""
+        bounds = self._clamp(kind, start, end)
+        if bounds is None:
+            return
+        day, end_day = bounds
+        daily = self.daily[kind]
+        while day < end_day:
+            bucket = daily.get(day.isoformat())
+            if bucket is not None:
+                yield day.isoformat(), bucket
+            day += timedelta(days=1)
+
+    def iter_buckets(self, kind, start=None, end=None):
+        """기간을 덮는 (월, 버킷) 순회 - 온전한 달은 월 버킷, 나머지는 일 버킷"""
+        bounds = self._clamp(kind, start, end)
+        if bounds is None:
+            return
+        day, end_day = bounds
+        daily, monthly = self.daily[kind], self.monthly[kind]
+        while day < end_day:
+            key = day.isoformat()
+            month_end = next_month_start(day)
+            if day.day == 1 and month_end <= end_day:
+                bucket = monthly.get(key[:7])
+                day = month_end
+            else:
+                bucket = daily.get(key)
+                day += timedelta(days=1)
+            if bucket is not None:
+                yield key[:7], bucket
+
+    def count(self, kind, start=None, end=None):
+        if start is None and end is None:
+            return self.overall[kind].count
+        return sum(bucket.count for _, bucket in self.iter_buckets(kind, start, end))
+
+    def distinct_users(self, kind, start=None, end=None, approximate=False):
+        """기간 내 고유 사용자 수 - 월/일 버킷의 사용자 id 집합을 합침 (approximate면 월 버킷은 HyperLogLog로 합침)"""
+        if start is None and end is None and not approximate:
+            return len(self.overall[kind].users)
+        users = set()
+        sketch = None
+        for _, bucket in self.iter_buckets(kind, start, end):
+            if approximate and bucket.sketch is not None:
+                if sketch is None:
+                    sketch = HyperLogLog()
+                sketch.merge(bucket.sketch)
+            else:
+                users |= bucket.users
+        if sketch is None:
+            return len(users)
+        for user_id in users:
+            sketch.add(self.directory.user_hash(user_id))
+        return sketch.estimate()
+
+    def count_by(self, kind, key, start=None, end=None):
+        if key == "day":
+            return {day: bucket.count for day, bucket in self.iter_days(kind, start, end)}
+        if key == "month":
+            counts = Counter()
+            for month, bucket in self.iter_buckets(kind, start, end):
+                counts[month] += bucket.count
+            return dict(counts)
+        attribute = {"affiliation": "affiliations", "category": "categories", "hour": "hours"}[key]
+        if start is None and end is None:
+            return dict(getattr(self.overall[kind], attribute))
+        counts = Counter()
+        for _, bucket in self.iter_buckets(kind, start, end):
+            counts.update(getattr(bucket, attribute))
+        return dict(counts)
+
+class HistoryStore:
+    """히스토리 저장소 인터페이스
+
+    기간(start/end)은 'YYYY-MM-DD' 형식 문자열이며 start 이상, end 미만 범위입니다.
+    모든 timestamp가 한국 시간 ISO 문자열이므로 문자열 비교로 기간을 판단합니다.
+    기록 수 집계는 일별/월별 집계(HistoryRollup)에서 바로 계산합니다.
+    """
+
+    def __init__(self, keep_records=False):
+        self.directory = UserDirectory()
+        self.rollup = HistoryRollup(self.directory)
+        self.tables = {kind: HistoryColumns(self.directory, keep_records) for kind in HISTORY_KINDS}
+        self.version = 0
+        # 기록이 추가될 때 호출할 함수 목록 (실시간 통계 스트림 등)
+        self.listeners = []
+
+    def load(self):
+        raise NotImplementedError
+
+    def index(self, kind, record):
+        """기록을 컬럼 목록과 집계에 반영"""
+        table = self.tables[kind]
+        table.append(record)
+        self.rollup.add(kind, record, table.users[-1])
+        self.version += 1
+        for listener in self.listeners:
+            listener(kind, record)
+
+    def data_version(self):
+        """기록이 추가될 때마다 증가하는 데이터 버전 (응답 캐시/ETag용)"""
+        self.refresh()
+        return self.version
+
+    def append(self, kind, record):
+        raise NotImplementedError
+
+    def refresh(self):
+        """다른 프로세스가 추가한 기록을 집계에 반영 (필요한 저장소만)"""
+
+    def count(self, kind, start=None, end=None):
+        self.refresh()
+        return self.rollup.count(kind, start, end)
+
+    def records(self, kind, start=None, end=None, newest_first=False):
+        raise NotImplementedError
+
+    def iter_records(self, kind, start=None, end=None):
+        """기간 내 기록을 시간순으로 하나씩 반환 (내보내기용, 전체 목록을 만들지 않음)"""
+        raise NotImplementedError
+
+    def page(self, kind, start=None, end=None, limit=None, cursor=None):
+        """최신순 목록의 한 페이지 조회
+
+        cursor는 이전 페이지가 돌려준 next_cursor이며, 그보다 오래된 기록부터 최대 limit개를 반환합니다.
+        반환값은 (기록 목록, next_cursor)이고 더 이상 기록이 없으면 next_cursor는 None입니다.
+        """
+        raise NotImplementedError
+
+    def count_by(self, kind, key, start=None, end=None, real_only=False):
+        """key("day"/"month"/"affiliation"/"category"/"hour")별 기록 수"""
+        self.refresh()
+        # 소속별/요일×시간별 집계는 베이스데이터를 제외한 값만 유지하므로 그 외에는 직접 조회
+        if (key in REAL_USER_GROUP_KEYS) != real_only:
+            return self.query_count_by(kind, key, start, end, real_only)
+        return self.rollup.count_by(kind, key, start, end)
+
+    def query_count_by(self, kind, key, start=None, end=None, real_only=False):
+        """집계를 쓰지 않고 기록을 직접 조회해 key별 기록 수 계산"""
+        raise NotImplementedError
+
+    def distinct_users(self, kind, start=None, end=None):
+        """기간 내 고유 사용자((이름, 소속)) 수 (베이스데이터 제외)
+
+        일별/월별 집계의 사용자 id 집합을 합쳐서 계산합니다.
+        기간이 DISTINCT_USERS_HLL_MIN_DAYS일 이상이면 HyperLogLog 추정값을 사용합니다.
+        """
+        self.refresh()
+        approximate = False
+        if DISTINCT_USERS_HLL_MIN_DAYS > 0:
+            first, last = self.rollup.first_day[kind], self.rollup.last_day[kind]
+            if first is not None:
+                span_start = datetime.fromisoformat(max(start or first, first)).date()
+                span_end = datetime.fromisoformat(min(end, last) if end else last).date()
+                approximate = (span_end - span_start).days >= DISTINCT_USERS_HLL_MIN_DAYS
+        return self.rollup.distinct_users(kind, start, end, approximate)
+
+    async def start(self):
+        """백그라운드 작업 시작 (서버 시작 시)"""
+
+    async def close(self):
+        """대기 중인 변경 사항 기록 후 종료 (서버 종료 시)"""
+
+    def status(self):
+        """저장소 상태 (기록 대기열, 플러시 지연 시간 등)"""
+        return {"storage": HISTORY_STORAGE, "queueDepth": 0}
+
+    async def compact(self):
+        """저장 파일 정리 (지원하지 않는 저장소는 아무 작업도 하지 않음)"""
+
+class JsonHistoryStore(HistoryStore):
+    """json/jsonl 파일 기반 히스토리 저장소 (기록은 메모리의 컬럼 목록으로 유지)"""
+
+    def __init__(self, mode="json"):
+        super().__init__(keep_records=True)
+        self.mode = mode
+        # 아직 파일에 기록되지 않은 변경 사항 (write-behind)
+        self.pending = {kind: [] for kind in HISTORY_KINDS}
+        self.flush_lock = asyncio.Lock()
+        self.flush_event = asyncio.Event()
+        self.flush_task = None
+        self.closing = False
+        self.flush_stats = {
+            "flushes": 0,
+            "lastFlushMs": None,
+            "maxFlushMs": 0,
+            "totalFlushMs": 0,
+            "lastBatchSize": 0,
+            "lastFlushAt": None,
+            "errors": 0,
+        }
+
+    def load(self):
+        for kind, (data_file, emoji, label) in HISTORY_KINDS.items():
+            try:
+                records = self._read(data_file)
+                if records is not None:
+                    for record in records:
+                        self.index(kind, record)
+                    print(f"{emoji} 기존 {label} 기록 {len(records)}개를 로드했습니다.")
+                else:
+                    print(f"{emoji} 새로운 {label} 기록 파일을 생성합니다.")
+            except Exception as e:
+                print(f"❌ {label} 기록 로드 실패: {e}")
+
+    def _read(self, data_file):
+        if self.mode != "jsonl":
+            return read_json_history(data_file)
+        log_path = history_log_path(data_file)
+        records = read_jsonl_history(log_path, repair=True)
+        if records is None:
+            records = read_json_history(data_file)
+            if records is not None:
+                # 기존 json 파일을 jsonl 로그로 변환
+                write_jsonl_atomic(log_path, records)
+                print(f"🔁 {data_file} → {log_path} 변환 완료 ({len(records)}개)")
+        return records
+
+    def append(self, kind, record):
+        self.index(kind, record)
+        self.pending[kind].append(record)
+        if self.flush_task is not None:
+            # 백그라운드 플러셔가 모아서 기록
+            self.flush_event.set()
         else:
-            print("📞 새로운 호출 기록 파일을 생성합니다.")
-            call_history = []
-    except Exception as e:
-        print(f"❌ 호출 기록 로드 실패: {e}")
-        call_history = []
+            # 플러셔가 없으면 (스크립트 등) 바로 기록
+            self._write_batch(self._take_batch())
 
-def save_call_history():
-    """호출 기록을 파일에 저장"""
-    try:
-        with open(CALL_DATA_FILE, 'w', encoding='utf-8') as f:
-            json.dump(call_history, f, ensure_ascii=False, indent=2)
-        print(f"💾 호출 기록 {len(call_history)}개를 저장했습니다.")
-    except Exception as e:
-        print(f"❌ 호출 기록 저장 실패: {e}")
+    def _take_batch(self):
+        """기록 대기 중인 변경 사항 꺼내기 (이벤트 루프에서 호출)"""
+        batch = {}
+        for kind, pending in self.pending.items():
+            if not pending:
+                continue
+            # jsonl은 새 기록만, json은 현재까지의 전체 기록(개수)을 기록
+            batch[kind] = (pending, len(self.tables[kind]))
+            self.pending[kind] = []
+        return batch
+
+    def _write_batch(self, batch):
+        """변경 사항을 파일에 기록 (jsonl은 추가 후 fsync, json은 임시 파일 기록 후 교체)"""
+        failed = {}
+        for kind, (pending, size) in batch.items():
+            data_file, _, label = HISTORY_KINDS[kind]
+            try:
+                if self.mode == "jsonl":
+                    with open(history_log_path(data_file), 'ab') as f:
+                        f.write(jsonl_lines(pending))
+                        f.flush()
+                        os.fsync(f.fileno())
+                    print(f"💾 {label} 기록 {len(pending)}개를 추가 저장했습니다.")
+                else:
+                    # 컬럼 목록은 추가만 되므로 앞쪽 size개는 다른 스레드에서 읽어도 바뀌지 않음
+                    records = self.tables[kind][:size]
+                    write_json_atomic(data_file, records)
+                    print(f"💾 {label} 기록 {len(records)}개를 저장했습니다.")
+            except Exception as e:
+                print(f"❌ {label} 기록 저장 실패: {e}")
+                failed[kind] = pending
+        return failed
+
+    async def flush(self):
+        """대기 중인 변경 사항을 한 번에 기록"""
+        async with self.flush_lock:
+            self.flush_event.clear()
+            batch = self._take_batch()
+            if not batch:
+                return
+            queued = sum(len(pending) for pending, _ in batch.values())
+            started = time.perf_counter()
+            failed = await asyncio.to_thread(self._write_batch, batch)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.flush_stats["flushes"] += 1
+            self.flush_stats["lastFlushMs"] = round(elapsed_ms, 2)
+            self.flush_stats["maxFlushMs"] = round(max(self.flush_stats["maxFlushMs"], elapsed_ms), 2)
+            self.flush_stats["totalFlushMs"] += elapsed_ms
+            self.flush_stats["lastFlushAt"] = datetime.now(pytz.timezone('Asia/Seoul')).isoformat()
+            self.flush_stats["lastBatchSize"] = queued
+            if failed:
+                self.flush_stats["errors"] += 1
+                # 실패한 변경 사항은 다음 플러시에서 다시 시도
+                for kind, pending in failed.items():
+                    self.pending[kind] = pending + self.pending[kind]
+                self.flush_event.set()
+
+    async def _flush_loop(self):
+        while not self.closing:
+            await self.flush_event.wait()
+            if self.closing:
+                break
+            # 짧은 시간 동안 들어온 변경 사항을 모아서 한 번에 기록
+            await asyncio.sleep(HISTORY_FLUSH_INTERVAL)
+            await self.flush()
+
+    async def start(self):
+        self.flush_lock = asyncio.Lock()
+        self.flush_event = asyncio.Event()
+        self.closing = False
+        self.flush_task = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        if self.flush_task is not None:
+            # 취소하면 기록 중인 스레드는 계속 실행된 채 잠금만 풀리므로, 종료를 알리고 진행 중인 플러시가 끝나길 기다림
+            self.closing = True
+            self.flush_event.set()
+            await self.flush_task
+            self.flush_task = None
+        await self.flush()
+
+    def status(self):
+        flushes = self.flush_stats["flushes"]
+        return {
+            "storage": self.mode,
+            "queueDepth": sum(len(pending) for pending in self.pending.values()),
+            "flushes": flushes,
+            "lastFlushMs": self.flush_stats["lastFlushMs"],
+            "avgFlushMs": round(self.flush_stats["totalFlushMs"] / flushes, 2) if flushes else None,
+            "maxFlushMs": self.flush_stats["maxFlushMs"],
+            "lastBatchSize": self.flush_stats["lastBatchSize"],
+            "lastFlushAt": self.flush_stats["lastFlushAt"],
+            "errors": self.flush_stats["errors"],
+        }
+
+    def records(self, kind, start=None, end=None, newest_first=False):
+        # 기록은 추가된 순서(시간순)로 쌓이므로 정렬 없이 뒤집기만 함
+        table = self.tables[kind]
+        indexes = table.indexes(start, end)
+        return [table[index] for index in (reversed(indexes) if newest_first else indexes)]
+
+    def iter_records(self, kind, start=None, end=None):
+        # 시작 시점의 범위만 내보내므로 도중에 추가되는 기록은 포함하지 않음
+        table = self.tables[kind]
+        for index in table.indexes(start, end):
+            yield table[index]
+
+    def page(self, kind, start=None, end=None, limit=None, cursor=None):
+        # 커서는 기록 위치(인덱스)이므로 새 기록이 추가되어도 다음 페이지가 밀리지 않음
+        table = self.tables[kind]
+        indexes = table.indexes(start, end)
+        if cursor is not None:
+            if isinstance(indexes, range):
+                indexes = range(indexes.start, max(indexes.start, min(indexes.stop, cursor)))
+            else:
+                indexes = indexes[:bisect_left(indexes, cursor)]
+        selected = indexes[-limit:] if limit else indexes
+        next_cursor = selected[0] if len(selected) < len(indexes) else None
+        return [table[index] for index in reversed(selected)], next_cursor
+
+    def query_count_by(self, kind, key, start=None, end=None, real_only=False):
+        key_func = HISTORY_GROUP_KEYS[key]
+        table = self.tables[kind]
+        return dict(Counter(
+            key_func(record) for record in map(table.__getitem__, table.indexes(start, end))
+            if not real_only or is_real_user_record(record)
+        ))
+
+    async def compact(self):
+        """jsonl 로그를 메모리 기록 기준으로 다시 작성 (잘린 줄 정리)"""
+        if self.mode != "jsonl":
+            return
+        await self.flush()
+        async with self.flush_lock:
+            for kind, (data_file, _, _) in HISTORY_KINDS.items():
+                log_path = history_log_path(data_file)
+                try:
+                    # 아직 기록되지 않은 기록(목록 끝부분)은 압축 후 플러셔가 이어서 기록
+                    table = self.tables[kind]
+                    size = len(table) - len(self.pending[kind])
+                    await asyncio.to_thread(lambda: write_jsonl_atomic(log_path, table[:size]))
+                except Exception as e:
+                    print(f"❌ {log_path} 압축 실패: {e}")
+
+# 월별 요약 파일 형식 버전 (집계 항목이 바뀌면 올려서 요약을 다시 계산)
+PARTITION_SUMMARY_VERSION = 3
+
+def month_range(month):
+    """월('YYYY-MM')의 기간 (시작일 이상, 다음 달 1일 미만)"""
+    first = datetime.strptime(month, "%Y-%m").date()
+    return first.isoformat(), next_month_start(first).isoformat()
+
+class PartitionedHistoryStore(JsonHistoryStore):
+    """월별 파티션 히스토리 저장소
+
+    기록은 {디렉토리}/{종류}/{YYYY-MM}.jsonl 파일에 달별로 나누어 추가 기록합니다.
+    최근 HISTORY_HOT_MONTHS개월은 메모리의 컬럼 목록에 올리고, 그보다 지난 달은 미리 계산한
+    일별 집계({YYYY-MM}.summary.json)만 로드합니다. 지난 달 기록은 목록/고유 사용자 조회처럼
+    원본이 필요할 때만 읽어 LRU 캐시(HISTORY_COLD_CACHE_SIZE개)에 보관합니다.
+    목록 커서는 전체 기록에서의 위치이며, 지난 달 파티션은 기록 수를 알고 있으므로 위치를 바로 계산합니다.
+    """
+
+    def __init__(self, directory):
+        super().__init__(mode="partitioned")
+        self.partition_dir = directory
+        self.hot_start = self._hot_start()
+        # 종류별 지난 달 파티션 [(월, 기록 수, 전체 기록에서의 시작 위치)] (시간순)
+        self.cold = {kind: [] for kind in HISTORY_KINDS}
+        self.cold_cache = OrderedDict()
+        self.cold_loads = 0
+
+    def _hot_start(self):
+        """메모리에 올려둘 첫 달 ('YYYY-MM')"""
+        month = datetime.now(pytz.timezone('Asia/Seoul')).date().replace(day=1)
+        for _ in range(HISTORY_HOT_MONTHS - 1):
+            month = (month - timedelta(days=1)).replace(day=1)
+        return month.isoformat()[:7]
+
+    def _path(self, kind, month, suffix=".jsonl"):
+        return os.path.join(self.partition_dir, kind, f"{month}{suffix}")
+
+    def _months(self, kind):
+        """디스크에 있는 파티션 월 목록 (시간순)"""
+        kind_dir = os.path.join(self.partition_dir, kind)
+        if not os.path.isdir(kind_dir):
+            return []
+        return sorted(name[:-len(".jsonl")] for name in os.listdir(kind_dir) if name.endswith(".jsonl"))
+
+    def _hot_offset(self, kind):
+        """메모리 기록의 전체 기록에서의 시작 위치"""
+        cold = self.cold[kind]
+        return cold[-1][2] + cold[-1][1] if cold else 0
+
+    def load(self):
+        for kind, (data_file, emoji, label) in HISTORY_KINDS.items():
+            try:
+                os.makedirs(os.path.join(self.partition_dir, kind), exist_ok=True)
+                months = self._months(kind)
+                if not months:
+                    months = self._migrate(kind, data_file)
+                hot_count = cold_count = 0
+                for month in months:
+                    if month >= self.hot_start:
+                        for record in read_jsonl_history(self._path(kind, month), repair=True) or []:
+                            self.index(kind, record)
+                            hot_count += 1
+                    else:
+                        cold_count += self._load_summary(kind, month)
+                print(f"{emoji} 기존 {label} 기록 {hot_count + cold_count}개를 로드했습니다. (최근 {hot_count}개는 메모리, {cold_count}개는 월별 요약)")
+            except Exception as e:
+                print(f"❌ {label} 기록 로드 실패: {e}")
+
+    def _migrate(self, kind, data_file):
+        """기존 단일 파일(jsonl 로그 또는 json)을 월별 파티션으로 나누기"""
+        records = read_jsonl_history(history_log_path(data_file))
+        if records is None:
+            records = read_json_history(data_file)
+        if not records:
+            return []
+        by_month = {}
+        for record in records:
+            by_month.setdefault(record["timestamp"][:7], []).append(record)
+        for month, month_records in by_month.items():
+            write_jsonl_atomic(self._path(kind, month), month_records)
+        print(f"🔁 {data_file} → {os.path.join(self.partition_dir, kind)} 월별 파티션 {len(by_month)}개로 변환 완료 ({len(records)}개)")
+        return sorted(by_month)
+
+    def _load_summary(self, kind, month):
+        """지난 달 파티션의 일별 집계를 로드 (요약 파일이 없거나 오래되었으면 다시 계산)"""
+        path = self._path(kind, month)
+        summary_path = self._path(kind, month, ".summary.json")
+        size = os.path.getsize(path)
+        summary = None
+        if os.path.exists(summary_path):
+            with open(summary_path, 'rb') as f:
+                summary = json_loads(f.read())
+            if summary.get("size") != size or summary.get("version") != PARTITION_SUMMARY_VERSION:
+                summary = None
+        if summary is None:
+            days = {}
+            records = read_jsonl_history(path) or []
+            for record in records:
+                user_id = self.directory.user_id(record_name(record), record_affiliation(record))
+                days.setdefault(record["timestamp"][:10], RollupBucket()).add(record, user_id)
+            summary = self._write_summary(kind, month, len(records), days)
+        # 요약 파일의 사용자는 (이름, 소속) 목록의 위치로 저장되어 있으므로 현재 사용자 id로 변환
+        user_ids = [self.directory.user_id(name, affiliation) for name, affiliation in summary["users"]]
+        for day, data in summary["days"].items():
+            bucket = RollupBucket.from_json(data[:4])
+            bucket.users = {user_ids[position] for position in data[4]}
+            self.rollup.add_bucket(kind, day, bucket)
+        self.cold[kind].append((month, summary["records"], self._hot_offset(kind)))
+        self.version += summary["records"]
+        return summary["records"]
+
+    def _write_summary(self, kind, month, count, days):
+        month_users = sorted(set().union(*(bucket.users for bucket in days.values())))
+        positions = {user_id: position for position, user_id in enumerate(month_users)}
+        summary = {
+            "version": PARTITION_SUMMARY_VERSION,
+            "size": os.path.getsize(self._path(kind, month)),
+            "records": count,
+            "users": [self.directory.user_keys[user_id] for user_id in month_users],
+            "days": {
+                day: bucket.to_json() + [sorted(positions[user_id] for user_id in bucket.users)]
+                for day, bucket in sorted(days.items())
+            },
+        }
+        tmp_path = self._path(kind, month, ".summary.json.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(json_dumpb(summary))
+        os.replace(tmp_path, self._path(kind, month, ".summary.json"))
+        return summary
+
+    def _partition(self, kind, month):
+        """지난 달 파티션 기록 (필요할 때 읽고 최근 사용한 것만 보관)"""
+        key = (kind, month)
+        table = self.cold_cache.get(key)
+        if table is not None:
+            self.cold_cache.move_to_end(key)
+            return table
+        table = HistoryColumns(self.directory)
+        for record in read_jsonl_history(self._path(kind, month)) or []:
+            table.append(record)
+        self.cold_loads += 1
+        self.cold_cache[key] = table
+        while len(self.cold_cache) > HISTORY_COLD_CACHE_SIZE:
+            self.cold_cache.popitem(last=False)
+        return table
+
+    def _segments(self, kind, start=None, end=None):
+        """기간과 겹치는 (시작 위치, 파티션 월) 목록 (시간순, 메모리 기록은 월이 None)"""
+        segments = []
+        for month, count, offset in self.cold[kind]:
+            month_start, month_end = month_range(month)
+            if (end is None or month_start < end) and (start is None or start < month_end):
+                segments.append((offset, month))
+        segments.append((self._hot_offset(kind), None))
+        return segments
+
+    def _table(self, kind, month):
+        return self.tables[kind] if month is None else self._partition(kind, month)
+
+    def _write_batch(self, batch):
+        """새 기록을 기록 시각의 월 파티션 파일에 추가"""
+        failed = {}
+        for kind, (pending, _) in batch.items():
+            _, _, label = HISTORY_KINDS[kind]
+            try:
+                by_month = {}
+                for record in pending:
+                    by_month.setdefault(record["timestamp"][:7], []).append(record)
+                for month, records in by_month.items():
+                    with open(self._path(kind, month), 'ab') as f:
+                        f.write(jsonl_lines(records))
+                        f.flush()
+                        os.fsync(f.fileno())
+                print(f"💾 {label} 기록 {len(pending)}개를 추가 저장했습니다.")
+            except Exception as e:
+                print(f"❌ {label} 기록 저장 실패: {e}")
+                failed[kind] = pending
+        return failed
+
+    async def flush(self):
+        await super().flush()
+        # 달이 바뀌었으면 오래된 달을 메모리에서 내림
+        if self._hot_start() != self.hot_start:
+            async with self.flush_lock:
+                self.rotate()
+
+    def rotate(self):
+        """메모리 기록 중 HISTORY_HOT_MONTHS보다 지난 달을 요약 파일로 바꾸고 메모리에서 제거"""
+        hot_start = self._hot_start()
+        for kind in HISTORY_KINDS:
+            if self.pending[kind]:
+                # 아직 기록되지 않은 변경 사항이 있으면 다음 플러시에서 처리
+                return
+        for kind in HISTORY_KINDS:
+            table = self.tables[kind]
+            boundary = table.indexes(end=f"{hot_start}-01")
+            if isinstance(boundary, range) and len(boundary) > 0:
+                old_records = table[:boundary.stop]
+                by_month = {}
+                for record in old_records:
+                    by_month.setdefault(record["timestamp"][:7], 0)
+                    by_month[record["timestamp"][:7]] += 1
+                for month, count in sorted(by_month.items()):
+                    days = {
+                        day: bucket for day, bucket in self.rollup.daily[kind].items() if day[:7] == month
+                    }
+                    self._write_summary(kind, month, count, days)
+                    self.cold[kind].append((month, count, self._hot_offset(kind)))
+                # 남은 기록으로 메모리 목록 다시 구성
+                hot_table = HistoryColumns(self.directory)
+                for index in range(boundary.stop, len(table)):
+                    hot_table.append(table[index])
+                self.tables[kind] = hot_table
+        self.hot_start = hot_start
+        print(f"🗂️ {hot_start} 이전 기록을 월별 요약으로 전환했습니다.")
+
+    def records(self, kind, start=None, end=None, newest_first=False):
+        records = []
+        for _, month in self._segments(kind, start, end):
+            table = self._table(kind, month)
+            records.extend(table[index] for index in table.indexes(start, end))
+        if newest_first:
+            records.reverse()
+        return records
+
+    def iter_records(self, kind, start=None, end=None):
+        for _, month in self._segments(kind, start, end):
+            if month is None:
+                yield from super().iter_records(kind, start, end)
+                continue
+            table = self.cold_cache.get((kind, month))
+            if table is not None:
+                yield from (table[index] for index in table.indexes(start, end))
+                continue
+            # 캐시에 없는 지난 달은 파일에서 바로 읽어 메모리를 쓰지 않음
+            for record in iter_jsonl_history(self._path(kind, month)):
+                day = record["timestamp"][:10]
+                if (start is None or day >= start) and (end is None or day < end):
+                    yield record
+
+    def page(self, kind, start=None, end=None, limit=None, cursor=None):
+        records = []
+        for offset, month in reversed(self._segments(kind, start, end)):
+            if cursor is not None and cursor <= offset:
+                continue
+            table = self._table(kind, month)
+            indexes = table.indexes(start, end)
+            if cursor is not None and cursor - offset < len(table):
+                local_cursor = cursor - offset
+                if isinstance(indexes, range):
+                    indexes = range(indexes.start, max(indexes.start, min(indexes.stop, local_cursor)))
+                else:
+                    indexes = indexes[:bisect_left(indexes, local_cursor)]
+            remaining = limit - len(records) if limit else len(indexes)
+            selected = indexes[-remaining:] if remaining else indexes[:0]
+            records.extend(table[index] for index in reversed(selected))
+            if limit and len(records) >= limit:
+                # 이 파티션의 남은 기록 또는 이전 달 기록이 있으면 다음 페이지 커서 반환
+                boundary = f"{month}-01" if month is not None else f"{self.hot_start}-01"
+                older_end = min(boundary, end) if end is not None else boundary
+                if len(selected) < len(indexes) or self.rollup.count(kind, start, older_end) > 0:
+                    return records, offset + selected[0]
+                return records, None
+        return records, None
+
+    def query_count_by(self, kind, key, start=None, end=None, real_only=False):
+        key_func = HISTORY_GROUP_KEYS[key]
+        return dict(Counter(
+            key_func(record) for record in self.records(kind, start, end)
+            if not real_only or is_real_user_record(record)
+        ))
+
+    def status(self):
+        status = super().status()
+        status.update({
+            "hotStart": self.hot_start,
+            "hotRecords": sum(len(table) for table in self.tables.values()),
+            "coldPartitions": sum(len(cold) for cold in self.cold.values()),
+            "cachedPartitions": len(self.cold_cache),
+            "coldLoads": self.cold_loads,
+        })
+        return status
+
+# SQLite 집계 키별 컬럼 식
+SQLITE_GROUP_COLUMNS = {
+    "day": "substr(timestamp, 1, 10)",
+    "month": "substr(timestamp, 1, 7)",
+    "affiliation": "affiliation",
+    "category": "category",
+    # 요일(월요일 0) × 24 + 시 (timestamp는 한국 시간 문자열이므로 문자열에서 바로 계산)
+    "hour": "((CAST(strftime('%w', substr(timestamp, 1, 10)) AS INTEGER) + 6) % 7) * 24 + CAST(substr(timestamp, 12, 2) AS INTEGER)",
+}
+
+def open_sqlite(db_file):
+    """SQLite(WAL) 연결 (여러 워커/스레드에서 같은 파일을 사용)"""
+    conn = sqlite3.connect(db_file, timeout=30, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=30000")
+    return conn
+
+class SqliteHistoryStore(HistoryStore):
+    """SQLite(WAL) 기반 히스토리 저장소
+
+    모든 조회가 데이터베이스에서 이루어지므로 여러 uvicorn 워커가 같은 파일을 공유할 수 있습니다.
+    """
+
+    def __init__(self, db_file):
+        super().__init__()
+        self.db_file = db_file
+        self.conn = None
+        # 집계에 반영된 마지막 기록 id
+        self.synced_id = 0
+        # refresh 중 리스너 등에서 다시 refresh가 호출되면 건너뜀
+        self.refreshing = False
+
+    def load(self):
+        self.conn = open_sqlite(self.db_file)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                name TEXT,
+                affiliation TEXT,
+                pc_number INTEGER,
+                category TEXT,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_history_kind_timestamp ON history (kind, timestamp);
+            CREATE INDEX IF NOT EXISTS idx_history_kind_pc_number ON history (kind, pc_number);
+            CREATE INDEX IF NOT EXISTS idx_history_kind_affiliation ON history (kind, affiliation, timestamp);
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+        """)
+        self._import_files()
+        self.refresh()
+        for kind, (_, emoji, label) in HISTORY_KINDS.items():
+            print(f"{emoji} 기존 {label} 기록 {self.count(kind)}개를 로드했습니다. (SQLite)")
+
+    def _import_files(self):
+        """최초 실행 시 기존 json/jsonl 파일을 데이터베이스로 가져오기 (워커 간 한 번만 실행)"""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            if self.conn.execute("SELECT 1 FROM meta WHERE key = 'imported'").fetchone():
+                self.conn.execute("COMMIT")
+                return
+            for kind, (data_file, _, label) in HISTORY_KINDS.items():
+                records = read_jsonl_history(history_log_path(data_file))
+                if records is None:
+                    records = read_json_history(data_file) or []
+                self.conn.executemany(
+                    "INSERT INTO history (kind, timestamp, name, affiliation, pc_number, category, data) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [self._row(kind, record) for record in records]
+                )
+                if records:
+                    print(f"🔁 {label} 기록 {len(records)}개를 SQLite로 가져왔습니다.")
+            self.conn.execute("INSERT INTO meta (key, value) VALUES ('imported', ?)", (datetime.now().isoformat(),))
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def _row(self, kind, record):
+        pc_number = record.get("pc_number")
+        return (
+            kind,
+            record["timestamp"],
+            record_name(record),
+            record_affiliation(record),
+            pc_number if isinstance(pc_number, int) else None,
+            record_category(record),
+            json_dumps(record),
+        )
+
+    def _where(self, kind, start=None, end=None, real_only=False):
+        clauses = ["kind = ?"]
+        params = [kind]
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("timestamp < ?")
+            params.append(end)
+        if real_only:
+            clauses.append("name != ? AND affiliation != ?")
+            params += [BASE_DATA_NAME, BASE_DATA_NAME]
+        return " AND ".join(clauses), params
+
+    def append(self, kind, record):
+        _, _, label = HISTORY_KINDS[kind]
+        try:
+            self.conn.execute(
+                "INSERT INTO history (kind, timestamp, name, affiliation, pc_number, category, data) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                self._row(kind, record)
+            )
+        except Exception as e:
+            print(f"❌ {label} 기록 저장 실패: {e}")
+
+    def refresh(self):
+        """마지막 동기화 이후 추가된 기록(다른 워커 포함)을 집계에 반영"""
+        if self.refreshing:
+            return
+        self.refreshing = True
+        try:
+            rows = self.conn.execute(
+                "SELECT id, kind, data FROM history WHERE id > ? ORDER BY id", (self.synced_id,)
+            ).fetchall()
+            for row_id, kind, data in rows:
+                # 집계 반영 전에 위치를 옮겨야 같은 줄을 다시 읽지 않음
+                self.synced_id = row_id
+                self.index(kind, json_loads(data))
+        finally:
+            self.refreshing = False
+
+    def records(self, kind, start=None, end=None, newest_first=False):
+        where, params = self._where(kind, start, end)
+        order = "DESC" if newest_first else "ASC"
+        rows = self.conn.execute(
+            f"SELECT data FROM history WHERE {where} ORDER BY timestamp {order}, id {order}", params
+        )
+        return [json_loads(data) for (data,) in rows]
+
+    def iter_records(self, kind, start=None, end=None):
+        where, params = self._where(kind, start, end)
+        for (data,) in self.conn.execute(f"SELECT data FROM history WHERE {where} ORDER BY timestamp, id", params):
+            yield json_loads(data)
+
+    def page(self, kind, start=None, end=None, limit=None, cursor=None):
+        # 커서는 마지막으로 반환한 기록의 id (timestamp, id 순서 기준으로 그 다음 기록부터 조회)
+        where, params = self._where(kind, start, end)
+        if cursor is not None:
+            where += " AND (timestamp, id) < (SELECT timestamp, id FROM history WHERE id = ?)"
+            params.append(cursor)
+        query = f"SELECT id, data FROM history WHERE {where} ORDER BY timestamp DESC, id DESC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit + 1)
+        rows = self.conn.execute(query, params).fetchall()
+        next_cursor = None
+        if limit and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = rows[-1][0]
+        return [json_loads(data) for _, data in rows], next_cursor
+
+    def query_count_by(self, kind, key, start=None, end=None, real_only=False):
+        column = SQLITE_GROUP_COLUMNS[key]
+        where, params = self._where(kind, start, end, real_only)
+        rows = self.conn.execute(
+            f"SELECT {column}, COUNT(*) FROM history WHERE {where} GROUP BY {column}", params
+        )
+        return dict(rows.fetchall())
+
+    async def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+def create_history_store():
+    """HISTORY_STORAGE 설정에 맞는 히스토리 저장소 생성"""
+    if HISTORY_STORAGE == "sqlite":
+        return SqliteHistoryStore(HISTORY_DB_FILE)
+    if HISTORY_STORAGE == "partitioned":
+        return PartitionedHistoryStore(HISTORY_PARTITION_DIR)
+    return JsonHistoryStore(HISTORY_STORAGE)
+
+history_store = create_history_store()
+
+# 대시보드 응답 캐시 ((엔드포인트, 파라미터) → (ETag, 응답 본문))
+RESPONSE_CACHE_SIZE = 64
+response_cache = OrderedDict()
+
+def versioned_response(request: Request, key, build):
+    """데이터 버전 기반 ETag 응답
+
+    ETag는 (엔드포인트, 파라미터, 데이터 버전, 오늘 날짜)로 정해지므로 응답을 만들지 않고도 비교할 수 있습니다.
+    클라이언트의 If-None-Match와 같으면 304를 반환하고, 캐시에 같은 버전의 응답이 있으면 재사용합니다.
+    """
+    today = datetime.now(pytz.timezone('Asia/Seoul')).date().isoformat()
+    version_key = repr((key, history_store.data_version(), today))
+    etag = f'"{hashlib.sha1(version_key.encode("utf-8")).hexdigest()[:20]}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    cached = response_cache.get(key)
+    if cached is not None and cached[0] == etag:
+        response_cache.move_to_end(key)
+        body = cached[1]
+    else:
+        body = json_dumpb(build())
+        response_cache[key] = (etag, body)
+        response_cache.move_to_end(key)
+        while len(response_cache) > RESPONSE_CACHE_SIZE:
+            response_cache.popitem(last=False)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+# 실시간 통계 스트림 설정
+# 연결 유지용 heartbeat 주기(초), 이 주기마다 날짜 변경도 확인
+STREAM_HEARTBEAT_INTERVAL = float(os.getenv("STREAM_HEARTBEAT_INTERVAL", "15"))
+# 다른 워커가 sqlite에 추가한 기록을 확인하는 주기(초)
+STREAM_REFRESH_INTERVAL = float(os.getenv("STREAM_REFRESH_INTERVAL", "0.5"))
+# 구독자별 대기 이벤트 최대 개수 (넘치면 스냅샷을 다시 보냄)
+STREAM_QUEUE_SIZE = 256
+
+class StatisticsStream:
+    """대시보드 실시간 통계 스트림 (Server-Sent Events)
+
+    연결 시 기록 종류별 전체 개수 스냅샷을 보내고, 이후 기록이 추가될 때마다 변경분(delta)을 보냅니다.
+    대시보드는 변경분을 받았을 때만 통계 API를 다시 조회하므로 주기적인 폴링이 필요 없습니다.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.subscribers = set()
+        self.refresh_task = None
+        self.closed = False
+        store.listeners.append(self.publish)
+
+    def snapshot(self):
+        self.store.refresh()
+        return {
+            "version": self.store.version,
+            "date": datetime.now(pytz.timezone('Asia/Seoul')).date().isoformat(),
+            "counts": {kind: self.store.count(kind) for kind in HISTORY_KINDS},
+        }
+
+    def publish(self, kind, record):
+        """기록 추가 시 모든 구독자에게 변경분 전달"""
+        if not self.subscribers:
+            return
+        delta = {
+            "version": self.store.version,
+            "kind": kind,
+            # 집계에서 바로 읽음 (store.count는 refresh를 호출하므로 refresh 도중 다시 들어갈 수 있음)
+            "count": self.store.rollup.count(kind),
+            "timestamp": record.get("timestamp"),
+            "affiliation": record_affiliation(record),
+            "category": record_category(record),
+        }
+        for queue in self.subscribers:
+            try:
+                queue.put_nowait(delta)
+            except asyncio.QueueFull:
+                self.resync(queue)
+
+    def resync(self, queue):
+        """처리하지 못한 변경분은 버리고 스냅샷을 다시 보내도록 표시 (종료 시에는 스트림 종료)"""
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
+
+    def subscribe(self):
+        queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+        self.subscribers.add(queue)
+        if self.closed:
+            # 종료 중에 연결된 구독자는 스냅샷만 보내고 종료
+            queue.put_nowait(None)
+        return queue
+
+    def unsubscribe(self, queue):
+        self.subscribers.discard(queue)
+
+    async def events(self, queue):
+        """구독자 한 명에게 보낼 SSE 메시지 생성"""
+        snapshot = self.snapshot()
+        yield f"event: snapshot\nid: {snapshot['version']}\ndata: {json_dumps(snapshot)}\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), STREAM_HEARTBEAT_INTERVAL)
+            except asyncio.TimeoutError:
+                # 연결 유지 (날짜가 바뀌었으면 오늘 기준 통계가 달라지므로 스냅샷 전송)
+                today = datetime.now(pytz.timezone('Asia/Seoul')).date().isoformat()
+                if today != snapshot["date"]:
+                    snapshot = self.snapshot()
+                    yield f"event: snapshot\nid: {snapshot['version']}\ndata: {json_dumps(snapshot)}\n\n"
+                else:
+                    yield ": ping\n\n"
+                continue
+            if event is None:
+                if self.closed:
+                    return
+                snapshot = self.snapshot()
+                yield f"event: snapshot\nid: {snapshot['version']}\ndata: {json_dumps(snapshot)}\n\n"
+            else:
+                yield f"event: delta\nid: {event['version']}\ndata: {json_dumps(event)}\n\n"
+
+    async def refresh_loop(self):
+        """구독자가 있는 동안 다른 워커가 추가한 기록 확인 (sqlite)"""
+        while True:
+            await asyncio.sleep(STREAM_REFRESH_INTERVAL)
+            if self.subscribers:
+                try:
+                    self.store.refresh()
+                except Exception as e:
+                    print(f"❌ 통계 스트림 갱신 실패: {e}")
+
+    def start(self):
+        if HISTORY_STORAGE == "sqlite" and STREAM_REFRESH_INTERVAL > 0:
+            self.refresh_task = asyncio.create_task(self.refresh_loop())
+
+    def end_streams(self):
+        """열린 스트림 종료 (서버 종료 신호를 받았을 때, lifespan 종료 전에 호출)"""
+        self.closed = True
+        for queue in list(self.subscribers):
+            self.resync(queue)
+
+    async def close(self):
+        if self.refresh_task is not None:
+            self.refresh_task.cancel()
+            self.refresh_task = None
+        self.end_streams()
+
+    def status(self):
+        return {"subscribers": len(self.subscribers)}
+
+statistics_stream = StatisticsStream(history_store)
+
+# 슬랙 알림 보관함 (전송하지 못한 알림을 디스크에 보관하고 서버 시작 시 다시 전송)
+# - jsonl : 추가/완료를 한 줄씩 기록 (기본값, 단일 프로세스용)
+# - sqlite: SQLite 테이블에 보관, 여러 워커가 공유 (HISTORY_STORAGE=sqlite이면 기본값)
+SLACK_OUTBOX = os.getenv("SLACK_OUTBOX", "sqlite" if HISTORY_STORAGE == "sqlite" else "jsonl").lower()
+SLACK_OUTBOX_FILE = os.getenv(
+    "SLACK_OUTBOX_FILE",
+    HISTORY_DB_FILE if SLACK_OUTBOX == "sqlite" else os.path.join(HISTORY_DATA_DIR, "slack_outbox.jsonl"),
+)
+# 재시도 횟수를 모두 쓴 알림을 다시 보내는 주기(초), sqlite 보관함의 점유 갱신 주기도 겸함
+SLACK_OUTBOX_RETRY_INTERVAL = float(os.getenv("SLACK_OUTBOX_RETRY_INTERVAL", "30"))
+# jsonl 보관함의 완료 기록이 이 개수를 넘으면 남은 알림만 다시 기록
+SLACK_OUTBOX_COMPACT_THRESHOLD = 1000
+
+class SlackOutbox:
+    """슬랙 알림 보관함 기본 클래스
+
+    알림은 대기열에 넣기 전에 보관함에 기록하고, 전송에 성공하면 지웁니다.
+    전송에 실패한 알림은 보관함에 남아 다음 재시도나 서버 재시작 때 다시 전송됩니다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        # 알림 id → {"id", "kind", "channel", "text", "createdAt"}
+        self.entries = {}
+
+    def claim(self):
+        """이 프로세스가 전송할 보관 알림 목록 (아직 누구도 맡지 않은 것만)"""
+        raise NotImplementedError
+
+    def add(self, entry):
+        raise NotImplementedError
+
+    def remove(self, notification_id):
+        raise NotImplementedError
+
+    def renew(self):
+        """이 프로세스가 맡은 알림의 점유 갱신 (주기적으로 호출)"""
+
+    def close(self):
+        pass
+
+    def count(self):
+        return len(self.entries)
+
+    def status(self):
+        return {"storage": SLACK_OUTBOX, "pending": self.count()}
+
+class JsonlSlackOutbox(SlackOutbox):
+    """jsonl 로그 기반 보관함 ({"op": "add", ...} / {"op": "done", "id"} 줄을 추가)
+
+    요청 처리를 막지 않도록 fsync 없이 운영체제 버퍼까지만 기록하므로 프로세스가 비정상 종료되어도 남습니다.
+    """
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.loaded = False
+        self.done = 0
 
-def load_download_history():
-    """기존 다운로드 기록을 파일에서 로드"""
-    global download_history
+    def claim(self):
+        if self.loaded:
+            return []
+        self.loaded = True
+        if os.path.exists(self.path):
+            # 잘린 끝부분을 정리해야 다음에 추가하는 줄이 잘린 줄에 붙지 않음
+            repair_jsonl_tail(self.path)
+            for line in iter_jsonl_history(self.path):
+                if line.get("op") == "add":
+                    self.entries[line["id"]] = {key: value for key, value in line.items() if key != "op"}
+                else:
+                    self.entries.pop(line.get("id"), None)
+            self._compact()
+        return list(self.entries.values())
+
+    def _compact(self):
+        write_jsonl_atomic(self.path, [{"op": "add", **entry} for entry in self.entries.values()])
+        self.done = 0
+
+    def _append(self, line):
+        with open(self.path, 'ab') as f:
+            f.write(json_dumpb(line) + b"\n")
+
+    def add(self, entry):
+        self.entries[entry["id"]] = entry
+        self._append({"op": "add", **entry})
+
+    def remove(self, notification_id):
+        if self.entries.pop(notification_id, None) is None:
+            return
+        self._append({"op": "done", "id": notification_id})
+        self.done += 1
+        if self.done >= SLACK_OUTBOX_COMPACT_THRESHOLD:
+            self._compact()
+
+class SqliteSlackOutbox(SlackOutbox):
+    """SQLite 테이블 기반 보관함
+
+    워커마다 자신이 넣은 알림을 점유(owner, leased_at)하고 주기적으로 갱신합니다.
+    점유가 없거나 만료된 알림(종료/비정상 종료한 워커의 알림)만 다른 워커가 가져가 다시 전송합니다.
+    """
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.owner = uuid.uuid4().hex
+        self.conn = open_sqlite(path)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS slack_outbox (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                channel TEXT NOT NULL,
+                text TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                owner TEXT,
+                leased_at REAL
+            )
+        """)
+
+    def claim(self):
+        now = time.time()
+        expired = now - SLACK_OUTBOX_RETRY_INTERVAL * 3
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = self.conn.execute(
+                "SELECT id, kind, channel, text, created_at FROM slack_outbox "
+                "WHERE owner IS NULL OR (owner != ? AND leased_at < ?) ORDER BY created_at",
+                (self.owner, expired)
+            ).fetchall()
+            self.conn.executemany(
+                "UPDATE slack_outbox SET owner = ?, leased_at = ? WHERE id = ?",
+                [(self.owner, now, row[0]) for row in rows]
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        claimed = []
+        for notification_id, kind, channel, text, created_at in rows:
+            entry = {"id": notification_id, "kind": kind, "channel": channel, "text": text, "createdAt": created_at}
+            self.entries[notification_id] = entry
+            claimed.append(entry)
+        return claimed
+
+    def add(self, entry):
+        self.entries[entry["id"]] = entry
+        self.conn.execute(
+            "INSERT OR REPLACE INTO slack_outbox (id, kind, channel, text, created_at, owner, leased_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (entry["id"], entry["kind"], entry["channel"], entry["text"], entry["createdAt"], self.owner, time.time())
+        )
+
+    def remove(self, notification_id):
+        self.entries.pop(notification_id, None)
+        self.conn.execute("DELETE FROM slack_outbox WHERE id = ?", (notification_id,))
+
+    def renew(self):
+        self.conn.execute("UPDATE slack_outbox SET leased_at = ? WHERE owner = ?", (time.time(), self.owner))
+
+    def close(self):
+        # 남은 알림의 점유를 풀어 다음에 시작하는 워커가 바로 가져가도록 함
+        self.conn.execute("UPDATE slack_outbox SET owner = NULL WHERE owner = ?", (self.owner,))
+        self.conn.close()
+
+    def status(self):
+        return {
+            **super().status(),
+            "total": self.conn.execute("SELECT COUNT(*) FROM slack_outbox").fetchone()[0],
+        }
+
+def create_slack_outbox():
+    if SLACK_OUTBOX == "sqlite":
+        return SqliteSlackOutbox(SLACK_OUTBOX_FILE)
+    return JsonlSlackOutbox(SLACK_OUTBOX_FILE)
+
+slack_outbox = create_slack_outbox()
+
+# 워커 간 PC 명령 전달 (uvicorn --workers N 으로 실행할 때 다른 워커에 연결된 PC에 명령 전달)
+# - local: 프로세스 안에서만 처리 (기본값, 워커 1개)
+# - unix : PC_BROKER_DIR의 유닉스 소켓으로 워커끼리 직접 전달 (같은 서버의 워커들)
+# - redis: Redis(호환) 서버의 pub/sub 채널로 전달 (여러 서버/컨테이너)
+PC_BROKER = os.getenv("PC_BROKER", "local").lower()
+PC_BROKER_DIR = os.getenv("PC_BROKER_DIR", os.path.join(HISTORY_DATA_DIR, "pc_broker"))
+PC_BROKER_URL = os.getenv("PC_BROKER_URL", "redis://127.0.0.1:6379/0")
+PC_BROKER_CHANNEL = os.getenv("PC_BROKER_CHANNEL", "pc_control")
+# 다른 워커의 응답(명령 상태 조회 등)을 기다리는 최대 시간(초)
+PC_BROKER_TIMEOUT = float(os.getenv("PC_BROKER_TIMEOUT", "2"))
+
+class PCBroker:
+    """워커 간 메시지 브로커 기본 클래스
+
+    publish한 메시지(dict)는 다른 모든 워커의 handler로 전달됩니다.
+    메시지 종류와 처리는 ConnectionManager가 맡고, 브로커는 전달만 합니다.
+    """
+
+    kind = None
+    # 다른 워커와 메시지를 주고받는지 여부 (local은 False)
+    shared = True
+
+    def __init__(self):
+        self.worker_id = None
+        self.handler = None
+        self.tasks = set()
+        self.published = 0
+        self.received = 0
+        self.errors = 0
+
+    async def start(self, worker_id, handler):
+        self.worker_id = worker_id
+        self.handler = handler
+
+    async def publish(self, message):
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+    def _deliver(self, message):
+        """받은 메시지를 처리 (브로커의 수신 작업을 막지 않도록 별도 작업으로 실행)"""
+        self.received += 1
+        task = asyncio.create_task(self.handler(message))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    def status(self):
+        return {"type": self.kind, "published": self.published, "received": self.received, "errors": self.errors}
+
+class LocalPCBroker(PCBroker):
+    """프로세스 안에서만 처리 (다른 워커가 없으므로 전달할 곳이 없음)"""
+
+    kind = "local"
+    shared = False
+
+    async def publish(self, message):
+        self.published += 1
+
+class UnixSocketPCBroker(PCBroker):
+    """유닉스 소켓 브로커
+
+    워커마다 PC_BROKER_DIR/<워커 id>.sock 을 열고, 보낼 때는 디렉토리의 다른 소켓 모두에 JSON 한 줄을 씁니다.
+    연결되지 않는 소켓(종료/비정상 종료한 워커)은 지웁니다.
+    """
+
+    kind = "unix"
+
+    def __init__(self, directory):
+        super().__init__()
+        self.directory = directory
+        self.path = None
+        self.server = None
+        # 소켓 경로 → StreamWriter
+        self.peers = {}
+        # 다른 워커가 연결해 온 수신 작업 → StreamWriter (종료 시 정리)
+        self.connections = {}
+        self.lock = asyncio.Lock()
+
+    async def start(self, worker_id, handler):
+        await super().start(worker_id, handler)
+        os.makedirs(self.directory, exist_ok=True)
+        self.path = os.path.join(self.directory, f"{worker_id}.sock")
+        self.server = await asyncio.start_unix_server(self._serve, path=self.path)
+        print(f"🔀 PC 명령 브로커: 유닉스 소켓 {self.path}")
+
+    async def _serve(self, reader, writer):
+        self.connections[asyncio.current_task()] = writer
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    self._deliver(json_loads(line))
+                except ValueError:
+                    self.errors += 1
+        except (ConnectionError, asyncio.CancelledError):
+            # 이벤트 루프 종료 시 취소되어도 조용히 끝냄
+            pass
+        finally:
+            self.connections.pop(asyncio.current_task(), None)
+            writer.close()
+
+    async def publish(self, message):
+        data = json_dumpb(message) + b"\n"
+        async with self.lock:
+            for path in glob.glob(os.path.join(self.directory, "*.sock")):
+                if path == self.path:
+                    continue
+                try:
+                    writer = self.peers.get(path)
+                    if writer is None or writer.is_closing():
+                        _, writer = await asyncio.wait_for(asyncio.open_unix_connection(path), PC_BROKER_TIMEOUT)
+                        self.peers[path] = writer
+                    writer.write(data)
+                    await asyncio.wait_for(writer.drain(), PC_BROKER_TIMEOUT)
+                except (OSError, asyncio.TimeoutError) as e:
+                    writer = self.peers.pop(path, None)
+                    if writer is not None:
+                        writer.close()
+                    if isinstance(e, (ConnectionRefusedError, FileNotFoundError)):
+                        # 종료된 워커의 소켓 파일
+                        try:
+                            os.remove(path)
+                        except OSError:
+                            pass
+                    else:
+                        self.errors += 1
+                        print(f"❌ PC 명령 브로커 전송 실패 ({os.path.basename(path)}): {str(e) or type(e).__name__}")
+            self.published += 1
+
+    async def close(self):
+        for writer in self.peers.values():
+            writer.close()
+        self.peers = {}
+        if self.server is not None:
+            self.server.close()
+            # 다른 워커와의 수신 연결도 닫고 수신 작업이 끝날 때까지 기다림
+            # (작업을 취소하면 asyncio가 종료 시 CancelledError 트레이스백을 출력하므로 연결을 닫아 끝냄)
+            for writer in self.connections.values():
+                writer.close()
+            if self.connections:
+                await asyncio.wait(list(self.connections), timeout=PC_BROKER_TIMEOUT)
+            await self.server.wait_closed()
+        if self.path:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+    def status(self):
+        return {**super().status(), "path": self.path, "peers": len(self.peers)}
+
+def encode_resp(*args):
+    """Redis 명령을 RESP 배열로 인코딩"""
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if isinstance(arg, str):
+            arg = arg.encode("utf-8")
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+async def read_resp(reader):
+    """RESP 응답 하나 읽기 (오류 응답은 RuntimeError)"""
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("Redis 연결이 끊겼습니다.")
+    prefix, rest = line[:1], line[1:].rstrip(b"\r\n")
+    if prefix == b"+":
+        return rest.decode()
+    if prefix == b"-":
+        raise RuntimeError(rest.decode())
+    if prefix == b":":
+        return int(rest)
+    if prefix == b"$":
+        length = int(rest)
+        if length < 0:
+            return None
+        return (await reader.readexactly(length + 2))[:-2]
+    if prefix == b"*":
+        length = int(rest)
+        if length < 0:
+            return None
+        return [await read_resp(reader) for _ in range(length)]
+    raise ConnectionError(f"알 수 없는 Redis 응답: {line!r}")
+
+class RedisPCBroker(PCBroker):
+    """Redis pub/sub 브로커 (Redis 호환 서버면 사용 가능, 추가 패키지 없이 RESP로 직접 통신)
+
+    구독 연결 하나와 발행 연결 하나를 쓰며, 연결이 끊기면 다시 연결합니다.
+    로컬에서는 data/fake_redis.py 대역 서버로 시험할 수 있습니다.
+    """
+
+    kind = "redis"
+
+    def __init__(self, url, channel):
+        super().__init__()
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.channel = channel
+        self.publisher = None
+        self.lock = asyncio.Lock()
+        self.subscribed = asyncio.Event()
+        self.subscribe_task = None
+
+    async def _connect(self):
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port), PC_BROKER_TIMEOUT)
+        if self.password:
+            writer.write(encode_resp("AUTH", self.password))
+            await read_resp(reader)
+        return reader, writer
+
+    async def start(self, worker_id, handler):
+        await super().start(worker_id, handler)
+        self.subscribe_task = asyncio.create_task(self._subscribe_loop())
+        try:
+            # 구독이 시작되어야 다른 워커의 응답을 받을 수 있음
+            await asyncio.wait_for(self.subscribed.wait(), PC_BROKER_TIMEOUT)
+            print(f"🔀 PC 명령 브로커: Redis {self.host}:{self.port} ({self.channel})")
+        except asyncio.TimeoutError:
+            print(f"⚠️ Redis {self.host}:{self.port}에 연결하지 못했습니다. 백그라운드에서 다시 연결합니다.")
+
+    async def _subscribe_loop(self):
+        while True:
+            writer = None
+            try:
+                reader, writer = await self._connect()
+                writer.write(encode_resp("SUBSCRIBE", self.channel))
+                await read_resp(reader)
+                self.subscribed.set()
+                while True:
+                    reply = await read_resp(reader)
+                    if isinstance(reply, list) and len(reply) == 3 and reply[0] == b"message":
+                        try:
+                            self._deliver(json_loads(reply[2]))
+                        except ValueError:
+                            self.errors += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                print(f"❌ Redis 구독 오류, 1초 후 다시 연결: {str(e) or type(e).__name__}")
+            finally:
+                self.subscribed.clear()
+                if writer is not None:
+                    writer.close()
+            await asyncio.sleep(1)
+
+    async def publish(self, message):
+        data = json_dumpb(message)
+        async with self.lock:
+            for attempt in range(2):
+                try:
+                    if self.publisher is None:
+                        self.publisher = await self._connect()
+                    reader, writer = self.publisher
+                    writer.write(encode_resp("PUBLISH", self.channel, data))
+                    await asyncio.wait_for(read_resp(reader), PC_BROKER_TIMEOUT)
+                    self.published += 1
+                    return
+                except Exception as e:
+                    if self.publisher is not None:
+                        self.publisher[1].close()
+                        self.publisher = None
+                    if attempt:
+                        self.errors += 1
+                        print(f"❌ Redis 발행 실패: {str(e) or type(e).__name__}")
+
+    async def close(self):
+        if self.subscribe_task is not None:
+            self.subscribe_task.cancel()
+            self.subscribe_task = None
+        if self.publisher is not None:
+            self.publisher[1].close()
+            self.publisher = None
+
+    def status(self):
+        return {**super().status(), "url": f"redis://{self.host}:{self.port}", "channel": self.channel, "subscribed": self.subscribed.is_set()}
+
+def create_pc_broker():
+    if PC_BROKER == "redis":
+        return RedisPCBroker(PC_BROKER_URL, PC_BROKER_CHANNEL)
+    if PC_BROKER == "unix":
+        if hasattr(asyncio, "start_unix_server"):
+            return UnixSocketPCBroker(PC_BROKER_DIR)
+        print("⚠️ 이 운영체제는 유닉스 소켓 브로커를 지원하지 않아 local 브로커를 사용합니다.")
+    return LocalPCBroker()
+
+pc_broker = create_pc_broker()
+
+# 베이스 로그인 데이터 (월별 로그인 수)
+BASE_LOGIN_DATA_FILE = os.path.join(HISTORY_DATA_DIR, "base_login_history.json")
+base_login_cache = {"mtime": None, "monthly_counts": {}}
+
+def load_base_login_counts():
+    """베이스 로그인 월별 건수 로드 (파일이 바뀐 경우에만 다시 읽음)"""
+    try:
+        mtime = os.path.getmtime(BASE_LOGIN_DATA_FILE)
+    except OSError:
+        # 파일이 없는 경우 (-1로 표시해 경고는 한 번만 출력)
+        if base_login_cache["mtime"] != -1:
+            print("⚠️ 베이스 로그인 기록 파일이 없습니다.")
+        base_login_cache.update(mtime=-1, monthly_counts={})
+        return {}
+    if mtime == base_login_cache["mtime"]:
+        return base_login_cache["monthly_counts"]
     try:
-        if os.path.exists(DOWNLOAD_DATA_FILE):
-            with open(DOWNLOAD_DATA_FILE, 'r', encoding='utf-8') as f:
-                download_history = json.load(f)
-                print(f"⬇️ 기존 다운로드 기록 {len(download_history)}개를 로드했습니다.")
+        with open(BASE_LOGIN_DATA_FILE, 'rb') as f:
+            base_data = json_loads(f.read())
+        if isinstance(base_data, list):
+            # 기존 형식 (월 첫날 timestamp를 가진 기록 목록)
+            monthly_counts = dict(Counter(record["timestamp"][:7] for record in base_data))
         else:
-            print("⬇️ 새로운 다운로드 기록 파일을 생성합니다.")
-            download_history = []
+            monthly_counts = base_data.get("monthly_counts", {})
+        print(f"📊 베이스 로그인 기록 {sum(monthly_counts.values())}개({len(monthly_counts)}개월)를 로드했습니다.")
     except Exception as e:
-        print(f"❌ 다운로드 기록 로드 실패: {e}")
-        download_history = []
+        print(f"❌ 베이스 로그인 기록 로드 실패: {e}")
+        monthly_counts = {}
+    base_login_cache.update(mtime=mtime, monthly_counts=monthly_counts)
+    return monthly_counts
 
-def save_download_history():
-    """다운로드 기록을 파일에 저장"""
-    try:
-        with open(DOWNLOAD_DATA_FILE, 'w', encoding='utf-8') as f:
-            json.dump(download_history, f, ensure_ascii=False, indent=2)
-        print(f"💾 다운로드 기록 {len(download_history)}개를 저장했습니다.")
-    except Exception as e:
-        print(f"❌ 다운로드 기록 저장 실패: {e}")
+def count_base_logins(base_counts, start=None, end=None):
+    """기간에 포함되는 베이스 로그인 수 (베이스 기록은 매월 1일 기준)"""
+    return sum(
+        count for month, count in base_counts.items()
+        if (start is None or f"{month}-01" >= start) and (end is None or f"{month}-01" < end)
+    )
 
 # 서버 시작 시 기존 데이터 로드
-load_login_history()
-load_feedback_history()
-load_call_history()
-load_download_history()
+history_store.load()
+
+async def history_compaction_loop():
+    """주기적으로 히스토리 로그 압축"""
+    while True:
+        await asyncio.sleep(HISTORY_COMPACT_INTERVAL)
+        await history_store.compact()
+        print("🗜️ 히스토리 로그 압축 완료")
 
 # 데이터 백업 함수 (선택적)
 def backup_login_history():
     """로그인 기록 백업 생성"""
     try:
         backup_filename = f"login_history_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(backup_filename, 'w', encoding='utf-8') as f:
-            json.dump(login_history, f, ensure_ascii=False, indent=2)
+        with open(backup_filename, 'wb') as f:
+            f.write(json_dumpb(history_store.records("login"), pretty=True))
         print(f"📦 백업 파일 생성: {backup_filename}")
         return backup_filename
     except Exception as e:
@@ -893,13 +3837,12 @@ async def send_feedback(request: Request):
             }
         }
         
-        feedback_history.append(feedback_record)
-        save_feedback_history()
+        history_store.append("feedback", feedback_record)
         
-        # 슬랙으로 피드백 전송 (피드백 채널 사용)
-        await send_slack_notification(message, is_feedback=True)
+        # 슬랙으로 피드백 전송 (피드백 채널 사용, 대기열에 넣고 바로 응답)
+        notification = send_slack_notification(message, is_feedback=True)
         
-        return {"status": "success", "message": "피드백이 성공적으로 전송되었습니다."}
+        return {"status": "success", "message": "피드백이 성공적으로 전송되었습니다.", **notification_summary(notification)}
         
     except Exception as e:
         print(f"피드백 전송 오류: {e}")
@@ -932,299 +3875,435 @@ async def feedback_page_short():
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="피드백 페이지를 찾을 수 없습니다.")
 
-@app.get("/api/statistics")
-async def get_statistics(period: str = "week"):
-    """사용자 통계 데이터 API"""
-    try:
-        # 베이스 데이터와 실제 데이터 합치기
-        base_data = load_base_login_history()
-        combined_login_history = base_data + login_history
-        
-        if not combined_login_history:
-            # 데모 데이터 반환
-            return {
-                "totalUsers": 0,
-                "todayUsers": 0,
-                "thisWeekUsers": 0,
-                "avgDailyUsers": 0,
-                "totalFeedbacks": 0,
-                "dailyData": [],
-                "monthlyData": [],
-                "affiliationData": {}
-            }
-        
-        # 현재 시간 (한국 시간)
-        now = datetime.now(pytz.timezone('Asia/Seoul'))
-        today = now.date()
-        
-        # 기간 설정
-        if period == "month":
-            days_back = 30
-            period_name = "최근 30일"
-        elif period == "year":
-            days_back = 365
-            period_name = "최근 12개월"
-        else:  # week
-            days_back = 7
-            period_name = "최근 7일"
-            
-        period_ago = today - timedelta(days=days_back)
-            # 베이스데이터가 아닌 실제 로그인 기록만 필터링
-        real_login_history = [
-            record for record in combined_login_history 
-            if record["name"] != "베이스데이터" and record["affiliation"] != "베이스데이터"
-        ]
-        
-        # 기간별 로그인 기록 필터링
-        period_login_history = [
-            record for record in real_login_history
-            if datetime.fromisoformat(record["timestamp"]).date() >= period_ago
-        ]
-        
-        # 총 사용자 수 (기간별 고유 사용자)
-        if period == "year":
-            # 연간: 해당 연도의 고유 사용자
-            year_login_history = [
-                record for record in real_login_history
-                if datetime.fromisoformat(record["timestamp"]).date().year == today.year
-            ]
-            unique_users = len(set((record["name"], record["affiliation"]) for record in year_login_history))
-        else:
-            # 주간/월간: 해당 기간의 고유 사용자
-            unique_users = len(set((record["name"], record["affiliation"]) for record in period_login_history))
-        
-        # 총 로그인 수 (베이스데이터 포함)
-        total_logins = len(login_history)
-        
-        # 오늘 로그인 수
-        today_users = len([
-            record for record in login_history
-            if datetime.fromisoformat(record["timestamp"]).date() == today
-        ])
-        
-        # 기간별 로그인 수
-        if period == "year":
-            # 연간: 해당 연도의 로그인 수 (베이스데이터 포함)
-            period_users = len([
-                record for record in combined_login_history
-                if datetime.fromisoformat(record["timestamp"]).date().year == today.year
-            ])
-        else:
-            # 주간/월간: 해당 기간의 로그인 수 (베이스데이터 포함)
-            period_users = len([
-                record for record in combined_login_history
-                if datetime.fromisoformat(record["timestamp"]).date() >= period_ago
-            ])
-        
-        # 일평균 사용자 수 (기간별)
-        if period_users > 0 and days_back > 0:
-            # 실제 데이터가 있는 날짜 수 계산
-            actual_days = len(set([
-                datetime.fromisoformat(record["timestamp"]).date()
-                for record in login_history
-                if datetime.fromisoformat(record["timestamp"]).date() >= period_ago
-            ]))
-            if actual_days > 0:
-                avg_daily_users = round(period_users / actual_days)
-            else:
-                avg_daily_users = 0
-        else:
-            avg_daily_users = 0
-        
-        # 일별 데이터 (기간별)
-        daily_counts = defaultdict(int)
-        for record in login_history:
-            record_date = datetime.fromisoformat(record["timestamp"]).date()
-            if record_date >= period_ago:
-                daily_counts[record_date.isoformat()] += 1
-        
-        daily_data = []
-        for i in range(days_back):
-            date = (today - timedelta(days=days_back-1-i)).isoformat()
-            daily_data.append({
-                "date": date,
-                "count": daily_counts[date]
-            })
-        
-        # 소속별 분포 (베이스데이터 제외)
-        affiliations = [
-            record["affiliation"] for record in real_login_history
-            if datetime.fromisoformat(record["timestamp"]).date() >= period_ago
-        ] if period != "year" else [
-            record["affiliation"] for record in real_login_history
-            if datetime.fromisoformat(record["timestamp"]).date().year == today.year
-        ]
-        affiliation_counts = Counter(affiliations)
-        affiliation_data = dict(affiliation_counts)
-        
-        # 시간대별 이용 현황 제거됨
-        
-        # 피드백 통계
-        total_feedbacks = len(feedback_history)
-        
-        # 호출 통계
-        total_calls = len(call_history)
-        
-        # 다운로드 통계
-        total_downloads = len(download_history)
-        
-        # 호출 차트 데이터 (기간별)
-        call_daily_counts = defaultdict(int)
-        for record in call_history:
-            record_date = datetime.fromisoformat(record["timestamp"]).date()
-            if record_date >= period_ago:
-                call_daily_counts[record_date.isoformat()] += 1
-        
-        call_data = []
-        for i in range(days_back):
-            date = (today - timedelta(days=days_back-1-i)).isoformat()
-            call_data.append({
-                "date": date,
-                "count": call_daily_counts[date]
-            })
-        
-        # 다운로드 차트 데이터 (기간별)
-        download_daily_counts = defaultdict(int)
-        for record in download_history:
-            record_date = datetime.fromisoformat(record["timestamp"]).date()
-            if record_date >= period_ago:
-                download_daily_counts[record_date.isoformat()] += 1
-        
-        download_data = []
-        for i in range(days_back):
-            date = (today - timedelta(days=days_back-1-i)).isoformat()
-            download_data.append({
-                "date": date,
-                "count": download_daily_counts[date]
-            })
-        
-        # 월별 데이터 (년도 탭용) - 현재 년도 1월~12월
-        current_year = today.year
-        monthly_counts = defaultdict(int)
-        call_monthly_counts = defaultdict(int)
-        download_monthly_counts = defaultdict(int)
-        
-        # 로그인 월별 데이터 (베이스데이터 포함 - 막대그래프용)
-        for record in combined_login_history:
-            record_date = datetime.fromisoformat(record["timestamp"]).date()
-            if record_date.year == current_year:
-                year_month = record_date.strftime("%Y-%m")
-                monthly_counts[year_month] += 1
-        
-        # 호출 월별 데이터
-        for record in call_history:
-            record_date = datetime.fromisoformat(record["timestamp"]).date()
-            if record_date.year == current_year:
-                year_month = record_date.strftime("%Y-%m")
-                call_monthly_counts[year_month] += 1
-        
-        # 다운로드 월별 데이터
-        for record in download_history:
-            record_date = datetime.fromisoformat(record["timestamp"]).date()
-            if record_date.year == current_year:
-                year_month = record_date.strftime("%Y-%m")
-                download_monthly_counts[year_month] += 1
-        
-        monthly_data = []
-        call_monthly_data = []
-        download_monthly_data = []
-        
-        for month in range(1, 13):  # 1월부터 12월까지
-            year_month = f"{current_year}-{month:02d}"
-            monthly_data.append({
-                "month": year_month,
-                "count": monthly_counts[year_month]
-            })
-            call_monthly_data.append({
-                "month": year_month,
-                "count": call_monthly_counts[year_month]
-            })
-            download_monthly_data.append({
-                "month": year_month,
-                "count": download_monthly_counts[year_month]
-            })
-        
+def build_statistics(period: str = "week"):
+    """사용자 통계 응답 데이터 생성"""
+    # 베이스 데이터 월별 로그인 수 (실제 데이터와 함께 로그인 수 집계에 포함)
+    base_counts = load_base_login_counts()
+
+    if not base_counts and history_store.count("login") == 0:
+        # 데모 데이터 반환
         return {
-            "totalUsers": unique_users,
-            "totalLogins": total_logins,
-            "todayUsers": today_users,
-            "periodUsers": period_users,
-            "avgDailyUsers": avg_daily_users,
-            "totalFeedbacks": total_feedbacks,
-            "totalCalls": total_calls,
-            "totalDownloads": total_downloads,
-            "dailyData": daily_data,
-            "monthlyData": monthly_data,
-            "callData": call_data,
-            "downloadData": download_data,
-            "callMonthlyData": call_monthly_data,
-            "downloadMonthlyData": download_monthly_data,
-            "affiliationData": affiliation_data,
-            "period": period,
-            "periodName": period_name
+            "totalUsers": 0,
+            "todayUsers": 0,
+            "thisWeekUsers": 0,
+            "avgDailyUsers": 0,
+            "totalFeedbacks": 0,
+            "dailyData": [],
+            "monthlyData": [],
+            "affiliationData": {}
         }
-        
+
+    # 현재 시간 (한국 시간)
+    now = datetime.now(pytz.timezone('Asia/Seoul'))
+    today = now.date()
+
+    # 기간 설정
+    if period == "month":
+        days_back = 30
+        period_name = "최근 30일"
+    elif period == "year":
+        days_back = 365
+        period_name = "최근 12개월"
+    else:  # week
+        days_back = 7
+        period_name = "최근 7일"
+
+    period_ago = today - timedelta(days=days_back)
+    period_start = period_ago.isoformat()
+    today_start = today.isoformat()
+    tomorrow_start = (today + timedelta(days=1)).isoformat()
+    current_year = today.year
+    year_start = f"{current_year}-01-01"
+    year_end = f"{current_year + 1}-01-01"
+
+    # 통계 기간 (연간은 해당 연도, 주간/월간은 최근 기간)
+    stats_start, stats_end = (year_start, year_end) if period == "year" else (period_start, None)
+
+    # 총 사용자 수 (기간별 고유 사용자, 베이스데이터 제외)
+    unique_users = history_store.distinct_users("login", start=stats_start, end=stats_end)
+
+    # 총 로그인 수
+    total_logins = history_store.count("login")
+
+    # 오늘 로그인 수
+    today_users = history_store.count("login", start=today_start, end=tomorrow_start)
+
+    # 기간별 로그인 수 (베이스데이터 포함)
+    period_users = history_store.count("login", start=stats_start, end=stats_end) + count_base_logins(
+        base_counts, start=stats_start, end=stats_end
+    )
+
+    # 일별 데이터 (기간별)
+    daily_counts = history_store.count_by("login", "day", start=period_start)
+
+    # 일평균 사용자 수 (실제 데이터가 있는 날짜 수 기준)
+    if period_users > 0 and daily_counts:
+        avg_daily_users = round(period_users / len(daily_counts))
+    else:
+        avg_daily_users = 0
+
+    daily_data = []
+    for i in range(days_back):
+        date = (today - timedelta(days=days_back-1-i)).isoformat()
+        daily_data.append({
+            "date": date,
+            "count": daily_counts.get(date, 0)
+        })
+
+    # 소속별 분포 (베이스데이터 제외)
+    affiliation_data = history_store.count_by(
+        "login", "affiliation", start=stats_start, end=stats_end, real_only=True
+    )
+
+    # 시간대별 이용 현황은 /api/statistics/heatmap 에서 제공
+
+    # 피드백 통계
+    total_feedbacks = history_store.count("feedback")
+
+    # 호출 통계
+    total_calls = history_store.count("call")
+
+    # 다운로드 통계
+    total_downloads = history_store.count("download")
+
+    # 호출 / 다운로드 차트 데이터 (기간별)
+    call_daily_counts = history_store.count_by("call", "day", start=period_start)
+    download_daily_counts = history_store.count_by("download", "day", start=period_start)
+
+    call_data = []
+    download_data = []
+    for i in range(days_back):
+        date = (today - timedelta(days=days_back-1-i)).isoformat()
+        call_data.append({
+            "date": date,
+            "count": call_daily_counts.get(date, 0)
+        })
+        download_data.append({
+            "date": date,
+            "count": download_daily_counts.get(date, 0)
+        })
+
+    # 월별 데이터 (년도 탭용) - 현재 년도 1월~12월
+    # 로그인 월별 데이터 (베이스데이터 포함 - 막대그래프용)
+    monthly_counts = Counter(history_store.count_by("login", "month", start=year_start, end=year_end))
+    monthly_counts.update({
+        month: count for month, count in base_counts.items()
+        if year_start <= f"{month}-01" < year_end
+    })
+    call_monthly_counts = history_store.count_by("call", "month", start=year_start, end=year_end)
+    download_monthly_counts = history_store.count_by("download", "month", start=year_start, end=year_end)
+
+    monthly_data = []
+    call_monthly_data = []
+    download_monthly_data = []
+
+    for month in range(1, 13):  # 1월부터 12월까지
+        year_month = f"{current_year}-{month:02d}"
+        monthly_data.append({
+            "month": year_month,
+            "count": monthly_counts.get(year_month, 0)
+        })
+        call_monthly_data.append({
+            "month": year_month,
+            "count": call_monthly_counts.get(year_month, 0)
+        })
+        download_monthly_data.append({
+            "month": year_month,
+            "count": download_monthly_counts.get(year_month, 0)
+        })
+
+    return {
+        "totalUsers": unique_users,
+        "totalLogins": total_logins,
+        "todayUsers": today_users,
+        "periodUsers": period_users,
+        "avgDailyUsers": avg_daily_users,
+        "totalFeedbacks": total_feedbacks,
+        "totalCalls": total_calls,
+        "totalDownloads": total_downloads,
+        "dailyData": daily_data,
+        "monthlyData": monthly_data,
+        "callData": call_data,
+        "downloadData": download_data,
+        "callMonthlyData": call_monthly_data,
+        "downloadMonthlyData": download_monthly_data,
+        "affiliationData": affiliation_data,
+        "period": period,
+        "periodName": period_name
+    }
+
+def build_range_statistics(first, last, granularity):
+    """기간 지정(from/to) 사용자 통계 응답 데이터 생성
+
+    기간 조회는 일별/월별 집계와 시간순 인덱스의 이진 탐색으로 처리하므로 전체 기록을 훑지 않습니다.
+    """
+    base_counts = load_base_login_counts()
+    start, end = first.isoformat(), (last + timedelta(days=1)).isoformat()
+    today = datetime.now(pytz.timezone('Asia/Seoul')).date()
+
+    # 기간별 로그인 수 (베이스데이터 포함)
+    period_users = history_store.count("login", start=start, end=end) + count_base_logins(base_counts, start=start, end=end)
+    # 일평균 사용자 수 (실제 데이터가 있는 날짜 수 기준)
+    active_days = len(history_store.count_by("login", "day", start=start, end=end))
+    avg_daily_users = round(period_users / active_days) if period_users > 0 and active_days else 0
+
+    def monthly(kind, extra_monthly=None):
+        return [
+            {"month": item["date"], "count": item["count"]}
+            for item in range_series(kind, first, last, "month", extra_monthly)
+        ]
+
+    return {
+        "totalUsers": history_store.distinct_users("login", start=start, end=end),
+        "totalLogins": history_store.count("login"),
+        "todayUsers": history_store.count("login", start=today.isoformat(), end=(today + timedelta(days=1)).isoformat()),
+        "periodUsers": period_users,
+        "avgDailyUsers": avg_daily_users,
+        "totalFeedbacks": history_store.count("feedback"),
+        "totalCalls": history_store.count("call"),
+        "totalDownloads": history_store.count("download"),
+        # 구간별 데이터 (로그인은 월/분기 단위일 때만 베이스데이터 포함)
+        "dailyData": range_series("login", first, last, granularity, base_counts),
+        "callData": range_series("call", first, last, granularity),
+        "downloadData": range_series("download", first, last, granularity),
+        "feedbackData": range_series("feedback", first, last, granularity),
+        # 월별 데이터 (로그인은 베이스데이터 포함)
+        "monthlyData": monthly("login", base_counts),
+        "callMonthlyData": monthly("call"),
+        "downloadMonthlyData": monthly("download"),
+        "affiliationData": history_store.count_by("login", "affiliation", start=start, end=end, real_only=True),
+        "period": "custom",
+        "periodName": f"{first.isoformat()} ~ {last.isoformat()}",
+        "from": first.isoformat(),
+        "to": last.isoformat(),
+        "granularity": granularity
+    }
+
+@app.get("/api/statistics")
+async def get_statistics(
+    request: Request,
+    period: str = "week",
+    date_from: Optional[str] = Query(None, alias="from"),
+    date_to: Optional[str] = Query(None, alias="to"),
+    granularity: Optional[str] = None,
+):
+    """사용자 통계 데이터 API (from/to를 주면 해당 기간, granularity: day/week/month/quarter)"""
+    try:
+        # 베이스 데이터 파일이 바뀌면 응답도 바뀌므로 캐시 키에 포함
+        load_base_login_counts()
+        if date_from or date_to:
+            if not date_from:
+                raise HTTPException(status_code=400, detail="from 날짜를 지정해주세요.")
+            first, last, granularity = parse_date_range(date_from, date_to, granularity)
+            return versioned_response(
+                request, ("statistics", first, last, granularity, base_login_cache["mtime"]),
+                lambda: build_range_statistics(first, last, granularity)
+            )
+        return versioned_response(request, ("statistics", period, base_login_cache["mtime"]), lambda: build_statistics(period))
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"통계 데이터 생성 오류: {e}")
         raise HTTPException(status_code=500, detail="통계 데이터를 생성하는 중 오류가 발생했습니다.")
 
+# 요일 이름 (월요일부터, heatmap 행 순서)
+WEEKDAY_NAMES = ["월", "화", "수", "목", "금", "토", "일"]
+
+def build_heatmap(kind, start, end, period, period_name):
+    """요일 × 시간대별 이용 현황 응답 데이터 생성 (베이스데이터 제외)"""
+    slots = history_store.count_by(kind, "hour", start=start, end=end, real_only=True)
+    data = [[slots.get(weekday * 24 + hour, 0) for hour in range(24)] for weekday in range(7)]
+    return {
+        "weekdays": WEEKDAY_NAMES,
+        "hours": list(range(24)),
+        "data": data,
+        "max": max(max(row) for row in data),
+        "total": sum(slots.values()),
+        "period": period,
+        "periodName": period_name
+    }
+
+@app.get("/api/statistics/heatmap")
+async def get_heatmap(
+    request: Request,
+    kind: str = "login",
+    period: str = "month",
+    date_from: Optional[str] = Query(None, alias="from"),
+    date_to: Optional[str] = Query(None, alias="to"),
+):
+    """요일 × 시간대별 이용 현황 API (7×24, period: week/month/year/all 또는 from/to)
+
+    기록이 추가될 때 일별/월별 집계에 요일×시간 칸별 수를 함께 쌓아 두므로
+    조회 비용은 기록 수가 아니라 기간에 포함된 버킷 수에만 비례합니다.
+    """
+    if kind not in HISTORY_KINDS:
+        raise HTTPException(status_code=404, detail="알 수 없는 기록 종류입니다.")
+    try:
+        today = datetime.now(pytz.timezone('Asia/Seoul')).date()
+        if date_from or date_to:
+            if not date_from:
+                raise HTTPException(status_code=400, detail="from 날짜를 지정해주세요.")
+            first, last, _ = parse_date_range(date_from, date_to)
+            start, end = first.isoformat(), (last + timedelta(days=1)).isoformat()
+            period, period_name = "custom", f"{start} ~ {last.isoformat()}"
+        elif period == "week":
+            start, end, period_name = (today - timedelta(days=7)).isoformat(), None, "최근 7일"
+        elif period == "year":
+            start, end, period_name = f"{today.year}-01-01", f"{today.year + 1}-01-01", f"{today.year}년"
+        elif period == "all":
+            start, end, period_name = None, None, "전체"
+        else:  # month
+            period = "month"
+            start, end, period_name = (today - timedelta(days=30)).isoformat(), None, "최근 30일"
+        return versioned_response(
+            request, ("heatmap", kind, period, start, end),
+            lambda: build_heatmap(kind, start, end, period, period_name)
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"시간대별 이용 현황 생성 오류: {e}")
+        raise HTTPException(status_code=500, detail="시간대별 이용 현황을 생성하는 중 오류가 발생했습니다.")
+
+def build_feedbacks(period: str = "week", limit: int = LIST_PAGE_LIMIT, cursor: Optional[int] = None):
+    """피드백 상세 목록 응답 데이터 생성 (기간별, 최신순, 페이지 단위)"""
+    # 현재 시간 (한국 시간)
+    now = datetime.now(pytz.timezone('Asia/Seoul'))
+    today = now.date()
+
+    # 기간 설정
+    if period == "week":
+        days_back = 7
+    elif period == "month":
+        days_back = 30
+    else:  # all
+        days_back = None
+
+    # 기간별 조회 (최신순)
+    start = (today - timedelta(days=days_back)).isoformat() if days_back else None
+    feedbacks, next_cursor = history_store.page("feedback", start=start, limit=page_limit(limit), cursor=cursor)
+
+    return {
+        "feedbacks": feedbacks,
+        "period": period,
+        # 기간 내 전체 피드백 수 (현재 페이지 크기가 아님)
+        "count": history_store.count("feedback", start),
+        "nextCursor": next_cursor
+    }
+
 @app.get("/api/feedbacks")
-async def get_feedbacks(period: str = "week"):
-    """피드백 상세 목록 API (기간별, 최신순)"""
+async def get_feedbacks(request: Request, period: str = "week", limit: int = LIST_PAGE_LIMIT, cursor: Optional[int] = None):
+    """피드백 상세 목록 API (기간별, 최신순, 다음 페이지는 응답의 nextCursor를 cursor로 전달)"""
     try:
-        # 현재 시간 (한국 시간)
-        now = datetime.now(pytz.timezone('Asia/Seoul'))
-        today = now.date()
-        
-        # 기간 설정
-        if period == "week":
-            days_back = 7
-        elif period == "month":
-            days_back = 30
-        else:  # all
-            days_back = None
-            
-        # 기간별 필터링
-        if days_back:
-            period_ago = today - timedelta(days=days_back)
-            filtered_feedbacks = [
-                feedback for feedback in feedback_history
-                if datetime.fromisoformat(feedback["timestamp"]).date() >= period_ago
-            ]
-        else:
-            filtered_feedbacks = feedback_history
-        
-        # 최신순으로 정렬 (timestamp 기준 내림차순)
-        sorted_feedbacks = sorted(
-            filtered_feedbacks, 
-            key=lambda x: x["timestamp"], 
-            reverse=True
+        return versioned_response(
+            request, ("feedbacks", period, limit, cursor), lambda: build_feedbacks(period, limit, cursor)
         )
-        
-        return {
-            "feedbacks": sorted_feedbacks,
-            "period": period,
-            "count": len(sorted_feedbacks)
-        }
     except Exception as e:
         print(f"피드백 목록 조회 오류: {e}")
         raise HTTPException(status_code=500, detail="피드백 목록을 조회하는 중 오류가 발생했습니다.")
 
+def build_calls(limit: int = LIST_PAGE_LIMIT, cursor: Optional[int] = None):
+    """호출 상세 목록 응답 데이터 생성 (최신순, 페이지 단위)"""
+    calls, next_cursor = history_store.page("call", limit=page_limit(limit), cursor=cursor)
+    return {"calls": calls, "nextCursor": next_cursor}
+
 @app.get("/api/calls")
-async def get_calls():
-    """호출 상세 목록 API (최신순)"""
+async def get_calls(request: Request, limit: int = LIST_PAGE_LIMIT, cursor: Optional[int] = None):
+    """호출 상세 목록 API (최신순, 다음 페이지는 응답의 nextCursor를 cursor로 전달)"""
     try:
-        # 최신순으로 정렬 (timestamp 기준 내림차순)
-        sorted_calls = sorted(
-            call_history, 
-            key=lambda x: x["timestamp"], 
-            reverse=True
-        )
-        return {"calls": sorted_calls}
+        return versioned_response(request, ("calls", limit, cursor), lambda: build_calls(limit, cursor))
     except Exception as e:
         print(f"호출 목록 조회 오류: {e}")
         raise HTTPException(status_code=500, detail="호출 목록을 조회하는 중 오류가 발생했습니다.")
 
+# 기록 내보내기 (CSV 열 순서, 피드백의 사용자 정보는 user 필드에서 가져옴)
+EXPORT_COLUMNS = {
+    "login": ("timestamp", "name", "affiliation", "contact", "email", "pc_number"),
+    "call": ("timestamp", "type", "name", "affiliation", "contact", "email", "pc_number", "message"),
+    "feedback": ("timestamp", "type", "type_name", "feedback", "name", "affiliation", "contact", "email"),
+    "download": ("timestamp", "template_number", "template_title", "filename"),
+}
+# 한 번에 전송할 기록 수
+EXPORT_CHUNK_ROWS = 500
+
+def export_value(record, column):
+    """CSV 열 값 (없으면 빈 문자열)"""
+    value = record.get(column)
+    if value is None:
+        value = record.get("user", {}).get(column, "")
+    return value
+
+def parse_export_day(value, name):
+    """내보내기 날짜 파라미터(YYYY-MM-DD) 확인"""
+    try:
+        return datetime.fromisoformat(value).date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"{name} 날짜는 YYYY-MM-DD 형식이어야 합니다.")
+
+async def export_history(kind, start, end, export_format):
+    """기록을 CSV/NDJSON 조각으로 나누어 생성 (EXPORT_CHUNK_ROWS개씩)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    columns = EXPORT_COLUMNS[kind]
+    if export_format == "csv":
+        # 엑셀에서 한글이 깨지지 않도록 BOM 추가
+        buffer.write("\ufeff")
+        writer.writerow(columns)
+    for count, record in enumerate(history_store.iter_records(kind, start, end), 1):
+        if export_format == "csv":
+            writer.writerow([export_value(record, column) for column in columns])
+        else:
+            buffer.write(json_dumps(record) + "\n")
+        if count % EXPORT_CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+    yield buffer.getvalue()
+
+@app.get("/api/export/{kind}")
+async def export_records(
+    kind: str,
+    export_format: str = Query("csv", alias="format"),
+    date_from: Optional[str] = Query(None, alias="from"),
+    date_to: Optional[str] = Query(None, alias="to"),
+):
+    """기록 내보내기 API (login/call/feedback/download, CSV 또는 NDJSON, from/to 날짜 포함)"""
+    if kind not in HISTORY_KINDS:
+        raise HTTPException(status_code=404, detail="내보낼 수 없는 기록 종류입니다.")
+    if export_format not in ("csv", "ndjson"):
+        raise HTTPException(status_code=400, detail="format은 csv 또는 ndjson이어야 합니다.")
+    first = parse_export_day(date_from, "from") if date_from else None
+    last = parse_export_day(date_to, "to") if date_to else None
+    start = first.isoformat() if first else None
+    end = (last + timedelta(days=1)).isoformat() if last else None
+
+    filename = "_".join(part for part in (f"{kind}_history", start, last and last.isoformat()) if part)
+    media_type = "text/csv; charset=utf-8" if export_format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        export_history(kind, start, end, export_format),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}.{export_format}"},
+    )
+
+@app.get("/api/stream/statistics")
+async def stream_statistics():
+    """실시간 통계 스트림 API (Server-Sent Events, 연결 시 스냅샷 후 기록 추가마다 변경분 전송)"""
+    queue = statistics_stream.subscribe()
+
+    async def event_stream():
+        try:
+            async for message in statistics_stream.events(queue):
+                yield message
+        finally:
+            statistics_stream.unsubscribe(queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        # 프록시(nginx 등)가 응답을 모아서 보내지 않도록 버퍼링 비활성화
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 if __name__ == "__main__":
     print("🚀 PC방 제어시스템 백엔드 서버를 시작합니다...")
     # uvicorn.run(app, host="127.0.0.1", port=8000, reload=True)
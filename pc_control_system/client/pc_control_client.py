@@ -230,12 +230,12 @@ class PCControlClient:
             try:
                 async with websockets.connect(uri) as websocket:
                     print(f"✅ WebSocket connected to {uri}")
+                    # JSON 프로토콜 사용 알림 (재부팅 후 다시 연결되면 서버가 재부팅 완료로 기록)
+                    await websocket.send(json.dumps({"type": "hello", "pc_number": pc_number}))
                     while not self.stop_websocket.is_set():
                         try:
                             message = await asyncio.wait_for(websocket.recv(), timeout=1.0)
-                            print(f"⬅️ Received message: {message}")
-                            if message == "reboot":
-                                self.reboot_pc()
+                            await self.handle_command(websocket, message)
                         except asyncio.TimeoutError:
                             continue # 1초마다 stop_websocket 플래그 확인
                         except websockets.exceptions.ConnectionClosed:
@@ -245,6 +245,38 @@ class PCControlClient:
                 print(f"❌ WebSocket connection failed: {e}. Retrying in 5 seconds...")
                 await asyncio.sleep(5)
 
+    async def handle_command(self, websocket, message):
+        """서버 명령 처리 (JSON 명령은 수신 확인(ack)과 실행 결과(done)를 보냄)"""
+        command_id = None
+        try:
+            data = json.loads(message)
+            if isinstance(data, dict) and data.get("type") == "ping":
+                # 서버 연결 확인 (받은 ts를 그대로 돌려주면 서버가 왕복 시간을 계산)
+                await websocket.send(json.dumps({"type": "pong", "ts": data.get("ts")}))
+                return
+            if isinstance(data, dict) and data.get("type") == "command":
+                command_id = data.get("id")
+                message = data.get("command")
+        except ValueError:
+            pass  # 이전 서버의 명령 문자열
+
+        print(f"⬅️ Received command: {message}")
+        if command_id:
+            await websocket.send(json.dumps({"type": "ack", "id": command_id}))
+        actions = {"reboot": self.reboot_pc, "shutdown": self.shutdown_pc}
+        action = actions.get(message)
+        if action is None:
+            if command_id:
+                await websocket.send(json.dumps({"type": "done", "id": command_id, "ok": False, "error": f"unknown command: {message}"}))
+            return
+        try:
+            action()
+            ok, error = True, None
+        except Exception as e:
+            ok, error = False, str(e)
+        if command_id:
+            await websocket.send(json.dumps({"type": "done", "id": command_id, "ok": ok, "error": error}))
+
     def start_websocket_listener(self):
         """웹소켓 리스너 스레드 시작"""
         def run_loop():
@@ -285,6 +317,15 @@ shutdown /r /t 3 /c "PC방 제어시스템에 의한 재시작"
             # 백업 방법: 직접 shutdown 명령 실행
             subprocess.run(["shutdown", "/r", "/t", "3"], shell=True)
 
+    def shutdown_pc(self):
+        """PC 종료 (마감 시 전체 종료 명령)"""
+        print("🔴 Shutting down PC in 3 seconds...")
+        try:
+            subprocess.Popen(["shutdown", "/s", "/t", "3", "/c", "PC방 제어시스템에 의한 종료"], creationflags=subprocess.CREATE_NO_WINDOW)
+            print("✅ 종료 명령이 실행되었습니다.")
+        except Exception as e:
+            print(f"❌ 종료 실행 실패: {e}")
+            subprocess.run(["shutdown", "/s", "/t", "3"], shell=True)
 
     def open_browser(self):
         """전체화면 브라우저 열기"""
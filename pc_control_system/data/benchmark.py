@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+대시보드 API 성능 측정 스크립트
+generate_base_data.py --workload 로 만든 가상 히스토리를 백엔드에 올리고,
+통계/목록 API를 서버 없이 프로세스 안에서(ASGI 직접 호출) 반복 요청해 지연 시간과 메모리를 측정합니다.
+
+    python data/generate_base_data.py --workload 1000000 --output backend/workload
+    python data/benchmark.py --data backend/workload --storage json --iterations 50
+
+- build : 응답 캐시를 비우고 매번 응답을 새로 만드는 경우 (데이터가 바뀐 직후와 같음)
+- cached: 같은 데이터 버전의 캐시된 응답을 돌려주는 경우
+- codec : 히스토리 저장/로드(json, jsonl)와 응답 직렬화에 걸리는 시간 (백엔드의 JSON 코덱 기준)
+--json 으로 결과를 파일에 저장해 변경 전/후를 비교할 수 있습니다.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from urllib.parse import urlencode
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend")
+
+# 측정 대상 (엔드포인트, 기간 목록)
+BENCHMARK_ENDPOINTS = [
+    ("/api/statistics", ["week", "month", "year"]),
+    ("/api/download-statistics", ["week", "month", "year"]),
+    ("/api/feedbacks", ["week", "month", "all"]),
+    ("/api/calls", [None]),
+    ("/api/downloads", [None]),
+]
+
+def peak_rss_mb():
+    """프로세스 최대 메모리 사용량(MB), 측정할 수 없으면 None"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트, 리눅스는 KB 단위
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def percentile(values, fraction):
+    """정렬된 값 목록의 백분위수 (최근접 순위)"""
+    index = min(len(values) - 1, max(0, int(round(fraction * len(values) + 0.5)) - 1))
+    return values[index]
+
+async def asgi_request(app, method, path, params=None, body=None):
+    """ASGI 앱에 요청을 직접 보내고 (상태 코드, 응답 본문) 반환 (body는 JSON으로 보냄)"""
+    query = urlencode({key: value for key, value in (params or {}).items() if value is not None})
+    headers = [(b"host", b"benchmark")]
+    content = b""
+    if body is not None:
+        content = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        headers += [(b"content-type", b"application/json"), (b"content-length", str(len(content)).encode())]
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method,
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": query.encode(), "headers": headers,
+        "client": ("127.0.0.1", 0), "server": ("benchmark", 80),
+    }
+    result = {"status": None, "body": bytearray()}
+
+    async def receive():
+        return {"type": "http.request", "body": content, "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            result["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            result["body"].extend(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return result["status"], bytes(result["body"])
+
+async def asgi_get(app, path, params=None):
+    """ASGI 앱에 GET 요청을 직접 보내고 (상태 코드, 응답 본문) 반환"""
+    return await asgi_request(app, "GET", path, params)
+
+async def measure(main, path, params, iterations, cached):
+    """같은 요청을 반복해 지연 시간(ms) 목록과 응답 크기 반환"""
+    if cached:
+        await asgi_get(main.app, path, params)
+    timings = []
+    size = 0
+    for _ in range(iterations):
+        if not cached:
+            main.response_cache.clear()
+        started = time.perf_counter()
+        status, body = await asgi_get(main.app, path, params)
+        timings.append((time.perf_counter() - started) * 1000)
+        size = len(body)
+        if status != 200:
+            raise RuntimeError(f"{path} {params} 응답 코드 {status}")
+    return sorted(timings), size
+
+async def measure_allocation(main, path, params):
+    """응답을 새로 만들 때 할당되는 최대 메모리(MB)"""
+    main.response_cache.clear()
+    tracemalloc.start()
+    try:
+        await asgi_get(main.app, path, params)
+        return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+
+def timed_ms(func, repeat=3):
+    """func를 repeat번 실행한 최소 시간(ms)과 마지막 결과"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def measure_codec(main):
+    """종류별 히스토리 저장/로드 시간 (임시 디렉토리에 전체 기록을 json/jsonl로 기록 후 다시 읽기)"""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for kind in main.HISTORY_KINDS:
+            records = main.history_store.records(kind)
+            json_path = os.path.join(tmp_dir, f"{kind}.json")
+            jsonl_path = os.path.join(tmp_dir, f"{kind}.jsonl")
+            row = {"records": len(records)}
+            row["saveJsonMs"], _ = timed_ms(lambda: main.write_json_atomic(json_path, records))
+            row["loadJsonMs"], _ = timed_ms(lambda: main.read_json_history(json_path))
+            row["saveJsonlMs"], _ = timed_ms(lambda: main.write_jsonl_atomic(jsonl_path, records))
+            row["loadJsonlMs"], _ = timed_ms(lambda: main.read_jsonl_history(jsonl_path))
+            row["bytes"] = os.path.getsize(json_path)
+            results[kind] = row
+            print(
+                f"  {kind:<10} {len(records):>9,}개 | json 저장 {row['saveJsonMs']:8.1f}ms 로드 {row['loadJsonMs']:8.1f}ms | "
+                f"jsonl 저장 {row['saveJsonlMs']:8.1f}ms 로드 {row['loadJsonlMs']:8.1f}ms | {row['bytes']:,}B"
+            )
+    return results
+
+async def response_serialize_ms(main, path, params):
+    """응답 본문을 다시 직렬화하는 시간(ms) (데이터 생성 시간을 뺀 직렬화만 측정)"""
+    _, body = await asgi_get(main.app, path, params)
+    data = main.json_loads(body)
+    elapsed, _ = timed_ms(lambda: main.json_dumpb(data), repeat=10)
+    return elapsed
+
+async def run_benchmark(main, iterations):
+    """모든 엔드포인트/기간 조합 측정"""
+    results = []
+    for path, periods in BENCHMARK_ENDPOINTS:
+        for period in periods:
+            params = {"period": period}
+            row = {"endpoint": path, "period": period}
+            for mode in ("build", "cached"):
+                timings, size = await measure(main, path, params, iterations, cached=(mode == "cached"))
+                row[mode] = {"p50": percentile(timings, 0.50), "p99": percentile(timings, 0.99)}
+                row["bytes"] = size
+            row["allocMB"] = await measure_allocation(main, path, params)
+            row["serializeMs"] = await response_serialize_ms(main, path, params)
+            results.append(row)
+            print(
+                f"  {path:<28} {period or '-':<6} "
+                f"build p50 {row['build']['p50']:8.2f}ms p99 {row['build']['p99']:8.2f}ms | "
+                f"cached p50 {row['cached']['p50']:7.2f}ms p99 {row['cached']['p99']:7.2f}ms | "
+                f"alloc {row['allocMB']:7.2f}MB | 직렬화 {row['serializeMs']:6.2f}ms | {row['bytes']:,}B"
+            )
+    return results
+
+def load_backend(data_dir, storage):
+    """data_dir의 히스토리로 백엔드(main.py)를 import하고 (모듈, 로드 시간(초)) 반환"""
+    os.environ["HISTORY_DATA_DIR"] = data_dir
+    os.environ["HISTORY_STORAGE"] = storage
+    # 슬랙 앱 초기화에 필요한 값 (측정 중에는 슬랙을 호출하지 않음)
+    os.environ.setdefault("SLACK_SIGNING_SECRET", "benchmark")
+    os.environ.setdefault("SLACK_BOT_TOKEN", "xoxb-benchmark")
+
+    # 정적 파일 경로가 백엔드 기준이므로 백엔드 디렉토리에서 import
+    os.chdir(BACKEND_DIR)
+    sys.path.insert(0, BACKEND_DIR)
+    started = time.perf_counter()
+    import main
+    return main, time.perf_counter() - started
+
+async def main_async(args):
+    data_dir = os.path.abspath(args.data)
+    main, load_seconds = load_backend(data_dir, args.storage)
+
+    counts = {kind: main.history_store.count(kind) for kind in main.HISTORY_KINDS}
+    print(f"📦 저장 방식 {args.storage}, JSON 코덱 {main.JSON_CODEC}, 데이터 {data_dir}")
+    print(f"⏱️ 로드 {load_seconds:.2f}초, 기록 수 {counts}, 최대 메모리 {peak_rss_mb() or 0:.1f}MB")
+
+    async with main.lifespan(main.app):
+        results = await run_benchmark(main, args.iterations)
+        # 저장소가 열려 있을 때 기록을 읽어야 함 (sqlite는 종료 시 연결을 닫음)
+        print("💾 히스토리 저장/로드")
+        codec = measure_codec(main)
+
+    report = {
+        "storage": args.storage,
+        "codec": main.JSON_CODEC,
+        "data": data_dir,
+        "iterations": args.iterations,
+        "records": counts,
+        "loadSeconds": load_seconds,
+        "peakRssMB": peak_rss_mb(),
+        "results": results,
+        "persistence": codec,
+    }
+    print(f"✅ 측정 완료, 최대 메모리 {report['peakRssMB'] or 0:.1f}MB")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"📁 결과 저장: {args.json}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="대시보드 API 성능 측정")
+    parser.add_argument("--data", default=os.path.join(BACKEND_DIR, "workload"), help="히스토리 데이터 디렉토리")
+    parser.add_argument("--storage", choices=["json", "jsonl", "sqlite", "partitioned"], default="json", help="히스토리 저장 방식")
+    parser.add_argument("--iterations", type=int, default=30, help="요청 반복 횟수")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일")
+    asyncio.run(main_async(parser.parse_args()))
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+로컬 Redis pub/sub 대역 서버
+Redis 없이 여러 워커 간 PC 명령 전달(PC_BROKER=redis)을 시험할 수 있도록
+RESP 프로토콜의 PING / AUTH / SELECT / SUBSCRIBE / UNSUBSCRIBE / PUBLISH 만 흉내 냅니다.
+
+    python data/fake_redis.py --port 6390
+    PC_BROKER=redis PC_BROKER_URL=redis://127.0.0.1:6390/0 HISTORY_STORAGE=sqlite \\
+        uvicorn main:app --workers 4   (backend 디렉토리에서)
+
+받은 메시지 통계는 종료할 때(Ctrl+C) 출력합니다.
+"""
+
+import argparse
+import asyncio
+
+def encode(value):
+    """값을 RESP로 인코딩 (str은 상태 응답, bytes는 bulk string)"""
+    if isinstance(value, Exception):
+        return f"-ERR {value}\r\n".encode()
+    if isinstance(value, str):
+        return f"+{value}\r\n".encode()
+    if isinstance(value, int):
+        return f":{value}\r\n".encode()
+    if isinstance(value, list):
+        return f"*{len(value)}\r\n".encode() + b"".join(encode(item) for item in value)
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+async def read_command(reader):
+    """RESP 배열 명령 하나 읽기 (연결이 끊기면 None)"""
+    line = await reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):
+        # 인라인 명령 (redis-cli, telnet)
+        return line.strip().split()
+    args = []
+    for _ in range(int(line[1:])):
+        length = int((await reader.readline())[1:])
+        args.append((await reader.readexactly(length + 2))[:-2])
+    return args
+
+class FakeRedis:
+    """Redis pub/sub 대역 (채널 구독/발행만 지원, 키 저장은 하지 않음)"""
+
+    def __init__(self):
+        # 채널 → 구독 중인 연결(StreamWriter) 집합
+        self.channels = {}
+        self.stats = {"connections": 0, "published": 0, "delivered": 0}
+
+    async def handle(self, reader, writer):
+        self.stats["connections"] += 1
+        subscribed = set()
+        try:
+            while True:
+                args = await read_command(reader)
+                if args is None:
+                    break
+                if not args:
+                    continue
+                command = args[0].upper()
+                if command == b"PING":
+                    writer.write(encode("PONG"))
+                elif command in (b"AUTH", b"SELECT", b"CLIENT"):
+                    writer.write(encode("OK"))
+                elif command == b"SUBSCRIBE":
+                    for channel in args[1:]:
+                        self.channels.setdefault(channel, set()).add(writer)
+                        subscribed.add(channel)
+                        writer.write(encode([b"subscribe", channel, len(subscribed)]))
+                elif command == b"UNSUBSCRIBE":
+                    for channel in args[1:] or list(subscribed):
+                        self.channels.get(channel, set()).discard(writer)
+                        subscribed.discard(channel)
+                        writer.write(encode([b"unsubscribe", channel, len(subscribed)]))
+                elif command == b"PUBLISH" and len(args) == 3:
+                    receivers = self.channels.get(args[1], set())
+                    message = encode([b"message", args[1], args[2]])
+                    for receiver in list(receivers):
+                        receiver.write(message)
+                    self.stats["published"] += 1
+                    self.stats["delivered"] += len(receivers)
+                    writer.write(encode(len(receivers)))
+                elif command == b"QUIT":
+                    writer.write(encode("OK"))
+                    break
+                else:
+                    writer.write(encode(Exception(f"unknown command '{command.decode(errors='replace')}'")))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            for channel in subscribed:
+                self.channels.get(channel, set()).discard(writer)
+            writer.close()
+
+async def start_fake_redis(fake, host="127.0.0.1", port=6390):
+    """대역 서버 시작 (다른 스크립트에서 같은 이벤트 루프로 실행할 때 사용), asyncio Server 반환"""
+    return await asyncio.start_server(fake.handle, host, port)
+
+async def main_async(args):
+    fake = FakeRedis()
+    server = await start_fake_redis(fake, args.host, args.port)
+    print(f"🧪 Redis 대역 서버: redis://{args.host}:{args.port}/0 (PC_BROKER_URL로 지정)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        print(f"📨 연결 {fake.stats['connections']}개, 발행 {fake.stats['published']}건, 전달 {fake.stats['delivered']}건")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="로컬 Redis pub/sub 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6390)
+    try:
+        asyncio.run(main_async(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+로컬 슬랙 Web API 대역 서버
+실제 슬랙 없이 알림 경로를 시험할 수 있도록 chat.postMessage / auth.test 를 흉내 냅니다.
+응답 지연, 오류 비율, 429(rate limit) 주입을 설정할 수 있습니다.
+
+    python data/fake_slack.py --port 8931 --latency 200 --error-rate 0.05 --rate-limit
+    SLACK_API_URL=http://127.0.0.1:8931/api/ python backend/main.py
+
+받은 메시지 통계는 GET /stats 로 확인합니다.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from aiohttp import web
+
+# rate_limit 검사에서 허용하는 간격 오차(초), 1초 간격으로 보낸 요청이 도착 시각 차이로 429가 되지 않도록
+RATE_LIMIT_TOLERANCE = 0.1
+
+class FakeSlack:
+    """슬랙 Web API 대역
+
+    - latency: 평균 응답 지연(ms), jitter만큼 무작위로 흔들림
+    - error_rate: 500 응답 비율
+    - throttle_rate: 무작위 429 응답 비율
+    - rate_limit: 채널별 초당 1건을 넘으면 429 (실제 슬랙 제한과 같음)
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, throttle_rate=0.0, rate_limit=False, retry_after=1, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        # 채널별 마지막으로 받은 시각
+        self.last_post = {}
+        self.stats = {"requests": 0, "delivered": 0, "errors": 0, "throttled": 0, "channels": {}}
+        # 받은 메시지 [(수신 시각, 채널, 내용)]
+        self.messages = []
+
+    def app(self):
+        app = web.Application()
+        app.router.add_post("/api/chat.postMessage", self.post_message)
+        app.router.add_post("/api/auth.test", self.auth_test)
+        app.router.add_get("/stats", self.get_stats)
+        return app
+
+    async def _delay(self):
+        delay = max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter)) / 1000
+        if delay:
+            await asyncio.sleep(delay)
+
+    async def _payload(self, request):
+        if request.content_type == "application/json":
+            return await request.json()
+        return dict(await request.post())
+
+    async def post_message(self, request):
+        # 전송 간격은 요청이 도착한 시각 기준 (주입한 응답 지연은 제외)
+        now = time.monotonic()
+        payload = await self._payload(request)
+        channel = payload.get("channel", "")
+        throttled = self.random.random() < self.throttle_rate
+        if self.rate_limit and now - self.last_post.get(channel, -1e9) < 1.0 - RATE_LIMIT_TOLERANCE:
+            throttled = True
+        elif not throttled:
+            self.last_post[channel] = now
+        await self._delay()
+        self.stats["requests"] += 1
+        if throttled:
+            self.stats["throttled"] += 1
+            return web.json_response(
+                {"ok": False, "error": "ratelimited"}, status=429, headers={"Retry-After": str(self.retry_after)}
+            )
+        if self.random.random() < self.error_rate:
+            self.stats["errors"] += 1
+            return web.json_response({"ok": False, "error": "internal_error"}, status=500)
+
+        self.stats["delivered"] += 1
+        self.stats["channels"][channel] = self.stats["channels"].get(channel, 0) + 1
+        self.messages.append((time.time(), channel, payload.get("text", "")))
+        ts = f"{time.time():.6f}"
+        return web.json_response({"ok": True, "channel": channel, "ts": ts, "message": {"text": payload.get("text", ""), "ts": ts}})
+
+    async def auth_test(self, request):
+        return web.json_response({"ok": True, "user_id": "U000FAKE", "team_id": "T000FAKE", "bot_id": "B000FAKE"})
+
+    async def get_stats(self, request):
+        return web.json_response(self.stats)
+
+async def start_fake_slack(fake, host="127.0.0.1", port=8931):
+    """대역 서버 시작 (다른 스크립트에서 같은 이벤트 루프로 실행할 때 사용), AppRunner 반환"""
+    runner = web.AppRunner(fake.app())
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+def add_fake_slack_arguments(parser):
+    """대역 서버 설정 인자 (load_test.py 와 공유)"""
+    parser.add_argument("--latency", type=float, default=100, help="평균 응답 지연(ms)")
+    parser.add_argument("--jitter", type=float, default=50, help="응답 지연 흔들림(ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500 응답 비율 (0~1)")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="무작위 429 응답 비율 (0~1)")
+    parser.add_argument("--rate-limit", action="store_true", help="채널별 초당 1건을 넘으면 429 응답")
+    parser.add_argument("--retry-after", type=int, default=1, help="429 응답의 Retry-After(초)")
+    parser.add_argument("--seed", type=int, help="난수 시드")
+
+def fake_slack_from_args(args):
+    return FakeSlack(args.latency, args.jitter, args.error_rate, args.throttle_rate, args.rate_limit, args.retry_after, args.seed)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="로컬 슬랙 Web API 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8931)
+    add_fake_slack_arguments(parser)
+    args = parser.parse_args()
+
+    print(f"🧪 슬랙 대역 서버: http://{args.host}:{args.port}/api/ (SLACK_API_URL로 지정)")
+    web.run_app(fake_slack_from_args(args).app(), host=args.host, port=args.port, print=None)
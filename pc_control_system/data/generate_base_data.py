@@ -3,21 +3,26 @@
 """
 베이스 통계 데이터 생성 스크립트
 2023년 10월 ~ 2025년 8월까지의 월별 로그인 수 데이터를 바탕으로
-통계용 베이스 로그인 기록을 생성합니다.
+통계용 베이스 로그인 월별 집계(monthly_counts)를 생성합니다.
+
+--workload 옵션을 주면 성능 측정용 가상 히스토리(로그인/호출/피드백/다운로드)를 생성합니다.
+    python data/generate_base_data.py --workload 100000 --output backend/workload
+생성한 데이터는 data/benchmark.py 로 측정합니다.
 """
 
+import argparse
 import json
+import os
 import random
-from datetime import datetime, timedelta
-import pytz
+from datetime import date, datetime, timedelta, timezone
 
 # 월별 로그인 수 데이터
-monthly_data = [w
+monthly_data = [
     # 2023년
     ("2023", "10", 11),
     ("2023", "11", 4),
     ("2023", "12", 9),
-    
+
     # 2024년
     ("2024", "01", 10),
     ("2024", "02", 5),
@@ -31,7 +36,7 @@ monthly_data = [w
     ("2024", "10", 6),
     ("2024", "11", 5),
     ("2024", "12", 4),
-    
+
     # 2025년
     ("2025", "01", 8),
     ("2025", "02", 35),
@@ -43,82 +48,214 @@ monthly_data = [w
     ("2025", "08", 28),
 ]
 
-def get_month_days(year, month):
-    """해당 월의 일수를 반환"""
-    if month in [1, 3, 5, 7, 8, 10, 12]:
-        return 31
-    elif month in [4, 6, 9, 11]:
-        return 30
-    else:  # 2월
-        if year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
-            return 29
-        else:
-            return 28
-
-def generate_base_timestamp(year, month):
-    """베이스 데이터용 간단한 타임스탬프 생성 (월 정보만 포함)"""
-    # 해당 월의 첫째 날 00:00:00으로 설정 (통계용)
-    korea_tz = pytz.timezone('Asia/Seoul')
-    dt = datetime(int(year), int(month), 1, 0, 0, 0)
-    dt = korea_tz.localize(dt)
-    return dt.isoformat()
-
-def generate_base_login_history():
-    """베이스 로그인 히스토리 생성"""
-    login_history = []
-    
+# 가상 히스토리 생성 설정
+KST = timezone(timedelta(hours=9))
+
+# 종류별 기록 비율
+WORKLOAD_SHARES = {"login": 0.70, "call": 0.08, "feedback": 0.04, "download": 0.18}
+
+# 소속별 비중
+AFFILIATIONS = [
+    ("대학생", 30), ("일반인", 20), ("연구원", 12), ("공무원", 10),
+    ("기업", 10), ("언론인", 6), ("시민단체", 6), ("교직원", 6),
+]
+
+# 요일별(월~일) / 시간대별(0~23시) 이용 비중
+WEEKDAY_WEIGHTS = [1.0, 1.0, 1.0, 1.0, 0.9, 0.4, 0.3]
+HOUR_WEIGHTS = [
+    0.1, 0.05, 0.05, 0.05, 0.05, 0.1, 0.2, 0.5, 1.5, 3.0, 4.0, 4.0,
+    2.5, 3.5, 4.5, 4.5, 4.0, 3.0, 1.5, 1.0, 0.8, 0.5, 0.3, 0.2,
+]
+
+SURNAMES = "김이박최정강조윤장임한오서신권황안송류홍"
+GIVEN_SYLLABLES = "민서준현지윤하은도우예진수아재영성호유연채희주"
+
+CALL_MESSAGES = ["호출요청", "프린터 확인 부탁드립니다", "PC가 멈췄어요", "자리 연장 문의", "장비 대여 문의"]
+
+FEEDBACK_TYPES = {"suggestion": "제안사항", "bug": "버그 신고", "improvement": "개선사항", "other": "기타"}
+FEEDBACK_TEXTS = [
+    "자리가 부족합니다.", "로그인 과정에서 약간의 지연이 있었습니다.", "템플릿이 더 다양했으면 좋겠어요.",
+    "모니터가 하나 더 있으면 좋겠습니다.", "친절하게 안내해주셔서 감사합니다.",
+]
+
+TEMPLATES = {
+    1: ("1번 기본 프리셋", "1_기본프리셋.zip"),
+    2: ("2번 정책 인사이트", "2_정책 인사이트.zip"),
+    3: ("3번 세미나 포럼", "3_세미나 포럼.zip"),
+    4: ("4번 이슈 브리핑", "4_이슈 브리핑.zip"),
+    5: ("5번 문화 홍보", "5_문화 홍보.zip"),
+    6: ("6번 펙트체크", "6_펙트체크.zip"),
+    7: ("7번 이슈 고발", "7_이슈 고발.zip"),
+    8: ("8번 산업 리포트", "8_산업 리포트.zip"),
+    9: ("9번 현장 스토리", "9_현장 스토리.zip"),
+    10: ("10번 디지털 세션", "10_디지털 세션.zip"),
+}
+TEMPLATE_WEIGHTS = [20, 15, 12, 10, 8, 8, 7, 7, 7, 6]
+
+PC_COUNT = 20
+
+def generate_base_login_counts():
+    """베이스 로그인 월별 집계 생성 ("YYYY-MM": 로그인 수)"""
     print("🔄 베이스 통계 데이터 생성 중...")
-    
+
+    monthly_counts = {}
     for year, month, count in monthly_data:
-        print(f"  📅 {year}년 {month}월: {count}개 기록 생성")
-        
-        for i in range(count):
-            # 베이스 데이터 생성 (모든 필드를 최소한으로)
-            record = {
-                "timestamp": generate_base_timestamp(year, month),
-                "name": "베이스데이터",
-                "affiliation": "베이스데이터", 
-                "contact": "",
-                "email": "",
-                "pc_number": ""  # 빈 문자열
-            }
-            login_history.append(record)
-    
+        print(f"  📅 {year}년 {month}월: {count}개")
+        monthly_counts[f"{year}-{month}"] = count
+
     # 시간순으로 정렬
-    login_history.sort(key=lambda x: x["timestamp"])
-    
-    return login_history
+    return dict(sorted(monthly_counts.items()))
 
-def save_to_file(login_history, filename="backend/login_history.json"):
-    """생성된 데이터를 JSON 파일로 저장"""
+def save_to_file(monthly_counts, filename="backend/base_login_history.json"):
+    """생성된 월별 집계를 JSON 파일로 저장"""
     try:
         with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(login_history, f, ensure_ascii=False, indent=2)
+            json.dump({"monthly_counts": monthly_counts}, f, ensure_ascii=False, indent=2)
         print(f"✅ 베이스 데이터가 {filename}에 저장되었습니다.")
-        print(f"📊 총 {len(login_history)}개의 로그인 기록 생성")
-        
-        # 월별 통계 출력
-        monthly_stats = {}
-        for record in login_history:
-            month_key = record["timestamp"][:7]  # YYYY-MM
-            monthly_stats[month_key] = monthly_stats.get(month_key, 0) + 1
-        
-        print("\n📈 월별 생성 현황:")
-        for month, count in sorted(monthly_stats.items()):
-            print(f"  {month}: {count}개")
-            
+        print(f"📊 총 {sum(monthly_counts.values())}개의 로그인 기록 ({len(monthly_counts)}개월)")
     except Exception as e:
         print(f"❌ 파일 저장 실패: {e}")
 
+def generate_users(rng, count):
+    """가상 사용자 목록 [(이름, 소속, 연락처, 이메일)]"""
+    affiliations = [name for name, _ in AFFILIATIONS]
+    weights = [weight for _, weight in AFFILIATIONS]
+    users = []
+    for index in range(count):
+        name = rng.choice(SURNAMES) + rng.choice(GIVEN_SYLLABLES) + rng.choice(GIVEN_SYLLABLES)
+        affiliation = rng.choices(affiliations, weights)[0]
+        contact = f"010-{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}"
+        email = f"user{index}@example.com"
+        users.append((name, affiliation, contact, email))
+    return users
+
+def allocate_daily_counts(days, total):
+    """기록 수를 요일 비중과 증가 추세에 맞춰 날짜별로 나누기 (합계가 정확히 total)"""
+    weights = [
+        WEEKDAY_WEIGHTS[day.weekday()] * (0.6 + 0.8 * index / max(1, len(days) - 1))
+        for index, day in enumerate(days)
+    ]
+    scale = total / sum(weights)
+    expected = [weight * scale for weight in weights]
+    counts = [int(value) for value in expected]
+    # 나머지는 소수점이 큰 날부터 하나씩 배분
+    remainders = sorted(range(len(days)), key=lambda index: expected[index] - counts[index], reverse=True)
+    for index in remainders[:total - sum(counts)]:
+        counts[index] += 1
+    return counts
+
+def daily_timestamps(rng, day, count):
+    """하루 동안의 기록 시각 (시간대 비중 반영, 시간순)"""
+    hours = rng.choices(range(24), HOUR_WEIGHTS, k=count)
+    seconds = sorted(hour * 3600 + rng.randrange(3600) for hour in hours)
+    midnight = datetime(day.year, day.month, day.day, tzinfo=KST)
+    return [
+        (midnight + timedelta(seconds=second, microseconds=rng.randrange(1000000))).isoformat()
+        for second in seconds
+    ]
+
+def make_record(rng, kind, timestamp, user):
+    """종류별 기록 생성 (backend/main.py 가 저장하는 형식과 같음)"""
+    name, affiliation, contact, email = user
+    if kind == "login":
+        return {
+            "timestamp": timestamp, "name": name, "affiliation": affiliation,
+            "contact": contact, "email": email, "pc_number": rng.randint(1, PC_COUNT),
+        }
+    if kind == "call":
+        if rng.random() < 0.15:
+            return {
+                "timestamp": timestamp, "name": "비회원", "affiliation": "비회원", "contact": "", "email": "",
+                "pc_number": rng.randint(1, PC_COUNT), "message": "비회원 호출", "type": "guest",
+            }
+        return {
+            "timestamp": timestamp, "name": name, "affiliation": affiliation, "contact": contact, "email": email,
+            "pc_number": rng.randint(1, PC_COUNT), "message": rng.choice(CALL_MESSAGES), "type": "member",
+        }
+    if kind == "feedback":
+        feedback_type = rng.choice(list(FEEDBACK_TYPES))
+        return {
+            "timestamp": timestamp, "feedback": rng.choice(FEEDBACK_TEXTS), "type": feedback_type,
+            "type_name": FEEDBACK_TYPES[feedback_type],
+            "user": {"name": name, "affiliation": affiliation, "contact": contact, "email": email},
+        }
+    template_number = rng.choices(list(TEMPLATES), TEMPLATE_WEIGHTS)[0]
+    title, filename = TEMPLATES[template_number]
+    return {"timestamp": timestamp, "template_number": template_number, "template_title": title, "filename": filename}
+
+def generate_workload(total, output_dir, months=24, seed=42, file_format="json"):
+    """성능 측정용 가상 히스토리 생성
+
+    total개의 기록을 종류별 비율(WORKLOAD_SHARES)로 나누어 오늘 이전 months개월에 걸쳐 생성합니다.
+    기록은 날짜별로 만들어 바로 파일에 쓰므로 500만 건도 메모리를 거의 쓰지 않습니다.
+    """
+    rng = random.Random(seed)
+    os.makedirs(output_dir, exist_ok=True)
+
+    end_day = date.today()
+    start_day = end_day - timedelta(days=months * 30)
+    days = [start_day + timedelta(days=offset) for offset in range((end_day - start_day).days)]
+
+    # 단골 사용자가 자주 방문하도록 순위에 반비례하는 비중 사용
+    users = generate_users(rng, max(50, total // 40))
+    user_weights = [1 / (rank + 1) ** 0.8 for rank in range(len(users))]
+    cumulative = []
+    running = 0.0
+    for weight in user_weights:
+        running += weight
+        cumulative.append(running)
+
+    remaining_total = total
+    for index, (kind, share) in enumerate(WORKLOAD_SHARES.items()):
+        kind_total = remaining_total if index == len(WORKLOAD_SHARES) - 1 else round(total * share)
+        remaining_total -= kind_total
+        extension = "jsonl" if file_format == "jsonl" else "json"
+        path = os.path.join(output_dir, f"{kind}_history.{extension}")
+        with open(path, 'w', encoding='utf-8') as f:
+            first = True
+            if file_format != "jsonl":
+                f.write("[\n")
+            for day, count in zip(days, allocate_daily_counts(days, kind_total)):
+                if not count:
+                    continue
+                lines = []
+                for timestamp in daily_timestamps(rng, day, count):
+                    user = rng.choices(users, cum_weights=cumulative)[0]
+                    lines.append(json.dumps(make_record(rng, kind, timestamp, user), ensure_ascii=False))
+                if file_format == "jsonl":
+                    f.write("\n".join(lines) + "\n")
+                else:
+                    f.write(("" if first else ",\n") + ",\n".join(lines))
+                first = False
+            if file_format != "jsonl":
+                f.write("\n]\n")
+        print(f"  📁 {path}: {kind_total:,}개")
+
+    save_to_file(generate_base_login_counts(), os.path.join(output_dir, "base_login_history.json"))
+    print(f"✅ 가상 히스토리 {total:,}개 생성 완료 ({start_day} ~ {end_day - timedelta(days=1)})")
+
 if __name__ == "__main__":
-    print("🎯 PC 제어시스템 베이스 데이터 생성기")
-    print("=" * 50)
-    
-    # 베이스 데이터 생성
-    base_data = generate_base_login_history()
-    
-    # 파일 저장
-    save_to_file(base_data)
-    
-    print("\n✨ 베이스 데이터 생성 완료!")
-    print("📌 9월부터는 실제 사용자 데이터가 이 파일에 추가됩니다.")
+    parser = argparse.ArgumentParser(description="베이스 데이터 / 성능 측정용 가상 히스토리 생성")
+    parser.add_argument("--workload", type=int, help="가상 히스토리 전체 기록 수 (예: 10000 ~ 5000000)")
+    parser.add_argument("--output", default="backend/workload", help="가상 히스토리 저장 디렉토리")
+    parser.add_argument("--months", type=int, default=24, help="가상 히스토리 기간 (개월)")
+    parser.add_argument("--seed", type=int, default=42, help="난수 시드 (같은 시드는 같은 데이터를 생성)")
+    parser.add_argument("--format", choices=["json", "jsonl"], default="json", help="히스토리 파일 형식")
+    args = parser.parse_args()
+
+    if args.workload:
+        print("🎯 PC 제어시스템 가상 히스토리 생성기")
+        print("=" * 50)
+        generate_workload(args.workload, args.output, args.months, args.seed, args.format)
+    else:
+        print("🎯 PC 제어시스템 베이스 데이터 생성기")
+        print("=" * 50)
+
+        # 베이스 데이터 생성
+        base_counts = generate_base_login_counts()
+
+        # 파일 저장
+        save_to_file(base_counts)
+
+        print("\n✨ 베이스 데이터 생성 완료!")
+        print("📌 9월부터는 실제 사용자 데이터가 login_history.json에 쌓이고, 통계에서 베이스 데이터와 합산됩니다.")
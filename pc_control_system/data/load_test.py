@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+키오스크 API 부하 테스트 (실제 슬랙 없이)
+fake_slack.py 대역 서버를 띄우고 백엔드를 프로세스 안에서 실행한 뒤,
+/api/login, /api/logout, /api/call 요청을 동시에 보내 처리량, 응답 지연 백분위수,
+슬랙 알림 전달 지연(요청 → 슬랙 수신)을 측정합니다.
+
+    python data/load_test.py --requests 1000 --concurrency 50 --call-ratio 0.1
+    python data/load_test.py --rate-limit --error-rate 0.05 --latency 300
+    SLACK_LOGIN_DIGEST_WINDOW=5 python data/load_test.py --requests 300
+
+슬랙 관련 설정(SLACK_CHANNEL_INTERVAL, SLACK_LOGIN_DIGEST_WINDOW 등)은 환경변수로 그대로 전달됩니다.
+--data 를 주지 않으면 빈 임시 디렉토리에 기록하므로 기존 히스토리를 건드리지 않습니다.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime
+
+from benchmark import asgi_request, load_backend, percentile
+from fake_slack import add_fake_slack_arguments, fake_slack_from_args, start_fake_slack
+
+AFFILIATIONS = ["대학생", "일반인", "연구원", "공무원", "기업", "언론인"]
+
+def make_request(rng, index, call_ratio, logout_ratio):
+    """index번째 요청 (경로, 본문)"""
+    user = {
+        "name": f"부하{index}",
+        "affiliation": rng.choice(AFFILIATIONS),
+        "contact": f"010-0000-{index % 10000:04d}",
+        "email": f"load{index}@example.com",
+        "pc_number": rng.randint(1, 20),
+    }
+    draw = rng.random()
+    if draw < call_ratio:
+        return "/api/call", {**user, "message": "부하 테스트 호출"}
+    if draw < call_ratio + logout_ratio:
+        return "/api/logout", user
+    return "/api/login", user
+
+async def drive(main, args):
+    """동시 요청을 보내고 요청별 (경로, 지연(ms), 상태 코드, 알림 id, 요청 시각) 목록 반환"""
+    rng = random.Random(args.seed)
+    requests = [make_request(rng, index, args.call_ratio, args.logout_ratio) for index in range(args.requests)]
+    results = []
+    next_index = 0
+
+    async def worker():
+        nonlocal next_index
+        while next_index < len(requests):
+            path, body = requests[next_index]
+            next_index += 1
+            submitted = time.time()
+            started = time.perf_counter()
+            status, content = await asgi_request(main.app, "POST", path, body=body)
+            latency = (time.perf_counter() - started) * 1000
+            notification_id = json.loads(content).get("notificationId") if status == 200 else None
+            results.append((path, latency, status, notification_id, submitted))
+
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    return results
+
+async def wait_for_delivery(main, results, timeout):
+    """알림이 모두 전송(또는 실패)될 때까지 기다린 뒤 요청별 전달 지연(ms) 목록과 미전송 수 반환"""
+    deadline = time.monotonic() + timeout
+    ids = {notification_id for _, _, _, notification_id, _ in results if notification_id}
+    while time.monotonic() < deadline:
+        statuses = [main.slack_dispatcher.get(notification_id) for notification_id in ids]
+        if all(notification and notification["status"] in ("sent", "failed") for notification in statuses):
+            break
+        await asyncio.sleep(0.1)
+
+    lags = {}
+    undelivered = 0
+    for path, _, _, notification_id, submitted in results:
+        notification = main.slack_dispatcher.get(notification_id) if notification_id else None
+        if notification is None or notification["status"] != "sent":
+            undelivered += 1
+            continue
+        sent_at = datetime.fromisoformat(notification["sentAt"]).timestamp()
+        lags.setdefault(path, []).append((sent_at - submitted) * 1000)
+    return {path: sorted(values) for path, values in lags.items()}, undelivered
+
+def summarize(values):
+    if not values:
+        return None
+    return {"p50": percentile(values, 0.50), "p95": percentile(values, 0.95), "p99": percentile(values, 0.99), "max": values[-1]}
+
+async def main_async(args):
+    data_dir = os.path.abspath(args.data) if args.data else tempfile.mkdtemp(prefix="load_test_")
+    os.environ["SLACK_API_URL"] = f"http://127.0.0.1:{args.slack_port}/api/"
+    fake = fake_slack_from_args(args)
+    runner = await start_fake_slack(fake, port=args.slack_port)
+    main, _ = load_backend(data_dir, args.storage)
+    print(f"🧪 슬랙 대역 서버 :{args.slack_port} (지연 {args.latency:g}±{args.jitter:g}ms, 오류 {args.error_rate:g}, 429 {args.throttle_rate:g}{', 채널별 1건/초' if args.rate_limit else ''})")
+    print(f"📦 저장 방식 {args.storage}, 데이터 {data_dir}, 요청 {args.requests}개 (동시 {args.concurrency})")
+
+    try:
+        async with main.lifespan(main.app):
+            started = time.perf_counter()
+            results = await drive(main, args)
+            elapsed = time.perf_counter() - started
+            lags, undelivered = await wait_for_delivery(main, results, args.drain_timeout)
+            slack_status = main.slack_dispatcher.status()
+    finally:
+        await runner.cleanup()
+
+    latencies = {}
+    for path, latency, _, _, _ in results:
+        latencies.setdefault(path, []).append(latency)
+    errors = sum(1 for _, _, status, _, _ in results if status != 200)
+    report = {
+        "requests": len(results),
+        "concurrency": args.concurrency,
+        "storage": args.storage,
+        "seconds": elapsed,
+        "throughput": len(results) / elapsed if elapsed else None,
+        "errors": errors,
+        "latencyMs": {path: summarize(sorted(values)) for path, values in latencies.items()},
+        "deliveryLagMs": {path: summarize(values) for path, values in lags.items()},
+        "undelivered": undelivered,
+        "slack": fake.stats,
+        "dispatcher": slack_status,
+    }
+
+    print(f"⚡ 처리량 {report['throughput']:.1f} req/s ({elapsed:.2f}초), 오류 응답 {errors}개")
+    for path, summary in report["latencyMs"].items():
+        print(f"  응답 {path:<12} p50 {summary['p50']:8.2f}ms p95 {summary['p95']:8.2f}ms p99 {summary['p99']:8.2f}ms")
+    for path, summary in report["deliveryLagMs"].items():
+        if summary:
+            print(f"  전달 {path:<12} p50 {summary['p50']:8.0f}ms p95 {summary['p95']:8.0f}ms p99 {summary['p99']:8.0f}ms max {summary['max']:8.0f}ms")
+    print(f"📨 슬랙 요청 {fake.stats['requests']}건 (전달 {fake.stats['delivered']}, 429 {fake.stats['throttled']}, 오류 {fake.stats['errors']}), 미전송 {undelivered}건")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"📁 결과 저장: {args.json}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="키오스크 API 부하 테스트 (슬랙 대역 서버 사용)")
+    parser.add_argument("--requests", type=int, default=500, help="전체 요청 수")
+    parser.add_argument("--concurrency", type=int, default=20, help="동시 요청 수")
+    parser.add_argument("--call-ratio", type=float, default=0.1, help="호출(/api/call) 요청 비율")
+    parser.add_argument("--logout-ratio", type=float, default=0.0, help="로그아웃(/api/logout) 요청 비율")
+    parser.add_argument("--storage", choices=["json", "jsonl", "sqlite", "partitioned"], default="json", help="히스토리 저장 방식")
+    parser.add_argument("--data", help="히스토리 데이터 디렉토리 (기본값: 빈 임시 디렉토리)")
+    parser.add_argument("--slack-port", type=int, default=8931, help="슬랙 대역 서버 포트")
+    parser.add_argument("--drain-timeout", type=float, default=60, help="알림 전송 완료를 기다리는 최대 시간(초)")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일")
+    add_fake_slack_arguments(parser)
+    asyncio.run(main_async(parser.parse_args()))
@@ -6,6 +6,7 @@ let downloadData = {
     monthlyData: [],
     templateData: {},
     downloads: [],
+    nextCursor: null,
     period: 'week',
     periodName: '최근 7일'
 };
@@ -106,6 +107,7 @@ async function loadDownloadList() {
         
         const data = await response.json();
         downloadData.downloads = data.downloads || [];
+        downloadData.nextCursor = data.nextCursor ?? null;
         
     } catch (error) {
         console.error('다운로드 목록 API 호출 실패:', error);
@@ -334,6 +336,24 @@ function createTemplateChart() {
     });
 }
 
+// 다운로드 목록 다음 페이지 로드
+async function loadMoreDownloads() {
+    if (downloadData.nextCursor === null) return;
+    try {
+        const response = await fetch(`/api/downloads?cursor=${downloadData.nextCursor}`);
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        
+        const data = await response.json();
+        downloadData.downloads = downloadData.downloads.concat(data.downloads || []);
+        downloadData.nextCursor = data.nextCursor ?? null;
+        renderDownloads();
+    } catch (error) {
+        console.error('다운로드 목록 추가 로드 실패:', error);
+    }
+}
+
 // 다운로드 목록 렌더링
 function renderDownloads() {
     const downloadGrid = document.getElementById('downloadGrid');
@@ -347,7 +367,9 @@ function renderDownloads() {
                 </div>
                 <div class="download-filename">📁 ${download.filename}</div>
             </div>
-        `).join('');
+        `).join('') + (downloadData.nextCursor !== null
+            ? '<button onclick="loadMoreDownloads()" style="grid-column: 1 / -1; margin: 10px auto; padding: 12px 24px; background: var(--primary-color); color: white; border: none; border-radius: 10px; cursor: pointer;">더 보기</button>'
+            : '');
     } else {
         downloadGrid.innerHTML = `
             <div class="empty-state">
@@ -382,8 +404,15 @@ function showError(message) {
     `;
 }
 
-// 실시간 업데이트 (5분마다)
-setInterval(async () => {
+// 실시간 업데이트 (서버 이벤트 스트림)
+// 이 페이지에 영향을 주는 기록 종류
+const STREAM_KINDS = ['download'];
+let streamCounts = null;
+let streamDate = null;
+let refreshTimer = null;
+
+// 데이터 다시 로드
+async function refreshDashboard() {
     try {
         await loadDownloadStats(currentPeriod);
         await loadDownloadList();
@@ -393,4 +422,48 @@ setInterval(async () => {
     } catch (error) {
         console.error('실시간 업데이트 실패:', error);
     }
-}, 5 * 60 * 1000); // 5분
+}
+
+// 짧은 시간에 여러 기록이 추가되면 한 번만 다시 로드
+function scheduleRefresh() {
+    if (refreshTimer) return;
+    refreshTimer = setTimeout(() => {
+        refreshTimer = null;
+        refreshDashboard();
+    }, 300);
+}
+
+// 스냅샷(연결/재연결 시)과 변경분을 받아 필요할 때만 다시 로드
+function connectStatisticsStream() {
+    if (!window.EventSource) {
+        // 스트림을 지원하지 않는 브라우저는 5분마다 다시 로드
+        setInterval(refreshDashboard, 5 * 60 * 1000);
+        return;
+    }
+    const source = new EventSource('/api/stream/statistics');
+    source.addEventListener('snapshot', (event) => {
+        const snapshot = JSON.parse(event.data);
+        // 연결이 끊긴 동안 기록이 추가되었거나 날짜가 바뀌었으면 다시 로드
+        const changed = streamCounts && STREAM_KINDS.some(kind => snapshot.counts[kind] !== streamCounts[kind]);
+        if (changed || (streamDate && snapshot.date !== streamDate)) {
+            scheduleRefresh();
+        }
+        streamCounts = snapshot.counts;
+        streamDate = snapshot.date;
+    });
+    source.addEventListener('delta', (event) => {
+        const delta = JSON.parse(event.data);
+        if (streamCounts) {
+            streamCounts[delta.kind] = delta.count;
+        }
+        if (STREAM_KINDS.includes(delta.kind)) {
+            scheduleRefresh();
+        }
+    });
+    source.onerror = () => {
+        // EventSource가 자동으로 재연결하며, 재연결 시 스냅샷으로 놓친 변경을 확인
+        console.warn('다운로드 실시간 스트림 연결이 끊어졌습니다. 재연결 중...');
+    };
+}
+
+connectStatisticsStream();
@@ -2,7 +2,8 @@
 let feedbackData = {
     feedbacks: [],
     period: 'week',
-    count: 0
+    count: 0,
+    nextCursor: null
 };
 
 // 현재 선택된 기간
@@ -51,7 +52,7 @@ async function loadFeedbacks(period = 'week') {
         }
         
         const data = await response.json();
-        feedbackData = { ...feedbackData, ...data };
+        feedbackData = { ...feedbackData, nextCursor: null, ...data };
         
     } catch (error) {
         console.error('API 호출 실패:', error);
@@ -116,6 +117,24 @@ function updateSummary() {
     textElement.textContent = periodText;
 }
 
+// 피드백 목록 다음 페이지 로드
+async function loadMoreFeedbacks() {
+    if (feedbackData.nextCursor === null) return;
+    try {
+        const response = await fetch(`/api/feedbacks?period=${feedbackData.period}&cursor=${feedbackData.nextCursor}`);
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        
+        const data = await response.json();
+        feedbackData.feedbacks = feedbackData.feedbacks.concat(data.feedbacks || []);
+        feedbackData.nextCursor = data.nextCursor ?? null;
+        renderFeedbacks();
+    } catch (error) {
+        console.error('피드백 추가 로드 실패:', error);
+    }
+}
+
 // 피드백 목록 렌더링
 function renderFeedbacks() {
     const feedbackGrid = document.getElementById('feedbackGrid');
@@ -132,7 +151,9 @@ function renderFeedbacks() {
                 ${feedback.user.contact ? `<div style="margin-top: 10px; font-size: 0.9rem; color: #666;">📞 ${feedback.user.contact}</div>` : ''}
                 ${feedback.user.email ? `<div style="margin-top: 5px; font-size: 0.9rem; color: #666;">📧 ${feedback.user.email}</div>` : ''}
             </div>
-        `).join('');
+        `).join('') + (feedbackData.nextCursor !== null
+            ? '<button onclick="loadMoreFeedbacks()" style="grid-column: 1 / -1; margin: 10px auto; padding: 12px 24px; background: var(--primary-color); color: white; border: none; border-radius: 10px; cursor: pointer;">더 보기</button>'
+            : '');
     } else {
         feedbackGrid.innerHTML = `
             <div class="empty-state">
@@ -167,8 +188,15 @@ function showError(message) {
     `;
 }
 
-// 실시간 업데이트 (5분마다)
-setInterval(async () => {
+// 실시간 업데이트 (서버 이벤트 스트림)
+// 이 페이지에 영향을 주는 기록 종류
+const STREAM_KINDS = ['feedback'];
+let streamCounts = null;
+let streamDate = null;
+let refreshTimer = null;
+
+// 데이터 다시 로드
+async function refreshDashboard() {
     try {
         await loadFeedbacks(currentPeriod);
         updateSummary();
@@ -176,4 +204,48 @@ setInterval(async () => {
     } catch (error) {
         console.error('실시간 업데이트 실패:', error);
     }
-}, 5 * 60 * 1000); // 5분
+}
+
+// 짧은 시간에 여러 기록이 추가되면 한 번만 다시 로드
+function scheduleRefresh() {
+    if (refreshTimer) return;
+    refreshTimer = setTimeout(() => {
+        refreshTimer = null;
+        refreshDashboard();
+    }, 300);
+}
+
+// 스냅샷(연결/재연결 시)과 변경분을 받아 필요할 때만 다시 로드
+function connectStatisticsStream() {
+    if (!window.EventSource) {
+        // 스트림을 지원하지 않는 브라우저는 5분마다 다시 로드
+        setInterval(refreshDashboard, 5 * 60 * 1000);
+        return;
+    }
+    const source = new EventSource('/api/stream/statistics');
+    source.addEventListener('snapshot', (event) => {
+        const snapshot = JSON.parse(event.data);
+        // 연결이 끊긴 동안 기록이 추가되었거나 날짜가 바뀌었으면 다시 로드
+        const changed = streamCounts && STREAM_KINDS.some(kind => snapshot.counts[kind] !== streamCounts[kind]);
+        if (changed || (streamDate && snapshot.date !== streamDate)) {
+            scheduleRefresh();
+        }
+        streamCounts = snapshot.counts;
+        streamDate = snapshot.date;
+    });
+    source.addEventListener('delta', (event) => {
+        const delta = JSON.parse(event.data);
+        if (streamCounts) {
+            streamCounts[delta.kind] = delta.count;
+        }
+        if (STREAM_KINDS.includes(delta.kind)) {
+            scheduleRefresh();
+        }
+    });
+    source.onerror = () => {
+        // EventSource가 자동으로 재연결하며, 재연결 시 스냅샷으로 놓친 변경을 확인
+        console.warn('피드백 실시간 스트림 연결이 끊어졌습니다. 재연결 중...');
+    };
+}
+
+connectStatisticsStream();
@@ -399,6 +399,10 @@ function showError(message) {
 
 
 
+// 호출 목록 (페이지 단위로 로드)
+let callItems = [];
+let callNextCursor = null;
+
 // 호출 모달 표시
 async function showCallModal() {
     const modal = document.getElementById('callModal');
@@ -406,13 +410,24 @@ async function showCallModal() {
     
     modal.style.display = 'block';
     callList.innerHTML = '<div style="text-align: center; color: #666;">로딩 중...</div>';
+    callItems = [];
+    callNextCursor = null;
+    await loadCalls();
+}
+
+// 호출 목록 다음 페이지 로드
+async function loadCalls() {
+    const callList = document.getElementById('callList');
     
     try {
-        const response = await fetch('/api/calls');
+        const url = callNextCursor === null ? '/api/calls' : `/api/calls?cursor=${callNextCursor}`;
+        const response = await fetch(url);
         const data = await response.json();
+        callItems = callItems.concat(data.calls || []);
+        callNextCursor = data.nextCursor ?? null;
         
-        if (data.calls && data.calls.length > 0) {
-            callList.innerHTML = data.calls.map(call => `
+        if (callItems.length > 0) {
+            callList.innerHTML = callItems.map(call => `
                 <div class="item-card">
                     <div class="item-header">
                         <div class="item-user">${call.name} (${call.affiliation})</div>
@@ -421,7 +436,9 @@ async function showCallModal() {
                     <div class="item-type">${call.type === 'member' ? '회원 호출' : '비회원 호출'}</div>
                     <div class="item-content">PC ${call.pc_number}번: ${call.message}</div>
                 </div>
-            `).join('');
+            `).join('') + (callNextCursor !== null
+                ? '<div style="text-align: center;"><button onclick="loadCalls()" style="margin: 10px auto; padding: 12px 24px; background: var(--primary-color); color: white; border: none; border-radius: 10px; cursor: pointer;">더 보기</button></div>'
+                : '');
         } else {
             callList.innerHTML = '<div style="text-align: center; color: #666;">아직 호출이 없습니다.</div>';
         }
@@ -611,8 +628,15 @@ function formatDateTime(timestamp) {
     return `${year}-${month}-${day} ${hours}:${minutes}`;
 }
 
-// 실시간 업데이트 (5분마다)
-setInterval(async () => {
+// 실시간 업데이트 (서버 이벤트 스트림)
+// 이 페이지에 영향을 주는 기록 종류
+const STREAM_KINDS = ['login', 'call', 'download', 'feedback'];
+let streamCounts = null;
+let streamDate = null;
+let refreshTimer = null;
+
+// 데이터 다시 로드
+async function refreshDashboard() {
     try {
         await loadStatistics(currentPeriod);
         updateStatCards();
@@ -620,4 +644,48 @@ setInterval(async () => {
     } catch (error) {
         console.error('실시간 업데이트 실패:', error);
     }
-}, 5 * 60 * 1000); // 5분
+}
+
+// 짧은 시간에 여러 기록이 추가되면 한 번만 다시 로드
+function scheduleRefresh() {
+    if (refreshTimer) return;
+    refreshTimer = setTimeout(() => {
+        refreshTimer = null;
+        refreshDashboard();
+    }, 300);
+}
+
+// 스냅샷(연결/재연결 시)과 변경분을 받아 필요할 때만 다시 로드
+function connectStatisticsStream() {
+    if (!window.EventSource) {
+        // 스트림을 지원하지 않는 브라우저는 5분마다 다시 로드
+        setInterval(refreshDashboard, 5 * 60 * 1000);
+        return;
+    }
+    const source = new EventSource('/api/stream/statistics');
+    source.addEventListener('snapshot', (event) => {
+        const snapshot = JSON.parse(event.data);
+        // 연결이 끊긴 동안 기록이 추가되었거나 날짜가 바뀌었으면 다시 로드
+        const changed = streamCounts && STREAM_KINDS.some(kind => snapshot.counts[kind] !== streamCounts[kind]);
+        if (changed || (streamDate && snapshot.date !== streamDate)) {
+            scheduleRefresh();
+        }
+        streamCounts = snapshot.counts;
+        streamDate = snapshot.date;
+    });
+    source.addEventListener('delta', (event) => {
+        const delta = JSON.parse(event.data);
+        if (streamCounts) {
+            streamCounts[delta.kind] = delta.count;
+        }
+        if (STREAM_KINDS.includes(delta.kind)) {
+            scheduleRefresh();
+        }
+    });
+    source.onerror = () => {
+        // EventSource가 자동으로 재연결하며, 재연결 시 스냅샷으로 놓친 변경을 확인
+        console.warn('통계 실시간 스트림 연결이 끊어졌습니다. 재연결 중...');
+    };
+}
+
+connectStatisticsStream();